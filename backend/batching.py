@@ -0,0 +1,98 @@
+# backend/batching.py
+
+
+# Standard Library Imports
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collect work items submitted from many threads and process them together.
+    A background thread waits for the first item, then keeps collecting until either
+    `max_batch_size` items are gathered or `max_wait` seconds have passed, and hands the
+    batch to `process_batch`. Its results are scattered back to each item's future.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_wait: float = 0.01, name: str = "batcher"):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self.name = name
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted items not yet collected into a batch."""
+        return self._queue.qsize()
+
+    def _ensure_started(self):
+        """Start the batching thread on first use."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue a single item and return a future for its result."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def submit_many(self, items: List[Any]) -> List[Future]:
+        """Queue several items at once; they may end up spread over several batches."""
+        return [self.submit(item) for item in items]
+
+    def map(self, items: List[Any]) -> List[Any]:
+        """Submit items and block until all results are available, preserving order."""
+        return [future.result() for future in self.submit_many(items)]
+
+    def _collect(self) -> List[tuple]:
+        """Block for the first item, then gather more until the batch is full or the wait expires."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Drain whatever is already queued, but only wait while the deadline allows
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _loop(self):
+        while True:
+            # Skip items whose caller gave up (cancelled futures) before any work is spent on them
+            batch = [(item, future) for item, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+
+            try:
+                results = self.process_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name} returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                logger.error(f"Batch of {len(items)} items failed in {self.name}: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
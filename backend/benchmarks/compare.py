@@ -0,0 +1,69 @@
+# backend/benchmarks/compare.py
+#
+# Compare two JSON reports of the same benchmark, e.g. before and after a change.
+# Usage: python -m backend.benchmarks.compare baseline.json candidate.json
+
+
+# Standard Library Imports
+import json
+import argparse
+from typing import Dict, Iterator, Tuple
+
+
+METRICS = ("docs_per_sec", "requests_per_sec", "p50_ms", "p95_ms", "p99_ms")
+
+
+def summaries(report: dict) -> Iterator[Tuple[str, dict]]:
+    """Every latency summary of a stages or load report, keyed by a readable name."""
+    if report["benchmark"] == "load":
+        yield "upload", report["results"]
+        return
+    for stage, result in report["stages"].items():
+        if "by_format" in result:
+            for extension, summary in result["by_format"].items():
+                yield f"{stage}_{extension}", summary
+        else:
+            yield stage, result
+
+
+def compare(baseline: dict, candidate: dict) -> Dict[str, Dict[str, dict]]:
+    """Baseline and candidate values of every shared metric, with their ratio (candidate / baseline)."""
+    if baseline["benchmark"] != candidate["benchmark"]:
+        raise SystemExit(f"Cannot compare a {baseline['benchmark']} report with a {candidate['benchmark']} report")
+
+    before = dict(summaries(baseline))
+    rows = {}
+    for name, after in summaries(candidate):
+        if name not in before:
+            continue
+        rows[name] = {
+            metric: {"baseline": before[name][metric], "candidate": after[metric],
+                     "ratio": after[metric] / before[name][metric] if before[name][metric] else None}
+            for metric in METRICS
+            if metric in after and metric in before[name]
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    for name, metrics in compare(baseline, candidate).items():
+        cells = [
+            f"{metric} {values['baseline']:.1f} -> {values['candidate']:.1f}"
+            + (f" ({values['ratio']:.2f}x)" if values["ratio"] is not None else "")
+            for metric, values in metrics.items()
+        ]
+        print(f"{name:<16} " + "; ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# backend/benchmarks/corpus.py
+#
+# Fixed benchmark corpus of .txt, .pdf and .docx files of varied sizes, generated from a seed so
+# every run measures the same text. Sentences are drawn from the labelled evaluation set.
+# Usage: python -m backend.benchmarks.corpus <directory> [--sizes 150,1000,4000] [--per-size 4] [--seed 0]
+
+
+# Standard Library Imports
+import os
+import re
+import json
+import random
+import argparse
+from datetime import datetime
+from typing import List, Sequence, Tuple
+
+# Third-party Imports
+from docx import Document as DocxDocument  # DOCX file generation
+
+
+EVAL_SET = os.path.join(os.path.dirname(__file__), "data", "eval_set.jsonl")
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')  # Plain split, so the corpus does not depend on NLTK's version
+DEFAULT_SIZES = (150, 1000, 4000)  # Words per document: short, medium and summarized (over 1500 words)
+FORMATS = (".txt", ".pdf", ".docx")
+PDF_LINES_PER_PAGE = 50
+PDF_WORDS_PER_LINE = 12
+
+
+def labelled_sentences(path: str = EVAL_SET) -> List[Tuple[str, str]]:
+    """(label, sentence) pairs of the evaluation set, in file order."""
+    with open(path, encoding="utf-8") as f:
+        documents = [json.loads(line) for line in f if line.strip()]
+    return [(document["label"], sentence) for document in documents for sentence in SENTENCE_END.split(document["text"])]
+
+
+def document_text(rng: random.Random, sentences: List[Tuple[str, str]], words: int) -> Tuple[str, str]:
+    """Text of about `words` words, mostly from one label so classification is realistic; returns (label, text)."""
+    label = rng.choice(sorted({label for label, _ in sentences}))
+    own = [sentence for sentence_label, sentence in sentences if sentence_label == label]
+    picked, count = [], 0
+    while count < words:
+        sentence = rng.choice(own) if rng.random() < 0.8 else rng.choice(sentences)[1]
+        picked.append(sentence)
+        count += len(sentence.split())
+    return label, " ".join(picked)
+
+
+def write_txt(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace").decode("latin-1")
+
+
+def write_pdf(path: str, text: str):
+    """Write a plain PDF with Helvetica text lines, without any PDF library."""
+    words = text.split()
+    lines = [" ".join(words[i:i + PDF_WORDS_PER_LINE]) for i in range(0, len(words), PDF_WORDS_PER_LINE)] or [""]
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)]
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 14 TL 40 760 Td " + " ".join(f"({pdf_escape(line)}) Tj T*" for line in page) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    output, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(output)
+
+
+def write_docx(path: str, text: str):
+    """Write a DOCX with one paragraph per group of sentences and fixed metadata."""
+    document = DocxDocument()
+    sentences = SENTENCE_END.split(text)
+    for i in range(0, len(sentences), 5):
+        document.add_paragraph(" ".join(sentences[i:i + 5]))
+    document.core_properties.created = document.core_properties.modified = datetime(2024, 1, 1)
+    document.save(path)
+
+
+def generate_corpus(directory: str, sizes: Sequence[int] = DEFAULT_SIZES, per_size: int = 4,
+                    formats: Sequence[str] = FORMATS, seed: int = 0) -> List[dict]:
+    """
+    Write `per_size` documents of every size in every format to `directory`, plus a manifest.json
+    describing them. The same arguments always produce the same texts.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    sentences = labelled_sentences()
+    writers = {".txt": write_txt, ".pdf": write_pdf, ".docx": write_docx}
+
+    manifest = []
+    for words in sizes:
+        for index in range(per_size):
+            for extension in formats:
+                label, text = document_text(rng, sentences, words)
+                name = f"doc_{words}w_{index}{extension}"
+                writers[extension](os.path.join(directory, name), text)
+                manifest.append({"file": name, "extension": extension, "words": len(text.split()), "label": label})
+
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "sizes": list(sizes), "per_size": per_size, "documents": manifest}, f, indent=2)
+    return manifest
+
+
+def load_manifest(directory: str) -> List[dict]:
+    """Documents of a generated corpus, with their paths resolved."""
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        documents = json.load(f)["documents"]
+    return [{**document, "path": os.path.join(directory, document["file"])} for document in documents]
+
+
+def parse_sizes(value: str) -> Tuple[int, ...]:
+    return tuple(int(size) for size in value.split(","))
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser):
+    """Corpus options shared by the benchmarks."""
+    parser.add_argument("--corpus", help="Directory of a generated corpus; generated with the options below if missing")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES, help="Comma-separated words per document")
+    parser.add_argument("--per-size", type=int, default=4, help="Documents per size and format")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def corpus_from_arguments(args) -> List[dict]:
+    """Load the corpus given on the command line, generating it first when needed."""
+    directory = args.corpus or os.path.join(
+        os.path.dirname(__file__), "data", f"corpus_{'-'.join(map(str, args.sizes))}_{args.per_size}_{args.seed}"
+    )
+    if not os.path.exists(os.path.join(directory, "manifest.json")):
+        generate_corpus(directory, args.sizes, args.per_size, seed=args.seed)
+    return load_manifest(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the fixed benchmark corpus.")
+    parser.add_argument("directory")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES, help="Comma-separated words per document")
+    parser.add_argument("--per-size", type=int, default=4, help="Documents per size and format")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.directory, args.sizes, args.per_size, seed=args.seed)
+    print(f"Wrote {len(manifest)} documents to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# backend/benchmarks/load.py
+#
+# End-to-end load generator: concurrent clients upload the benchmark corpus to `/upload/` and the
+# request throughput, latency percentiles and status codes are reported as JSON.
+# Usage: python -m backend.benchmarks.load [--url http://localhost:8000] [--concurrency 8] [--requests 200]
+# Without --url a local server is started on a SQLite stand-in database (needs aiosqlite).
+
+
+# Standard Library Imports
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import Counter
+from typing import List, Optional
+
+# Third-party Imports
+import httpx  # Async HTTP client
+
+# Local Application/Library-Specific Imports
+from .corpus import add_corpus_arguments, corpus_from_arguments
+from .report import latency_summary, write_report
+
+
+CONTENT_TYPES = {
+    ".txt": "text/plain",
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_local_server(database_url: str, port: int) -> subprocess.Popen:
+    """Run the app with uvicorn in a subprocess, on the given database and offline models."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = {**os.environ, "DATABASE_URL": database_url}
+    env.setdefault("HF_HUB_OFFLINE", "1")
+    env.setdefault("TRANSFORMERS_OFFLINE", "1")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=root, env=env,
+    )
+
+
+async def wait_until_started(client: httpx.AsyncClient, timeout: float, server: Optional[subprocess.Popen] = None):
+    """Poll the startup probe until the server has initialized its database."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit(f"Local server exited with status {server.returncode}")
+        try:
+            if (await client.get("/health/startup")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"Server did not start within {timeout} seconds")
+
+
+async def run_load(client: httpx.AsyncClient, documents: List[dict], concurrency: int, total: int) -> dict:
+    """Upload `total` documents from `concurrency` clients, cycling through the corpus."""
+    payloads = []
+    for document in documents:
+        with open(document["path"], "rb") as f:
+            payloads.append((document["file"], f.read(), CONTENT_TYPES[document["extension"]]))
+
+    latencies, statuses, tiers = [], Counter(), Counter()
+    next_request = iter(range(total))
+
+    async def client_loop():
+        for index in next_request:  # Shared iterator: each request is taken by exactly one client
+            name, data, content_type = payloads[index % len(payloads)]
+            started = time.perf_counter()
+            try:
+                response = await client.post("/upload/", files={"file": (name, data, content_type)})
+                statuses[str(response.status_code)] += 1
+                tiers[response.headers.get("X-Classification-Tier", "none")] += 1
+            except httpx.TransportError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    wall_seconds = time.perf_counter() - started
+
+    summary = latency_summary(latencies, wall_seconds)
+    summary["requests_per_sec"] = summary.pop("docs_per_sec")
+    summary["requests"] = summary.pop("documents")
+    return {**summary, "status_codes": dict(statuses), "tiers": dict(tiers)}
+
+
+async def benchmark(url: str, documents: List[dict], concurrency: int, total: int, warmup: int,
+                    startup_timeout: float, server: Optional[subprocess.Popen] = None) -> dict:
+    timeout = httpx.Timeout(600.0, connect=10.0)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+        await wait_until_started(client, startup_timeout, server)
+        if warmup:  # Load the models before measuring
+            await run_load(client, documents, 1, warmup)
+        results = await run_load(client, documents, concurrency, total)
+        try:
+            results["server_stages"] = (await client.get("/health/timings")).json()["stages"]
+        except (httpx.HTTPError, ValueError, KeyError):
+            pass
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent upload load test against /upload/.")
+    add_corpus_arguments(parser)
+    parser.add_argument("--url", help="Base URL of a running server; by default a local one is started")
+    parser.add_argument("--database-url", help="Database of the local server; defaults to a temporary SQLite file")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clients uploading at the same time")
+    parser.add_argument("--requests", type=int, default=100, help="Uploads measured in total")
+    parser.add_argument("--warmup", type=int, default=3, help="Sequential uploads before measuring")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    documents = corpus_from_arguments(args)
+    server: Optional[subprocess.Popen] = None
+    url = args.url
+    with tempfile.TemporaryDirectory() as workdir:
+        if url is None:
+            database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(workdir, 'benchmark.db')}"
+            port = free_port()
+            server = start_local_server(database_url, port)
+            url = f"http://127.0.0.1:{port}"
+        try:
+            results = asyncio.run(
+                benchmark(url, documents, args.concurrency, args.requests, args.warmup, args.startup_timeout, server)
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    write_report({
+        "benchmark": "load",
+        "target": args.url or "local",
+        "concurrency": args.concurrency,
+        "corpus": {"documents": len(documents), "sizes": list(args.sizes), "per_size": args.per_size,
+                   "seed": args.seed},
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
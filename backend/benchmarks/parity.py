@@ -0,0 +1,115 @@
+# backend/benchmarks/parity.py
+#
+# Accuracy-parity check of an inference backend against the fp32 PyTorch backend.
+# Usage: python -m backend.benchmarks.parity --backend int8 [--eval-set eval_set.jsonl ...] [--tolerance 0.95] [--tiered]
+# Exits with status 1 when the category agreement rate is below the tolerance.
+# Tiering is off unless --tiered is given, so that every document goes through the NLI model, and long
+# documents through the summarizer, on both backends.
+
+
+# Standard Library Imports
+import os
+import json
+import time
+import argparse
+from typing import Dict, List
+
+# Local Application/Library-Specific Imports
+from .. import ml_model
+from ..cache import CacheConfig
+from ..model_registry import model_registry
+from ..model_backends import BACKENDS, BackendConfig
+
+
+# Short documents, and long ones that are chunked and summarized
+DEFAULT_EVAL_SETS = [
+    os.path.join(os.path.dirname(__file__), "data", "eval_set.jsonl"),
+    os.path.join(os.path.dirname(__file__), "data", "eval_set_long.jsonl"),
+]
+
+# Models whose weights depend on the inference backend
+BACKEND_MODELS = ("classifier", "embedding_model", "category_embeddings", "summarizer")
+
+
+def load_eval_set(path: str) -> List[dict]:
+    """Labelled documents, one JSON object with `text` and `label` per line; `eval_set` names the file."""
+    with open(path, encoding="utf-8") as f:
+        return [{**json.loads(line), "eval_set": os.path.basename(path)} for line in f if line.strip()]
+
+
+def run_backend(backend: str, documents: List[dict]) -> dict:
+    """Classify every document on one backend, with fresh models and without the result cache."""
+    BackendConfig.INFERENCE_BACKEND = backend
+    for name in BACKEND_MODELS:
+        model_registry.unload(name)
+    model_registry.warmup(BACKEND_MODELS)  # Keep load time out of the latency figures
+
+    predictions, seconds = [], []
+    for document in documents:
+        started = time.perf_counter()
+        category, scores, tier = ml_model.classify_text_with_tier(document["text"])
+        seconds.append(time.perf_counter() - started)
+        predictions.append({"category": category, "scores": scores, "tier": tier})
+
+    correct = sum(prediction["category"] == document["label"] for prediction, document in zip(predictions, documents))
+    return {
+        "backend": backend,
+        "predictions": predictions,
+        "accuracy": correct / len(documents),
+        "mean_latency": sum(seconds) / len(seconds),
+    }
+
+
+def compare(reference: dict, candidate: dict) -> dict:
+    """Agreement of the candidate's categories and scores with the reference run."""
+    pairs = list(zip(reference["predictions"], candidate["predictions"]))
+    agreement = sum(ref["category"] == cand["category"] for ref, cand in pairs) / len(pairs)
+    score_diffs = [
+        abs(ref["scores"].get(category, 0.0) - cand["scores"].get(category, 0.0))
+        for ref, cand in pairs
+        for category in ref["scores"]
+    ]
+    return {
+        "agreement": agreement,
+        "max_score_diff": max(score_diffs),
+        "mean_score_diff": sum(score_diffs) / len(score_diffs),
+        "reference_accuracy": reference["accuracy"],
+        "candidate_accuracy": candidate["accuracy"],
+        "speedup": reference["mean_latency"] / candidate["mean_latency"],
+    }
+
+
+def agreement_by_set(reference: dict, candidate: dict, documents: List[dict]) -> Dict[str, float]:
+    """Category agreement rate within each evaluation set, so long documents are not drowned out by short ones."""
+    agreed: Dict[str, List[bool]] = {}
+    for ref, cand, document in zip(reference["predictions"], candidate["predictions"], documents):
+        agreed.setdefault(document["eval_set"], []).append(ref["category"] == cand["category"])
+    return {name: sum(values) / len(values) for name, values in agreed.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check an inference backend against the fp32 PyTorch backend.")
+    parser.add_argument("--backend", required=True, choices=[b for b in BACKENDS if b != "pytorch"])
+    parser.add_argument(
+        "--eval-set", action="append", help="JSONL file with `text` and `label` fields; repeatable (default: both bundled sets)"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.95, help="Minimum category agreement rate")
+    parser.add_argument("--tiered", action="store_true", help="Keep the embedding tier, which skips NLI for clear documents")
+    args = parser.parse_args()
+
+    CacheConfig.CACHE_ENABLED = False  # Every document must reach the models on both backends
+    ml_model.TIERED_CLASSIFICATION = args.tiered
+    documents = [document for path in args.eval_set or DEFAULT_EVAL_SETS for document in load_eval_set(path)]
+
+    reference = run_backend("pytorch", documents)
+    candidate = run_backend(args.backend, documents)
+    report = {"backend": args.backend, "documents": len(documents), "tolerance": args.tolerance, "tiered": args.tiered,
+              **compare(reference, candidate), "agreement_by_set": agreement_by_set(reference, candidate, documents)}
+    print(json.dumps(report, indent=2))
+
+    if report["agreement"] < args.tolerance:
+        raise SystemExit(f"Category agreement {report['agreement']:.1%} is below the tolerance {args.tolerance:.1%}")
+
+
+if __name__ == "__main__":
+    main()
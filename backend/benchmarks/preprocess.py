@@ -0,0 +1,91 @@
+# backend/benchmarks/preprocess.py
+#
+# Micro-benchmark of text preprocessing, before and after memoized lemmatization.
+# Usage: python -m backend.benchmarks.preprocess <file or directory>... [--repeat 3]
+
+
+# Standard Library Imports
+import os
+import re
+import time
+import argparse
+from typing import Callable, List
+
+# Local Application/Library-Specific Imports
+from .. import utils
+from ..utils import lemmatize, preprocess_batch, extract_text_from_file
+from ..extractors import SUPPORTED_EXTENSIONS
+from ..model_registry import model_registry
+
+
+def legacy_preprocess(text: str) -> str:
+    """The original implementation: two regex passes and an uncached lemma per word."""
+    text = text.lower()
+    text = re.sub(r'\W', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    stop_words = model_registry.get("stop_words")
+    return ' '.join([utils.lemmatizer.lemmatize(word) for word in text.split() if word not in stop_words])
+
+
+def load_corpus(paths: List[str]) -> List[str]:
+    """Extracted text of every supported file under the given paths."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(path)
+
+    texts = []
+    for file_path in files:
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in SUPPORTED_EXTENSIONS:
+            texts.append(extract_text_from_file(file_path, extension))
+    return texts
+
+
+def measure(name: str, run: Callable[[], list], documents: int, words: int, repeat: int) -> float:
+    """Best of `repeat` runs, printed as documents and words per second."""
+    best = min(timed(run) for _ in range(repeat))
+    print(f"{name:<12} {documents / best:>10.1f} docs/s {words / best:>12.0f} words/s ({best:.3f} s)")
+    return best
+
+
+def timed(run: Callable[[], list]) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text preprocessing on a corpus of uploads.")
+    parser.add_argument("paths", nargs="+", help="Files or directories with .txt, .pdf or .docx documents")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation; the best is reported")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.paths)
+    if not texts:
+        parser.error("No supported documents found")
+    words = sum(len(text.split()) for text in texts)
+    model_registry.get("stop_words")  # Load shared resources outside the timed runs
+    utils.lemmatizer.lemmatize("warmup")
+    print(f"{len(texts)} documents, {words} words")
+
+    # Outputs must be identical before speed is compared
+    if [legacy_preprocess(text) for text in texts] != [' '.join(doc) for doc in preprocess_batch(texts)]:
+        raise SystemExit("Preprocessing output differs from the original implementation")
+
+    legacy = measure("before", lambda: [legacy_preprocess(text) for text in texts], len(texts), words, args.repeat)
+
+    lemmatize.cache_clear()
+    cold = measure("after, cold", lambda: preprocess_batch(texts), len(texts), words, 1)
+    warm = measure("after, warm", lambda: preprocess_batch(texts), len(texts), words, args.repeat)
+
+    info = lemmatize.cache_info()
+    print(f"speedup {legacy / cold:.1f}x cold, {legacy / warm:.1f}x warm; "
+          f"lemma cache {info.currsize} entries, {info.hits / max(1, info.hits + info.misses):.1%} hits")
+
+
+if __name__ == "__main__":
+    main()
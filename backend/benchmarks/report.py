@@ -0,0 +1,78 @@
+# backend/benchmarks/report.py
+#
+# Latency statistics and JSON reports shared by the benchmarks, so runs on different commits can be compared.
+
+
+# Standard Library Imports
+import os
+import sys
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime
+from typing import List, Optional
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(seconds: List[float], wall_seconds: Optional[float] = None) -> dict:
+    """
+    Throughput and latency percentiles (in milliseconds) of per-document timings.
+    Throughput uses the wall-clock time when given (concurrent runs), otherwise the sum of the timings.
+    """
+    values = sorted(seconds)
+    elapsed = wall_seconds if wall_seconds is not None else sum(values)
+    return {
+        "documents": len(values),
+        "seconds": elapsed,
+        "docs_per_sec": len(values) / elapsed if elapsed else 0.0,
+        "mean_ms": 1000 * sum(values) / len(values),
+        "p50_ms": 1000 * percentile(values, 0.50),
+        "p95_ms": 1000 * percentile(values, 0.95),
+        "p99_ms": 1000 * percentile(values, 0.99),
+        "max_ms": 1000 * values[-1],
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Commit of the working tree, marked dirty when it has local changes; None outside a git checkout."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def environment() -> dict:
+    """Machine and code version a benchmark ran on."""
+    info = {
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import torch
+        info.update(torch=torch.__version__, torch_threads=torch.get_num_threads())
+    except ImportError:
+        pass
+    return info
+
+
+def write_report(report: dict, output: Optional[str]):
+    """Print the report as JSON and optionally save it to a file."""
+    report = {"created_at": datetime.utcnow().isoformat(), "environment": environment(), **report}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
@@ -0,0 +1,127 @@
+# backend/benchmarks/stages.py
+#
+# Throughput and latency of each classification pipeline stage on the fixed benchmark corpus:
+# text extraction (per file type), preprocessing, summarization and classification.
+# Usage: python -m backend.benchmarks.stages [--stages extract,preprocess,summarize,classify] [--output run.json]
+# Models are read from the local Hugging Face cache; pass --allow-download on the first run.
+
+
+# Standard Library Imports
+import os
+import sys
+import time
+import argparse
+from typing import Callable, Dict, List
+
+# The suite runs offline unless downloads are allowed; must be set before transformers is imported
+if "--allow-download" not in sys.argv:
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+# Local Application/Library-Specific Imports
+from .. import ml_model
+from ..cache import CacheConfig
+from ..utils import extract_text_from_file, preprocess_text
+from ..summarization import SummaryConfig, summarize_large_text
+from ..model_registry import model_registry
+from ..model_backends import BackendConfig
+from ..classifier_head import HeadConfig
+from .corpus import add_corpus_arguments, corpus_from_arguments
+from .report import latency_summary, write_report
+
+
+STAGES = ("extract", "preprocess", "summarize", "classify")
+
+
+def time_each(run: Callable, inputs: List, repeat: int) -> List[float]:
+    """Seconds taken by `run(input)` for every input, over `repeat` passes."""
+    seconds = []
+    for _ in range(repeat):
+        for value in inputs:
+            started = time.perf_counter()
+            run(value)
+            seconds.append(time.perf_counter() - started)
+    return seconds
+
+
+def pipeline_settings() -> dict:
+    """Settings that change what the classification stages compute."""
+    return {
+        "inference_backend": BackendConfig.INFERENCE_BACKEND,
+        "classifier_mode": HeadConfig.CLASSIFIER_MODE,
+        "summary_mode": SummaryConfig.SUMMARY_MODE,
+        "tiered": ml_model.TIERED_CLASSIFICATION,
+        "nli_batching": ml_model.NLI_BATCHING,
+        "nli_early_exit": ml_model.NLI_EARLY_EXIT,
+    }
+
+
+def run_stages(documents: List[dict], stages: List[str], repeat: int) -> Dict[str, dict]:
+    """Benchmark the requested stages; every stage gets the output of the previous ones as its input."""
+    results = {}
+
+    # Extraction is always needed for the later stages, but only reported when requested
+    texts = [extract_text_from_file(document["path"], document["extension"]) for document in documents]
+    if "extract" in stages:
+        by_format = {}
+        for extension in sorted({document["extension"] for document in documents}):
+            paths = [document["path"] for document in documents if document["extension"] == extension]
+            seconds = time_each(lambda path: extract_text_from_file(path, extension), paths, repeat)
+            by_format[extension.lstrip(".")] = latency_summary(seconds)
+        results["extract"] = {"by_format": by_format}
+
+    if "preprocess" in stages:
+        results["preprocess"] = latency_summary(time_each(preprocess_text, texts, repeat))
+
+    if "summarize" in stages:
+        # The pipeline summarizes preprocessed text, and only for documents over the threshold
+        processed = [preprocess_text(text) for text in texts]
+        long_texts = [text for text in processed if len(text.split()) > ml_model.SUMMARY_THRESHOLD]
+        if long_texts:
+            summarize_large_text(long_texts[0])  # Load the summarizer outside the timed runs
+            results["summarize"] = latency_summary(time_each(summarize_large_text, long_texts, repeat))
+        else:
+            results["summarize"] = {"documents": 0, "note": f"No document over {ml_model.SUMMARY_THRESHOLD} words"}
+
+    if "classify" in stages:
+        CacheConfig.CACHE_ENABLED = False  # Every document must reach the models on every pass
+        ml_model.classify_text(texts[0])  # Load the models outside the timed runs
+        tiers_before = dict(ml_model.tier_counts)
+        results["classify"] = latency_summary(time_each(ml_model.classify_text, texts, repeat))
+        results["classify"]["tiers"] = {
+            tier: count - tiers_before.get(tier, 0) for tier, count in ml_model.tier_counts.items()
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the classification pipeline.")
+    add_corpus_arguments(parser)
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per stage")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--allow-download", action="store_true", help="Fetch models missing from the local cache")
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)}")
+
+    documents = corpus_from_arguments(args)
+    if set(stages) != {"extract"}:
+        model_registry.get("stop_words")  # Shared resources are loaded once, outside the timed runs
+    results = run_stages(documents, stages, args.repeat)
+
+    write_report({
+        "benchmark": "stages",
+        "settings": pipeline_settings(),
+        "corpus": {"documents": len(documents), "sizes": list(args.sizes), "per_size": args.per_size,
+                   "seed": args.seed, "repeat": args.repeat},
+        "stages": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
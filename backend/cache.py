@@ -0,0 +1,140 @@
+# backend/cache.py
+
+
+# Standard Library Imports
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, Union
+
+# Third-party Imports
+from sqlalchemy import delete, select  # Query construction
+from sqlalchemy.dialects.postgresql import insert  # INSERT ... ON CONFLICT support
+from sqlalchemy.ext.asyncio import AsyncSession  # Async session for SQLAlchemy
+
+# Local Application/Library-Specific Imports
+from .models import ClassificationCache
+
+
+# Fetch cache settings from environment variables
+class CacheConfig:
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"  # Master switch for result caching
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))  # Entries kept per in-process cache
+    CACHE_TTL = float(os.getenv("CACHE_TTL", "3600"))  # Seconds before an in-process entry expires
+    CACHE_PERSISTENT = os.getenv("CACHE_PERSISTENT", "false").lower() == "true"  # Also cache in Postgres
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache with least-recently-used eviction and a time-to-live per entry.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]  # Drop expired entry
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)  # Mark as most recently used
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entries beyond the size limit."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def content_hash(data: Union[bytes, str]) -> str:
+    """SHA-256 hex digest of raw bytes or text."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_content_hash(path: str) -> str:
+    """SHA-256 hex digest of a file on disk."""
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+
+def settings_fingerprint(**settings) -> str:
+    """
+    Hash of everything that influences a classification result (model names, categories, thresholds).
+    It is part of every cache key, so changing any setting invalidates earlier entries.
+    """
+    return content_hash(json.dumps(settings, sort_keys=True, default=str))
+
+
+def cache_key(fingerprint: str, kind: str, digest: str) -> str:
+    """Build the cache key of a file ("file") or normalized text ("text") digest."""
+    return content_hash(f"{fingerprint}:{kind}:{digest}")
+
+
+# In-process caches keyed by raw file bytes and by normalized text
+file_cache = LRUCache(CacheConfig.CACHE_MAX_ENTRIES, CacheConfig.CACHE_TTL)
+text_cache = LRUCache(CacheConfig.CACHE_MAX_ENTRIES, CacheConfig.CACHE_TTL)
+
+# Document embeddings computed while classifying, keyed by raw text, so storing them costs no second pass
+embedding_cache = LRUCache(CacheConfig.CACHE_MAX_ENTRIES, CacheConfig.CACHE_TTL)
+
+
+async def load_persistent(db: AsyncSession, key: str) -> Optional[Tuple[str, str, dict]]:
+    """Look up a file result in the Postgres cache table."""
+    result = await db.execute(
+        select(
+            ClassificationCache.content,
+            ClassificationCache.predicted_category,
+            ClassificationCache.confidence_scores,
+        ).where(ClassificationCache.cache_key == key)
+    )
+    row = result.first()
+    return tuple(row) if row else None
+
+
+async def store_persistent(db: AsyncSession, key: str, fingerprint: str, file_hash: str,
+                           content: str, predicted_category: str, confidence_scores: dict):
+    """Add a file result to the Postgres cache table; committed with the caller's transaction."""
+    await db.execute(
+        insert(ClassificationCache)
+        .values(
+            cache_key=key,
+            fingerprint=fingerprint,
+            content_hash=file_hash,
+            content=content,
+            predicted_category=predicted_category,
+            confidence_scores=confidence_scores,
+        )
+        .on_conflict_do_nothing(index_elements=["cache_key"])
+    )
+
+
+async def purge_stale(db: AsyncSession, fingerprint: str):
+    """Delete persistent entries written under different model settings."""
+    await db.execute(delete(ClassificationCache).where(ClassificationCache.fingerprint != fingerprint))
+    await db.commit()
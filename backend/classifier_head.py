@@ -0,0 +1,243 @@
+# backend/classifier_head.py
+#
+# Lightweight classifier mode: logistic regression on MiniLM document embeddings,
+# with per-category thresholds calibrated on out-of-fold predictions.
+# Train:    python -m backend.classifier_head train [--data labelled.jsonl] [--holdout 0.2] [--output path]
+# Evaluate: python -m backend.classifier_head evaluate [--data labelled.jsonl] [--head path]
+# Without --data, training uses the classified rows of the documents table. A fraction of the rows,
+# chosen by text hash, is held out of training; evaluating on the training source only uses those.
+
+
+# Standard Library Imports
+import os
+import json
+import time
+import asyncio
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Third-party Imports
+import joblib  # Model persistence
+import numpy as np
+from sklearn.linear_model import LogisticRegression  # Classification head
+from sklearn.metrics import classification_report, f1_score  # Evaluation
+from sklearn.model_selection import StratifiedKFold, cross_val_predict  # Out-of-fold calibration
+
+# Local Application/Library-Specific Imports
+from .cache import content_hash
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch classifier head settings from environment variables
+class HeadConfig:
+    CLASSIFIER_MODE = os.getenv("CLASSIFIER_MODE", "zero-shot").lower()  # "zero-shot" (tiered NLI) or "head"
+    CLASSIFIER_HEAD_PATH = os.getenv(
+        "CLASSIFIER_HEAD_PATH", os.path.join(os.path.dirname(__file__), "classifier_head.joblib")
+    )
+
+
+DEFAULT_HOLDOUT = 0.2  # Fraction of the training source kept out of training for evaluation
+DEFAULT_THRESHOLD = 0.25  # Used for categories too rare to calibrate
+THRESHOLD_GRID = np.round(np.arange(0.05, 0.96, 0.05), 2)  # Candidate thresholds per category
+FALLBACK_CATEGORY = "Other"
+
+
+class ClassifierHead:
+    """
+    Multinomial logistic regression over document embeddings. A document is assigned its most
+    probable category when that probability reaches the category's calibrated threshold,
+    otherwise it falls back to "Other", like the zero-shot confidence threshold.
+    """
+
+    def __init__(self, categories: List[str], embedding_model: str, C: float = 4.0):
+        self.categories = list(categories)
+        self.embedding_model = embedding_model
+        self.model = LogisticRegression(C=C, max_iter=2000, class_weight="balanced")
+        self.thresholds: Dict[str, float] = {category: DEFAULT_THRESHOLD for category in categories}
+        self.metadata: Dict[str, object] = {}
+
+    def fit(self, embeddings: np.ndarray, labels: List[str]) -> "ClassifierHead":
+        """Calibrate thresholds on out-of-fold probabilities, then fit on all rows."""
+        labels = np.asarray(labels)
+        folds = min(5, int(min(np.unique(labels, return_counts=True)[1])))
+        if folds >= 2:
+            probabilities = cross_val_predict(
+                self.model, embeddings, labels, method="predict_proba",
+                cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=0),
+            )
+            classes = sorted(set(labels))  # Column order of cross_val_predict
+            self.thresholds.update(calibrate_thresholds(probabilities, labels, classes))
+        else:
+            logger.warning("Too few rows per category to calibrate thresholds; using the default")
+
+        self.model.fit(embeddings, labels)
+        self.metadata = {"rows": int(len(labels)), "trained_at": datetime.utcnow().isoformat(), "folds": folds}
+        return self
+
+    def scores(self, embeddings: np.ndarray) -> List[Dict[str, float]]:
+        """Probability of every category (zero for categories absent from training) per embedding."""
+        probabilities = self.model.predict_proba(np.atleast_2d(embeddings))
+        scores = []
+        for row in probabilities:
+            row_scores = {category: 0.0 for category in self.categories}
+            row_scores.update({label: float(p) for label, p in zip(self.model.classes_, row)})
+            scores.append(row_scores)
+        return scores
+
+    def decide(self, scores: Dict[str, float]) -> Tuple[str, bool]:
+        """Top category, and whether its probability reaches the category's threshold."""
+        top_category = max(scores, key=scores.get)
+        return top_category, scores[top_category] >= self.thresholds.get(top_category, DEFAULT_THRESHOLD)
+
+    def predict(self, embeddings: np.ndarray) -> List[str]:
+        predictions = []
+        for scores in self.scores(embeddings):
+            category, confident = self.decide(scores)
+            predictions.append(category if confident else FALLBACK_CATEGORY)
+        return predictions
+
+    def save(self, path: str):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> "ClassifierHead":
+        return joblib.load(path)
+
+
+def calibrate_thresholds(probabilities: np.ndarray, labels: np.ndarray, classes: List[str]) -> Dict[str, float]:
+    """
+    Per-category threshold maximizing the F1 score of "top category is c and its probability
+    reaches the threshold" on out-of-fold predictions.
+    """
+    top = np.asarray(classes)[probabilities.argmax(axis=1)]
+    top_probability = probabilities.max(axis=1)
+    thresholds = {}
+    for category in classes:
+        if category == FALLBACK_CATEGORY:
+            thresholds[category] = 0.0  # Falling back from "Other" to "Other" changes nothing
+            continue
+        truth = labels == category
+        best = max(
+            THRESHOLD_GRID,
+            key=lambda t: f1_score(truth, (top == category) & (top_probability >= t), zero_division=0),
+        )
+        thresholds[category] = float(best)
+    return thresholds
+
+
+def in_holdout(text: str, fraction: float) -> bool:
+    """
+    Whether a document belongs to the held-out split. Decided by the hash of its text, so the split is
+    the same on every run whatever the order of the rows or new documents, and repeated texts stay together.
+    """
+    return int(content_hash(text)[:8], 16) / 0x100000000 < fraction
+
+
+def split(texts: List[str], labels: List[str], fraction: float, held_out: bool) -> Tuple[List[str], List[str]]:
+    """Texts and labels of the held-out split, or of the training split."""
+    rows = [(text, label) for text, label in zip(texts, labels) if in_holdout(text, fraction) == held_out]
+    return [text for text, _ in rows], [label for _, label in rows]
+
+
+def data_source(data: Optional[str]) -> str:
+    return os.path.abspath(data) if data else "documents"
+
+
+def load_jsonl(path: str) -> Tuple[List[str], List[str]]:
+    """Texts and labels from a JSONL file with `text` and `label` fields."""
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [row["text"] for row in rows], [row["label"] for row in rows]
+
+
+async def load_documents(limit: Optional[int] = None) -> Tuple[List[str], List[str]]:
+    """Texts and categories of the classified rows in the documents table, newest first."""
+    from sqlalchemy import select
+    from .database import AsyncSessionLocal
+    from .models import Document, DocumentContent
+    from .content_store import decompress
+
+    query = (
+        select(DocumentContent.encoding, DocumentContent.data, Document.predicted_category)
+        .join(DocumentContent, DocumentContent.content_hash == Document.content_hash)
+        .order_by(Document.id.desc())
+    )
+    if limit:
+        query = query.limit(limit)
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(query)).all()
+    return [decompress(row.encoding, row.data) for row in rows], [row.predicted_category for row in rows]
+
+
+def train(args):
+    from .ml_model import EMBEDDING_MODEL_NAME, categories, embed_texts  # Loads the embedding model lazily
+
+    texts, labels = load_jsonl(args.data) if args.data else asyncio.run(load_documents(args.limit))
+    texts, labels = split(texts, labels, args.holdout, held_out=False)
+    if not texts:
+        raise SystemExit("No labelled documents to train on")
+    print(f"Training on {len(texts)} documents: " + ", ".join(f"{c}={labels.count(c)}" for c in sorted(set(labels))))
+
+    head = ClassifierHead(categories, EMBEDDING_MODEL_NAME, C=args.C).fit(embed_texts(texts), labels)
+    head.metadata.update(source=data_source(args.data), holdout=args.holdout)  # Lets evaluate skip training rows
+    head.save(args.output)
+    print(f"Saved to {args.output}; thresholds: {json.dumps(head.thresholds)}")
+
+
+def evaluate(args):
+    from .ml_model import embed_texts
+
+    head = ClassifierHead.load(args.head)
+    texts, labels = load_jsonl(args.data) if args.data else asyncio.run(load_documents(args.limit))
+    source, holdout = head.metadata.get("source", "documents"), head.metadata.get("holdout", 0.0)
+    if data_source(args.data) == source:  # Only the rows held out of training say anything about new documents
+        if not holdout:
+            raise SystemExit(
+                "The head was trained on every row of this data; retrain with --holdout or pass --data with other documents"
+            )
+        texts, labels = split(texts, labels, holdout, held_out=True)
+        print(f"Evaluating on the {len(texts)} documents held out of training")
+    if not texts:
+        raise SystemExit("No labelled documents to evaluate on")
+
+    started = time.perf_counter()
+    predictions = head.predict(embed_texts(texts))
+    seconds = time.perf_counter() - started
+
+    print(classification_report(labels, predictions, zero_division=0))
+    print(f"{len(texts)} documents in {seconds:.2f} s ({1000 * seconds / len(texts):.1f} ms per document)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or evaluate the embedding classifier head.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Fit the head and calibrate per-category thresholds")
+    train_parser.add_argument("--data", help="JSONL with `text` and `label`; defaults to the documents table")
+    train_parser.add_argument("--limit", type=int, help="Newest documents to use from the table")
+    train_parser.add_argument("--output", default=HeadConfig.CLASSIFIER_HEAD_PATH)
+    train_parser.add_argument("--C", type=float, default=4.0, help="Inverse regularization strength")
+    train_parser.add_argument(
+        "--holdout", type=float, default=DEFAULT_HOLDOUT, help="Fraction of the documents kept for evaluation"
+    )
+    train_parser.set_defaults(run=train)
+
+    evaluate_parser = commands.add_parser("evaluate", help="Report precision, recall and latency")
+    evaluate_parser.add_argument(
+        "--data", help="JSONL with `text` and `label`; defaults to the documents table (its held-out rows if trained on it)"
+    )
+    evaluate_parser.add_argument("--limit", type=int, help="Newest documents to use from the table")
+    evaluate_parser.add_argument("--head", default=HeadConfig.CLASSIFIER_HEAD_PATH)
+    evaluate_parser.set_defaults(run=evaluate)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# backend/content_store.py
+#
+# Extracted document text lives in the `document_contents` table, compressed and deduplicated by its
+# SHA-256; `documents` rows only keep the hash. Rows written before the split are moved with:
+# python -m backend.content_store migrate [--batch-size 500] [--drop-column]
+
+
+# Standard Library Imports
+import os
+import zlib
+import asyncio
+import argparse
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Third-party Imports
+from sqlalchemy import delete, exists, select, text  # Query construction
+from sqlalchemy.dialects import postgresql, sqlite  # INSERT ... ON CONFLICT support
+from sqlalchemy.ext.asyncio import AsyncSession  # Async session for SQLAlchemy
+
+# Local Application/Library-Specific Imports
+from .models import Document, DocumentContent
+from .cache import content_hash
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch content storage settings from environment variables
+class ContentConfig:
+    CONTENT_COMPRESSION = os.getenv("CONTENT_COMPRESSION", "zlib").lower()  # zlib, zstd (needs zstandard) or none
+    CONTENT_COMPRESSION_LEVEL = int(os.getenv("CONTENT_COMPRESSION_LEVEL", "6"))  # Higher is smaller and slower
+
+
+ENCODINGS = ("zlib", "zstd", "none")
+
+
+def zstandard():
+    try:
+        import zstandard  # Optional dependency, only needed for zstd compression
+    except ImportError as e:
+        raise RuntimeError("CONTENT_COMPRESSION=zstd requires `pip install zstandard`") from e
+    return zstandard
+
+
+def compress(content: str, encoding: Optional[str] = None) -> Tuple[str, bytes]:
+    """Compress text with the given (or configured) encoding; returns the encoding and the bytes."""
+    encoding = encoding or ContentConfig.CONTENT_COMPRESSION
+    data = content.encode("utf-8")
+    if encoding == "zlib":
+        return encoding, zlib.compress(data, ContentConfig.CONTENT_COMPRESSION_LEVEL)
+    if encoding == "zstd":
+        return encoding, zstandard().ZstdCompressor(level=ContentConfig.CONTENT_COMPRESSION_LEVEL).compress(data)
+    if encoding == "none":
+        return encoding, data
+    raise ValueError(f"Unknown content compression '{encoding}', expected one of {', '.join(ENCODINGS)}")
+
+
+def decompress(encoding: str, data: bytes) -> str:
+    """Text of a stored blob; every blob records its own encoding, so settings may change over time."""
+    if encoding == "zlib":
+        data = zlib.decompress(data)
+    elif encoding == "zstd":
+        data = zstandard().ZstdDecompressor().decompress(data)
+    elif encoding != "none":
+        raise ValueError(f"Unknown content encoding '{encoding}'")
+    return data.decode("utf-8")
+
+
+def insert_ignoring_duplicates(db: AsyncSession, model):
+    """INSERT ... ON CONFLICT DO NOTHING for the session's database (Postgres, or SQLite for benchmarks)."""
+    dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+    return dialect.insert(model).on_conflict_do_nothing()
+
+
+async def store_contents(db: AsyncSession, contents: Iterable[str]) -> List[str]:
+    """
+    Store texts not stored yet and return the hash of every text, in order.
+    Texts already present are neither compressed nor sent again; written in the caller's transaction.
+    """
+    contents = list(contents)
+    hashes = [content_hash(content) for content in contents]
+    unique = dict(zip(hashes, contents))
+
+    # FOR KEY SHARE holds the texts found until commit, so delete_unreferenced cannot drop one this
+    # transaction is about to refer to; a text deleted meanwhile is no longer found and is stored again
+    stored = set((await db.execute(
+        select(DocumentContent.content_hash)
+        .where(DocumentContent.content_hash.in_(list(unique)))
+        .order_by(DocumentContent.content_hash)  # Lock in a fixed order, so concurrent uploads cannot deadlock
+        .with_for_update(read=True, key_share=True)
+    )).scalars())
+    new = {digest: content for digest, content in unique.items() if digest not in stored}
+    if new:
+        rows = await asyncio.to_thread(compress_rows, new)  # Keep compression off the event loop
+        await db.execute(insert_ignoring_duplicates(db, DocumentContent), rows)
+    return hashes
+
+
+def compress_rows(contents: Dict[str, str]) -> List[dict]:
+    rows = []
+    for digest, content in contents.items():
+        encoding, data = compress(content)
+        rows.append({"content_hash": digest, "encoding": encoding, "data": data, "size": len(content.encode("utf-8"))})
+    return rows
+
+
+async def load_content(db: AsyncSession, digest: str) -> Optional[str]:
+    """Text stored under a hash, or None."""
+    row = (
+        await db.execute(select(DocumentContent.encoding, DocumentContent.data).where(DocumentContent.content_hash == digest))
+    ).first()
+    return decompress(row.encoding, row.data) if row else None
+
+
+async def delete_unreferenced(db: AsyncSession, digest: str):
+    """
+    Drop a stored text once no document refers to it; committed with the caller's transaction.
+    The text is locked before the references are counted: an upload reusing it either committed
+    already, and its document is counted, or waits for this transaction and stores the text again.
+    """
+    locked = (await db.execute(
+        select(DocumentContent.content_hash).where(DocumentContent.content_hash == digest).with_for_update()
+    )).first()
+    if locked is None:
+        return
+    referenced = (await db.execute(select(exists().where(Document.content_hash == digest)))).scalar()
+    if not referenced:
+        await db.execute(delete(DocumentContent).where(DocumentContent.content_hash == digest))
+
+
+async def migrate(batch_size: int, drop_column: bool):
+    """
+    Move inline `documents.content` text to `document_contents`, batch by batch, so it can run on a live
+    database: the column first becomes nullable (new code writes no content), then every batch stores
+    the texts, sets `content_hash` and clears the inline copy. Finally the column can be dropped.
+    """
+    from .database import engine, AsyncSessionLocal  # Imported on first use, the engine needs the database settings
+
+    async with engine.begin() as conn:
+        await conn.run_sync(DocumentContent.__table__.create, checkfirst=True)
+        await conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"))
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_documents_content_hash ON documents (content_hash)"))
+        has_column = (await conn.execute(text(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = 'documents' AND column_name = 'content'"
+        ))).first() is not None
+        if has_column:
+            await conn.execute(text("ALTER TABLE documents ALTER COLUMN content DROP NOT NULL"))
+
+    moved = 0
+    while has_column:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                text("SELECT id, content FROM documents WHERE content IS NOT NULL ORDER BY id LIMIT :limit"),
+                {"limit": batch_size},
+            )).all()
+            if not rows:
+                break
+            hashes = await store_contents(db, [row.content for row in rows])
+            await db.execute(
+                text("UPDATE documents SET content_hash = :content_hash, content = NULL WHERE id = :id"),
+                [{"id": row.id, "content_hash": digest} for row, digest in zip(rows, hashes)],
+            )
+            await db.commit()
+        moved += len(rows)
+        logger.info(f"Moved the content of {moved} documents")
+
+    if has_column and drop_column:
+        async with engine.begin() as conn:
+            await conn.execute(text("ALTER TABLE documents DROP COLUMN content"))
+        logger.info("Dropped documents.content")
+    print(f"Moved the content of {moved} documents" + ("; dropped documents.content" if has_column and drop_column else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage compressed document content storage.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="Move inline documents.content to document_contents")
+    migrate_parser.add_argument("--batch-size", type=int, default=500, help="Documents moved per transaction")
+    migrate_parser.add_argument("--drop-column", action="store_true", help="Drop documents.content afterwards")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate(args.batch_size, args.drop_column))
+
+
+if __name__ == "__main__":
+    main()
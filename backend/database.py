@@ -3,14 +3,24 @@
 
 # Standard Library Imports
 import os
+import time
+import logging
+import threading
 
 # Third-party Imports
 from dotenv import load_dotenv  # Load environment variables from .env file
+from sqlalchemy.exc import TimeoutError as PoolTimeout  # Raised when no connection frees up in time
 from sqlalchemy.orm import sessionmaker  # Create session factory for database transactions
+from sqlalchemy.pool import AsyncAdaptedQueuePool  # Default pool of async engines
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession  # Async database engine and session
 
 # Local Application/Library-Specific Imports
 from .models import Base
+from .timing import Histogram
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
 
 
 # Load database credentials from environment variables
@@ -26,16 +36,95 @@ class DatabaseConfig:
     POSTGRES_PORT = os.getenv("POSTGRES_PORT")
 
 
-# Define database URL for SQLAlchemy
-SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{DatabaseConfig.POSTGRES_USER}:{DatabaseConfig.POSTGRES_PASSWORD}@{DatabaseConfig.POSTGRES_HOST}:{DatabaseConfig.POSTGRES_PORT}/{DatabaseConfig.POSTGRES_DB}"
+# Fetch connection pool and engine settings from environment variables
+class EngineConfig:
+    DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"  # Log every SQL statement
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # Connections kept open per worker process
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # Extra connections opened under load
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Reconnect connections older than this, -1 never
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Test connections on checkout
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))  # Prepared statements per connection
+    SKIP_SCHEMA_INIT = os.getenv("SKIP_SCHEMA_INIT", "false").lower() == "true"  # Schema is managed by migrations
+
+
+# Define database URL for SQLAlchemy; DATABASE_URL, when set, takes precedence (e.g. a SQLite stand-in for benchmarks)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql+asyncpg://{DatabaseConfig.POSTGRES_USER}:{DatabaseConfig.POSTGRES_PASSWORD}@{DatabaseConfig.POSTGRES_HOST}:{DatabaseConfig.POSTGRES_PORT}/{DatabaseConfig.POSTGRES_DB}"
+
+
+class PoolStats:
+    """Connection checkouts since startup and the time callers waited for a connection."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_histogram = Histogram()
+        self._lock = threading.Lock()
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += not timed_out
+            self.timeouts += timed_out
+        self.wait_histogram.observe("checkout", seconds)
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long every checkout waited, including the connect of new connections."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            pool_stats.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.observe_wait(time.perf_counter() - started)
+        return connection
+
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments of create_async_engine for the configured pool."""
+    options = {
+        "future": True,
+        "echo": EngineConfig.DB_ECHO,
+        "pool_pre_ping": EngineConfig.DB_POOL_PRE_PING,
+    }
+    if not url.startswith("sqlite") or ":memory:" not in url:  # In-memory SQLite keeps its single-connection pool
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=EngineConfig.DB_POOL_SIZE,
+            max_overflow=EngineConfig.DB_MAX_OVERFLOW,
+            pool_timeout=EngineConfig.DB_POOL_TIMEOUT,
+            pool_recycle=EngineConfig.DB_POOL_RECYCLE,
+        )
+    if url.startswith("postgresql+asyncpg"):
+        # asyncpg prepares every statement; cached per connection, repeated statements skip the parse step
+        options["connect_args"] = {"prepared_statement_cache_size": EngineConfig.DB_STATEMENT_CACHE_SIZE}
+    return options
+
 
 # Create async database engine
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL, future=True, echo=True)
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
 
 # Create async session factory
 AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def pool_status() -> dict:
+    """Current pool occupancy and checkout counters, for sizing the pool against the worker count."""
+    pool = engine.sync_engine.pool
+    status = {"checkouts": pool_stats.checkouts, "timeouts": pool_stats.timeouts}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(), checked_out=pool.checkedout(), idle=pool.checkedin(), overflow=max(0, pool.overflow()),
+            max_overflow=EngineConfig.DB_MAX_OVERFLOW,
+        )
+    return status
+
+
 # Dependency to get database session
 async def get_db():
     async with AsyncSessionLocal() as db:
@@ -44,5 +133,8 @@ async def get_db():
 
 # Initialize database and create tables
 async def init_db():
+    if EngineConfig.SKIP_SCHEMA_INIT:
+        logger.info("Skipping schema creation (SKIP_SCHEMA_INIT)")
+        return
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,285 @@
+# backend/dedup.py
+#
+# Near-duplicate detection at ingest: a MinHash signature of the word shingles of every document, and an
+# in-process LSH band index over the stored signatures. An upload whose estimated Jaccard similarity to a
+# stored document reaches DEDUP_THRESHOLD reuses that document's classification instead of running the models.
+# Existing databases get the `duplicate_of` column, and signatures of documents stored before, with:
+# python -m backend.dedup backfill [--batch-size 256]
+
+
+# Standard Library Imports
+import os
+import asyncio
+import hashlib
+import argparse
+import logging
+import threading
+from functools import lru_cache
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Third-party Imports
+import numpy as np
+from sqlalchemy import select, text  # Query construction and schema changes
+
+# Local Application/Library-Specific Imports
+from .models import Document, DocumentContent, DocumentSignature
+from .vector_index import IndexSynchronizer
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch near-duplicate detection settings from environment variables
+class DedupConfig:
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"  # Look up and store signatures
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.9"))  # Estimated Jaccard similarity to reuse a result
+    DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))  # MinHash functions per signature
+    DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))  # LSH bands; must divide DEDUP_NUM_PERM
+    DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "5"))  # Words per shingle
+    DEDUP_MIN_WORDS = int(os.getenv("DEDUP_MIN_WORDS", "20"))  # Shorter documents are always classified
+    DEDUP_SYNC_INTERVAL = float(os.getenv("DEDUP_SYNC_INTERVAL", "10"))  # Seconds between catch-up polls
+    DEDUP_SYNC_LAG_IDS = int(os.getenv("DEDUP_SYNC_LAG_IDS", "1000"))  # Ids below the newest rechecked per poll
+    DEDUP_RECONCILE_INTERVAL = float(os.getenv("DEDUP_RECONCILE_INTERVAL", "3600"))  # Seconds between full rescans
+
+
+HASH_SEED = 1  # Fixed, so signatures stay comparable across processes and restarts
+SHINGLE_BLOCK = 4096  # Shingles hashed by all functions at a time, bounding memory for long documents
+
+
+def shingles(words: Sequence[str], size: int = DedupConfig.DEDUP_SHINGLE_SIZE) -> set:
+    """Distinct runs of `size` consecutive words; a shorter text is a single shingle."""
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+@lru_cache(maxsize=None)
+def hash_parameters(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Multipliers (odd) and offsets of the multiply-shift hash functions."""
+    rng = np.random.default_rng(HASH_SEED)
+    multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return multipliers, offsets
+
+
+def minhash(shingle_set: set, num_perm: int = DedupConfig.DEDUP_NUM_PERM) -> np.ndarray:
+    """
+    MinHash signature: for each of `num_perm` hash functions, the smallest hash of any shingle.
+    The share of equal positions in two signatures estimates the Jaccard similarity of the shingle sets.
+    """
+    multipliers, offsets = hash_parameters(num_perm)
+    signature = np.full(num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+    values = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little") for shingle in shingle_set),
+        dtype=np.uint64, count=len(shingle_set),
+    )
+    for start in range(0, len(values), SHINGLE_BLOCK):
+        block = values[start:start + SHINGLE_BLOCK, None]
+        hashed = ((block * multipliers + offsets) >> np.uint64(32)).astype(np.uint32)  # Wraps modulo 2^64
+        np.minimum(signature, hashed.min(axis=0), out=signature)
+    return signature
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+def document_signature(text: str, words: Optional[List[str]] = None) -> Optional[np.ndarray]:
+    """
+    Signature of the preprocessed words of a document, or None when it is too short to compare.
+    `words` are the already preprocessed words of `text`, when the caller has them.
+    """
+    from .utils import preprocess_words  # Needs the NLTK stop words
+
+    if words is None:
+        words = preprocess_words(text)
+    if len(words) < DedupConfig.DEDUP_MIN_WORDS:
+        return None
+    return minhash(shingles(words))
+
+
+def encode_signature(signature: np.ndarray) -> bytes:
+    return np.asarray(signature, dtype="<u4").tobytes()
+
+
+def decode_signature(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hashing over MinHash signatures. Each signature is cut into `bands` bands of
+    `num_perm / bands` rows; documents sharing any band become candidates, and candidates are confirmed by
+    comparing full signatures. With 16 bands of 8 rows, pairs at 0.9 similarity are found with 99.99%
+    probability while pairs at 0.5 rarely become candidates.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.9):
+        if num_perm % bands:
+            raise ValueError(f"DEDUP_BANDS ({bands}) must divide DEDUP_NUM_PERM ({num_perm})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, doc_id: int, signature: np.ndarray):
+        """Insert (or replace) the signature of a document."""
+        signature = np.asarray(signature, dtype=np.uint32)
+        if len(signature) != self.num_perm:
+            logger.warning(f"Skipping signature of document {doc_id}: {len(signature)} hashes, not {self.num_perm}")
+            return
+        with self._lock:
+            self._remove(int(doc_id))
+            self._signatures[int(doc_id)] = signature
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                buckets[key].append(int(doc_id))
+
+    def _remove(self, doc_id: int) -> bool:
+        signature = self._signatures.pop(doc_id, None)
+        if signature is None:
+            return False
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del buckets[key]
+        return True
+
+    def remove(self, doc_id: int) -> bool:
+        """Drop a document; returns whether it was indexed."""
+        with self._lock:
+            return self._remove(int(doc_id))
+
+    def query(self, signature: np.ndarray) -> Optional[Tuple[int, float]]:
+        """The most similar indexed document at or above the threshold, as (document id, similarity)."""
+        signature = np.asarray(signature, dtype=np.uint32)
+        with self._lock:
+            candidates = set()
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(key, ()))
+            scored = [(doc_id, estimated_jaccard(signature, self._signatures[doc_id])) for doc_id in candidates]
+
+        best = max(scored, key=lambda match: (match[1], -match[0]), default=None)  # Oldest document wins ties
+        return best if best is not None and best[1] >= self.threshold else None
+
+
+# Shared index of the application process
+lsh_index = LSHIndex(DedupConfig.DEDUP_NUM_PERM, DedupConfig.DEDUP_BANDS, DedupConfig.DEDUP_THRESHOLD)
+
+# Lookups that found a near-duplicate ("hit") or not ("miss") since startup
+dedup_counts = {"hit": 0, "miss": 0}
+dedup_lock = threading.Lock()
+
+
+def add_stored_signatures(doc_ids: List[int], data: List[bytes]):
+    for doc_id, signature in zip(doc_ids, data):
+        lsh_index.add(doc_id, decode_signature(signature))
+
+
+signature_sync = IndexSynchronizer(
+    "Duplicate index", DocumentSignature.document_id, DocumentSignature.signature, add_stored_signatures,
+    lsh_index.__contains__, enabled=DedupConfig.DEDUP_ENABLED, interval=DedupConfig.DEDUP_SYNC_INTERVAL,
+    lag_ids=DedupConfig.DEDUP_SYNC_LAG_IDS, reconcile_interval=DedupConfig.DEDUP_RECONCILE_INTERVAL,
+)
+
+
+async def find_duplicate(signature: np.ndarray) -> Optional[dict]:
+    """
+    Stored document whose text is a near-duplicate of the signature's, with its classification:
+    `duplicate_of` (the original, never itself a duplicate), `predicted_category`, `confidence_scores`
+    and `similarity`. Returns None when there is none.
+    """
+    from .database import AsyncSessionLocal  # Imported on first use, the engine needs the database settings
+
+    match = lsh_index.query(signature)
+    row = None
+    if match is not None:
+        async with AsyncSessionLocal() as db:  # Own session, so concurrent lookups never share one
+            row = (
+                await db.execute(
+                    select(
+                        Document.id, Document.duplicate_of, Document.predicted_category, Document.confidence_scores
+                    ).where(Document.id == match[0])
+                )
+            ).first()
+        if row is None:  # Deleted by another process
+            lsh_index.remove(match[0])
+
+    with dedup_lock:
+        dedup_counts["hit" if row is not None else "miss"] += 1
+    if row is None:
+        return None
+    return {
+        "duplicate_of": row.duplicate_of or row.id,
+        "predicted_category": row.predicted_category,
+        "confidence_scores": dict(row.confidence_scores),
+        "similarity": match[1],
+    }
+
+
+async def backfill(batch_size: int):
+    """Add the `duplicate_of` column if missing and store signatures of documents that have none."""
+    from .database import engine, AsyncSessionLocal  # Imported on first use, the engine needs the database settings
+    from .content_store import decompress
+
+    async with engine.begin() as conn:
+        await conn.run_sync(DocumentSignature.__table__.create, checkfirst=True)
+        await conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS duplicate_of INTEGER"))
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_documents_duplicate_of ON documents (duplicate_of)"))
+
+    done, last_id = 0, 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(Document.id, DocumentContent.encoding, DocumentContent.data)
+                    .join(DocumentContent, DocumentContent.content_hash == Document.content_hash)
+                    .outerjoin(DocumentSignature, DocumentSignature.document_id == Document.id)
+                    .where(DocumentSignature.document_id.is_(None), Document.id > last_id)
+                    .order_by(Document.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+            signatures = await asyncio.to_thread(
+                lambda: [document_signature(decompress(row.encoding, row.data)) for row in rows]
+            )
+            db.add_all([
+                DocumentSignature(document_id=row.id, signature=encode_signature(signature))
+                for row, signature in zip(rows, signatures) if signature is not None  # Too short to compare
+            ])
+            await db.commit()
+        done, last_id = done + len(rows), rows[-1].id
+        logger.info(f"Signed {done} documents")
+    print(f"Signed {done} documents")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage near-duplicate signatures.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = commands.add_parser("backfill", help="Add the duplicate_of column and sign stored documents")
+    backfill_parser.add_argument("--batch-size", type=int, default=256, help="Documents signed per transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(backfill(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
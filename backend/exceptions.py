@@ -34,3 +34,31 @@ class ModelInferenceError(HTTPException):
 class CorruptedFile(HTTPException):
     def __init__(self, message: str):
         super().__init__(status_code=400, detail=message)
+
+
+# Custom exception for a saturated inference worker pool
+class InferenceQueueFull(HTTPException):
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail="Inference queue is full. Please retry later.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+# Custom exception for inference requests exceeding their time budget
+class InferenceTimeout(HTTPException):
+    def __init__(self, timeout: float):
+        super().__init__(status_code=504, detail=f"Inference timed out after {timeout:.0f} seconds")
+
+
+# Custom exception for uploads exceeding the size limit
+class FileTooLarge(HTTPException):
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"File exceeds the maximum size of {max_bytes // (1024 * 1024)} MB")
+
+
+# Custom exception for streamed uploads abandoned by the client
+class UploadCancelled(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=499, detail="Upload cancelled by the client")
@@ -0,0 +1,307 @@
+# backend/extractors.py
+
+
+# Standard Library Imports
+import io
+import os
+import time
+import codecs
+import atexit
+import shutil
+import hashlib
+import logging
+import zipfile
+import tempfile
+import posixpath
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, List, Optional, Tuple
+
+# Third-party Imports
+from lxml import etree  # Incremental XML parsing of DOCX bodies
+from PyPDF2 import PdfReader  # PDF reading library
+
+# Local Application/Library-Specific Imports
+from .exceptions import FileTooLarge, InvalidFileType
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch ingestion settings from environment variables
+class IngestConfig:
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))  # Largest accepted file
+    READ_CHUNK_SIZE = int(os.getenv("READ_CHUNK_SIZE", str(64 * 1024)))  # Bytes decoded per read
+    MULTIPART_OVERHEAD = 64 * 1024  # Allowance for multipart headers when checking Content-Length
+    PDF_SEQUENTIAL_PAGES = int(os.getenv("PDF_SEQUENTIAL_PAGES", "16"))  # Pages read in-process before going parallel
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))  # Processes for large PDFs
+    PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))  # Pages extracted per process task
+    PDF_SLOW_PAGE_SECONDS = float(os.getenv("PDF_SLOW_PAGE_SECONDS", "1.0"))  # Pages slower than this are logged
+    DOCX_INCLUDE_TABLES = os.getenv("DOCX_INCLUDE_TABLES", "false").lower() == "true"  # Also extract table cells
+
+
+WORD_LIMIT = 5000  # Words kept from every document; nothing beyond is ever used
+SUPPORTED_EXTENSIONS = ('.txt', '.pdf', '.docx')
+STREAMED_EXTENSIONS = ('.txt',)  # Formats decoded incrementally, without reading the whole file
+
+
+class UploadStream:
+    """
+    Read-only view of an upload stream that enforces the size limit and hashes every
+    byte consumed, so the cache key is available without a separate pass.
+    """
+
+    def __init__(self, raw: BinaryIO, max_bytes: int = IngestConfig.MAX_UPLOAD_BYTES):
+        self.raw = raw
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self._hash = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        if self.bytes_read > self.max_bytes:  # Stop as soon as the limit is crossed
+            raise FileTooLarge(self.max_bytes)
+        self._hash.update(data)
+        return data
+
+    def consume(self, chunk_size: int = IngestConfig.READ_CHUNK_SIZE):
+        """Hash the rest of the stream, then rewind it for formats that need random access."""
+        while self.read(chunk_size):
+            pass
+        self.raw.seek(0)
+
+    def hexdigest(self) -> str:
+        """SHA-256 of the bytes consumed so far."""
+        return self._hash.hexdigest()
+
+
+def limit_words(text: str, word_limit: int = WORD_LIMIT) -> str:
+    """Ensure extracted text is within the word limit."""
+    words = text.split()  # Split text into words
+    if len(words) > word_limit:  # If the text exceeds the limit
+        text = " ".join(words[:word_limit])  # Trim text to the limit
+    return text
+
+
+def extract_text_stream(stream, word_limit: int = WORD_LIMIT,
+                        chunk_size: int = IngestConfig.READ_CHUNK_SIZE) -> str:
+    """
+    Decode UTF-8 text incrementally and stop reading once the word limit is exceeded.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+    pieces: List[str] = []
+    word_count = 0  # Complete words decoded so far
+    tail = ""  # Trailing word that may continue in the next chunk
+
+    while True:
+        data = stream.read(chunk_size)
+        piece = decoder.decode(data, final=not data)
+        pieces.append(piece)
+
+        # Count words, carrying a possibly cut-off word over to the next chunk
+        words = (tail + piece).split()
+        if words and not (tail + piece)[-1].isspace():
+            tail = words.pop()
+        else:
+            tail = ""
+        word_count += len(words)
+
+        if not data or word_count + bool(tail) > word_limit:
+            break
+
+    return limit_words("".join(pieces), word_limit)
+
+
+# Process pool for extracting pages of large PDFs, created on first use
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        # Spawned workers only import this module, not the models loaded in the parent
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=IngestConfig.PDF_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+atexit.register(shutdown_pdf_pool)
+
+
+def extract_pdf_page_range(path: str, start: int, end: int) -> List[Tuple[str, float]]:
+    """Extract pages [start, end) of a PDF file, returning each page's text and extraction time."""
+    reader = PdfReader(path)
+    results = []
+    for page in reader.pages[start:end]:
+        started = time.perf_counter()
+        text = page.extract_text() or ""
+        results.append((text, time.perf_counter() - started))
+    return results
+
+
+def extract_pdf_text(stream, word_limit: int = WORD_LIMIT, timings: Optional[List[float]] = None) -> str:
+    """
+    Extract PDF text page by page and stop as soon as the word limit is met.
+    The first PDF_SEQUENTIAL_PAGES pages are read in-process; if the budget is still not met, the
+    remaining pages are extracted in parallel waves on a process pool, in page order. The PDF is then
+    written once to a temporary file that the workers read, so tasks only carry their page range.
+    Per-page extraction times are appended to `timings` when given, and slow pages are logged.
+    """
+    reader = PdfReader(stream)  # Create a PDF reader; pages are parsed lazily
+    page_count = len(reader.pages)
+    page_texts: List[str] = []
+    page_times: List[float] = [] if timings is None else timings
+    word_count = 0
+    started = time.perf_counter()
+
+    def add_page(text: str, seconds: float):
+        nonlocal word_count
+        if seconds > IngestConfig.PDF_SLOW_PAGE_SECONDS:
+            logger.warning(f"PDF page {len(page_texts) + 1}/{page_count} took {seconds:.2f} seconds to extract")
+        page_texts.append(text)
+        page_times.append(seconds)
+        word_count += len(text.split())
+
+    # Read the first pages in-process; most documents meet the budget here
+    for page in reader.pages[:IngestConfig.PDF_SEQUENTIAL_PAGES]:
+        page_started = time.perf_counter()
+        add_page(page.extract_text() or "", time.perf_counter() - page_started)
+        if word_count >= word_limit:
+            break
+
+    # Extract the remaining pages in parallel waves until the budget is met
+    next_page = len(page_texts)
+    if word_count < word_limit and next_page < page_count:
+        if IngestConfig.PDF_WORKERS > 1:
+            stream.seek(0)
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                shutil.copyfileobj(stream, f, IngestConfig.READ_CHUNK_SIZE)
+            pool = get_pdf_pool()
+            per_task = IngestConfig.PDF_PAGES_PER_TASK
+            try:
+                while word_count < word_limit and next_page < page_count:
+                    wave_end = min(next_page + IngestConfig.PDF_WORKERS * per_task, page_count)
+                    futures = [
+                        pool.submit(extract_pdf_page_range, f.name, start, min(start + per_task, wave_end))
+                        for start in range(next_page, wave_end, per_task)
+                    ]
+                    for future in futures:  # Consume in page order
+                        for text, seconds in future.result():
+                            if word_count < word_limit:
+                                add_page(text, seconds)
+                    next_page = wave_end
+            finally:
+                os.unlink(f.name)  # Tasks still running after a failure only lose their own results
+        else:
+            for page in reader.pages[next_page:]:
+                page_started = time.perf_counter()
+                add_page(page.extract_text() or "", time.perf_counter() - page_started)
+                if word_count >= word_limit:
+                    break
+
+    logger.info(
+        f"Extracted {len(page_texts)}/{page_count} PDF pages in {time.perf_counter() - started:.2f} seconds"
+        + (f", slowest page {max(page_times):.2f} seconds" if page_times else "")
+    )
+    return " ".join(page_texts)
+
+
+# WordprocessingML names used by the DOCX extractor
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY, W_P, W_R, W_HYPERLINK, W_TC, W_TR = W + "body", W + "p", W + "r", W + "hyperlink", W + "tc", W + "tr"
+W_T, W_BR = W + "t", W + "br"
+RUN_TEXT = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}  # Besides w:t and w:br
+OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+
+def docx_main_part(archive: zipfile.ZipFile) -> str:
+    """Name of the main document part, found through the package relationships like Word does."""
+    try:
+        for relationship in etree.fromstring(archive.read("_rels/.rels")).iter(RELATIONSHIP):
+            if relationship.get("Type") == OFFICE_DOCUMENT:
+                return posixpath.normpath(relationship.get("Target").lstrip("/"))
+    except KeyError:
+        pass
+    return "word/document.xml"
+
+
+def extract_docx_text(stream, word_limit: int = WORD_LIMIT,
+                      include_tables: bool = IngestConfig.DOCX_INCLUDE_TABLES) -> str:
+    """
+    Extract DOCX text by streaming the main document part through an incremental XML parser,
+    without building an object model, and stop once the word limit is exceeded.
+    Paragraphs are joined by newlines and their runs read like python-docx's `Paragraph.text`
+    (tabs, line breaks and hyperlink text included); paragraphs of table cells are included in
+    document order when `include_tables` is set.
+    """
+    archive = zipfile.ZipFile(stream)
+    paragraphs: List[str] = []
+    word_count = 0
+    stack: List[str] = []  # Tags of the open elements
+    buffers: List[List[str]] = []  # Text of the open paragraphs, innermost last
+
+    with archive.open(docx_main_part(archive)) as part:
+        for event, element in etree.iterparse(part, events=("start", "end"), remove_blank_text=True):
+            if event == "start":
+                stack.append(element.tag)
+                if element.tag == W_P:
+                    buffers.append([])
+                continue
+
+            tag = stack.pop()
+            if tag == W_T or tag == W_BR or tag in RUN_TEXT:
+                # Only run content directly in a paragraph or in one of its hyperlinks is paragraph text
+                if stack[-1] == W_R and (stack[-2] == W_P or (stack[-2] == W_HYPERLINK and stack[-3] == W_P)):
+                    if tag == W_T:
+                        buffers[-1].append(element.text or "")
+                    elif tag == W_BR:
+                        buffers[-1].append("\n" if element.get(W + "type", "textWrapping") == "textWrapping" else "")
+                    else:
+                        buffers[-1].append(RUN_TEXT[tag])
+
+            elif tag == W_P:
+                text = "".join(buffers.pop())
+                if stack[-1] == W_BODY or (include_tables and stack[-1] == W_TC):
+                    paragraphs.append(text)
+                    word_count += len(text.split())
+                    if word_count > word_limit:  # Enough text; the rest of the file is never decompressed
+                        break
+
+            # Free parsed content: finished paragraphs and rows, and finished top-level blocks
+            if tag in (W_P, W_TR) or (stack and stack[-1] == W_BODY):
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    return "\n".join(paragraphs)
+
+
+def extract_text_from_stream(stream, file_extension: str, word_limit: int = WORD_LIMIT) -> str:
+    """
+    Extract text from an upload stream based on its file extension, keeping at most `word_limit` words.
+    Text files are decoded on the fly; PDF and DOCX need a seekable stream.
+    """
+    if file_extension == '.txt':  # If the file is a text file
+        return extract_text_stream(stream, word_limit)
+
+    elif file_extension == '.pdf':  # If the file is a PDF
+        text = extract_pdf_text(stream, word_limit)  # Extract pages until the word limit is met
+
+    elif file_extension == '.docx':  # If the file is a DOCX
+        text = extract_docx_text(stream, word_limit)  # Stream paragraphs until the word limit is met
+
+    else:
+        raise InvalidFileType()  # Raise error for unsupported formats
+
+    return limit_words(text, word_limit)
@@ -0,0 +1,82 @@
+# backend/health.py
+
+
+# Standard Library Imports
+from typing import List, Optional
+
+# Third-party Imports
+from fastapi import APIRouter, HTTPException, Query  # FastAPI imports for API routing
+from fastapi.concurrency import run_in_threadpool  # Load models without stalling the event loop
+
+# Local Application/Library-Specific Imports
+from .model_registry import ModelConfig, model_registry, warmup_names
+from .timing import counter_snapshot, timing_snapshot
+
+
+# Initialize FastAPI Router
+router = APIRouter()
+
+
+# Application lifecycle state shared with the startup hook
+class AppState:
+    started = False  # Set once database initialization has finished
+
+
+def model_status() -> dict:
+    """Loaded state and load time of every registered model."""
+    return {
+        name: {"loaded": model_registry.is_loaded(name), "load_time": model_registry.load_times.get(name)}
+        for name in model_registry.names
+    }
+
+
+@router.get("/health/live", summary="Liveness probe")
+async def liveness():
+    """
+    Endpoint reporting that the process is up and serving requests.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/health/startup", summary="Startup probe")
+async def startup_probe():
+    """
+    Endpoint reporting whether application startup has completed.
+    """
+    if not AppState.started:
+        raise HTTPException(status_code=503, detail="Application is starting")
+    return {"status": "started"}
+
+
+@router.get("/health/ready", summary="Readiness probe")
+async def readiness():
+    """
+    Endpoint reporting whether the application is ready for traffic:
+    startup has completed and every model listed in WARMUP_MODELS is loaded.
+    """
+    pending = [name for name in warmup_names(ModelConfig.WARMUP_MODELS) if not model_registry.is_loaded(name)]
+    if not AppState.started or pending:
+        raise HTTPException(status_code=503, detail={"status": "not ready", "pending_models": pending})
+    return {"status": "ready", "models": model_status()}
+
+
+@router.post("/warmup/", summary="Load models ahead of traffic")
+async def warmup(models: Optional[List[str]] = Query(None)):
+    """
+    Endpoint to load the given models (all registered models by default) and report their load times.
+    """
+    unknown = [name for name in models or [] if name not in model_registry.names]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown models: {', '.join(unknown)}")
+
+    load_times = await run_in_threadpool(model_registry.warmup, models)
+    return {"load_times": load_times, "models": model_status()}
+
+
+@router.get("/health/timings", summary="Time spent in each pipeline stage")
+async def stage_timings():
+    """
+    Endpoint reporting calls, total and mean seconds of every classification pipeline stage since startup,
+    along with pipeline counters such as chunks skipped by early exit.
+    """
+    return {"stages": timing_snapshot(), "counters": counter_snapshot()}
@@ -0,0 +1,124 @@
+# backend/inference.py
+
+
+# Standard Library Imports
+import os
+import asyncio
+import logging
+import threading
+import contextvars
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Local Application/Library-Specific Imports
+from .exceptions import InferenceQueueFull, InferenceTimeout
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch inference pool settings from environment variables
+class InferenceConfig:
+    INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1)))  # Concurrent model runs
+    INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "32"))  # Waiting requests before rejecting
+    INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "120"))  # Seconds a request may wait for its result
+    INFERENCE_RETRY_AFTER = int(os.getenv("INFERENCE_RETRY_AFTER", "5"))  # Retry-After hint for rejected requests
+    INFERENCE_TORCH_THREADS = int(os.getenv("INFERENCE_TORCH_THREADS", "0"))  # PyTorch intra-op threads, 0 = default
+
+
+class InferenceExecutor:
+    """
+    Bounded worker pool that keeps model inference off the event loop.
+    Threads are used so that all workers share the loaded model weights; PyTorch releases
+    the GIL inside its kernels, so runs proceed in parallel. At most `max_workers + queue_size`
+    jobs are admitted at once, further submissions are rejected with a 503.
+    """
+
+    def __init__(self, max_workers: int, queue_size: int, timeout: float, retry_after: int, torch_threads: int = 0):
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.torch_threads = torch_threads
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.queue_size)  # Admission control
+        self._pending = 0  # Jobs admitted but not yet finished
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of admitted jobs that are running or queued."""
+        return self._pending
+
+    def start(self):
+        """Create the worker threads and optionally cap PyTorch's intra-op threads."""
+        if self._executor is not None:
+            return
+
+        # NLI batches run on a single batcher thread that should use every core, so the
+        # thread count is only capped on request (e.g. when batching is disabled)
+        if self.torch_threads > 0:
+            try:
+                import torch  # Imported lazily so the pool works without the ML stack
+                torch.set_num_threads(self.torch_threads)
+            except ImportError:
+                pass
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        logger.info(f"Inference pool started with {self.max_workers} workers and a queue of {self.queue_size}")
+
+    def shutdown(self):
+        """Stop accepting work and wait for running jobs to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+        if future is not None and not future.cancelled():
+            future.exception()  # Mark errors of jobs whose caller gave up (timeout, cancelled upload) as seen
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run `func(*args)` on the pool and await its result.
+        Raises InferenceQueueFull when the pool is saturated and InferenceTimeout when
+        the result is not ready within the timeout.
+        """
+        if not self._slots.acquire(blocking=False):  # Reject instead of queueing unboundedly
+            raise InferenceQueueFull(self.retry_after)
+
+        with self._lock:
+            self._pending += 1
+
+        try:
+            self.start()
+            # Run in a copy of the caller's context, so stage timings reach the request they belong to
+            context = contextvars.copy_context()
+            future = asyncio.get_running_loop().run_in_executor(self._executor, partial(context.run, func, *args))
+        except Exception:
+            self._release()
+            raise
+
+        # The slot is only freed once the worker is really done, even if the caller gave up
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Inference job {getattr(func, '__name__', func)} exceeded {timeout} seconds")
+            raise InferenceTimeout(timeout)
+
+
+# Shared inference pool for the application
+inference_executor = InferenceExecutor(
+    max_workers=InferenceConfig.INFERENCE_WORKERS,
+    queue_size=InferenceConfig.INFERENCE_QUEUE_SIZE,
+    timeout=InferenceConfig.INFERENCE_TIMEOUT,
+    retry_after=InferenceConfig.INFERENCE_RETRY_AFTER,
+    torch_threads=InferenceConfig.INFERENCE_TORCH_THREADS,
+)
@@ -0,0 +1,376 @@
+# backend/jobs.py
+
+
+# Standard Library Imports
+import io
+import os
+import json
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# Third-party Imports
+from sqlalchemy import select, update  # Query construction
+from sqlalchemy.ext.asyncio import AsyncSession  # Async session for SQLAlchemy
+from fastapi import HTTPException  # Exception handling for FastAPI
+from fastapi.encoders import jsonable_encoder  # JSON-compatible event payloads
+
+# Local Application/Library-Specific Imports
+from .models import Document, UploadJob
+from .database import AsyncSessionLocal
+from .services import DOCUMENT_LISTING_COLUMNS, analyze_file, persist_documents
+from .exceptions import InferenceQueueFull, ModelInferenceError
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch job queue settings from environment variables
+class JobConfig:
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # Background workers per process, 0 disables them
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # Seconds between polls of an idle queue
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))  # Attempts before a job is dead-lettered
+    JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "10"))  # Base backoff in seconds, doubled per attempt
+    JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "30"))  # Seconds between heartbeats of a job
+    JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "600"))  # Running jobs silent this long are requeued
+    JOB_STALE_SWEEP_INTERVAL = float(os.getenv("JOB_STALE_SWEEP_INTERVAL", "60"))  # Seconds between stale checks
+    JOB_MAX_WAIT = float(os.getenv("JOB_MAX_WAIT", "30"))  # Longest long-poll wait in seconds
+
+
+# Job states; done, failed and dead are final
+QUEUED, RUNNING, DONE, FAILED, DEAD = "queued", "running", "done", "failed", "dead"
+FINAL_STATES = (DONE, FAILED, DEAD)
+
+ATTEMPTS_EXHAUSTED = "No attempts left"  # Error of jobs dead-lettered without a recorded error
+WORKER_LOST = "Worker stopped while processing the job"  # Error of stale jobs with no attempts left
+
+
+# Events set when a job finishes in this process, so long-polls return without waiting for the next poll
+_job_events: Dict[int, asyncio.Event] = {}
+_job_waiters: Dict[int, int] = {}  # Waiters sharing each event; it is dropped when the last one leaves
+_queue_event = asyncio.Event()  # Set when a job is enqueued in this process
+
+
+async def enqueue_job(db: AsyncSession, filename: str, payload: bytes, priority: int = 0) -> UploadJob:
+    """Persist an upload as a queued job and wake up the local workers."""
+    job = UploadJob(
+        filename=filename,
+        payload=payload,
+        status=QUEUED,
+        priority=priority,
+        max_attempts=JobConfig.JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    _queue_event.set()
+    return job
+
+
+async def claim_job(db: AsyncSession) -> Optional[UploadJob]:
+    """
+    Take the next runnable job, highest priority first. FOR UPDATE SKIP LOCKED lets several
+    workers and processes poll the same table without handing out a job twice; the status check
+    in the UPDATE keeps claims exclusive on databases without row locks as well.
+    Jobs that already used up their attempts are dead-lettered instead of being run again.
+    """
+    while True:
+        job = (
+            await db.execute(
+                select(UploadJob)
+                .where(UploadJob.status == QUEUED, UploadJob.available_at <= datetime.utcnow())
+                .order_by(UploadJob.priority.desc(), UploadJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+        ).scalar_one_or_none()
+        if job is None:
+            await db.rollback()
+            return None
+        if job.attempts < job.max_attempts:
+            break
+        logger.warning(f"Job {job.id} dead-lettered after {job.attempts} attempts: {job.error}")
+        await finish_job(db, job, DEAD, error=job.error or ATTEMPTS_EXHAUSTED)
+
+    claimed = await db.execute(
+        update(UploadJob)
+        .where(UploadJob.id == job.id, UploadJob.status == QUEUED)
+        .values(status=RUNNING, attempts=UploadJob.attempts + 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if claimed.rowcount != 1:  # Another worker got there first
+        return None
+
+    await db.refresh(job)
+    return job
+
+
+def set_outcome(job: UploadJob, status: str, error: Optional[str] = None, document_id: Optional[int] = None):
+    """Set the outcome of a job attempt on the job row, to be committed by the caller."""
+    job.status = status
+    job.error = error
+    job.document_id = document_id
+
+    if status == QUEUED:  # Retry later with exponential backoff
+        job.available_at = datetime.utcnow() + timedelta(seconds=JobConfig.JOB_RETRY_DELAY * 2 ** (job.attempts - 1))
+    else:
+        job.payload = None  # The raw file is no longer needed
+
+
+def notify_finished(job_id: int):
+    """Wake local waiters of a job that reached a final state."""
+    if job_id in _job_events:
+        _job_events[job_id].set()
+
+
+async def finish_job(db: AsyncSession, job: UploadJob, status: str, error: Optional[str] = None,
+                     document_id: Optional[int] = None):
+    """Record the outcome of a job attempt and notify local waiters."""
+    set_outcome(job, status, error, document_id)
+    await db.commit()
+
+    if status in FINAL_STATES:
+        notify_finished(job.id)
+
+
+async def heartbeat(job_id: int):
+    """Refresh `updated_at` of a running job until cancelled, so the stale sweep leaves live jobs alone."""
+    while True:
+        await asyncio.sleep(JobConfig.JOB_HEARTBEAT_INTERVAL)
+        try:
+            async with AsyncSessionLocal() as db:  # Own session, the job's session is busy with the upload
+                await db.execute(
+                    update(UploadJob)
+                    .where(UploadJob.id == job_id, UploadJob.status == RUNNING)
+                    .values(updated_at=datetime.utcnow())
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Heartbeat of job {job_id} failed: {str(e)}")
+
+
+async def run_job(db: AsyncSession, job: UploadJob):
+    """
+    Extract, classify and store the document of a claimed job. The document and the job's done state
+    are committed in one transaction, so a crash cannot leave a stored document behind a requeued job.
+    """
+    beat = asyncio.create_task(heartbeat(job.id))
+    try:
+        await attempt_job(db, job)
+    finally:
+        beat.cancel()
+
+
+async def attempt_job(db: AsyncSession, job: UploadJob):
+    """Run one attempt of a job and record its outcome."""
+    try:
+        analysis = await analyze_file(job.filename, io.BytesIO(job.payload), len(job.payload))
+        await persist_documents(
+            db, [analysis], before_commit=lambda documents: set_outcome(job, DONE, document_id=documents[0]["id"])
+        )
+        notify_finished(job.id)
+
+    except InferenceQueueFull as e:  # Admission control turned the document away before running it
+        await db.rollback()
+        await db.refresh(job)
+        await postpone_job(db, job, float(e.headers["Retry-After"]), str(e.detail))
+
+    except HTTPException as e:
+        await db.rollback()
+        await db.refresh(job)  # Reload the job after the rollback expired it
+        if e.status_code >= 500 or isinstance(e, ModelInferenceError):
+            await retry_or_dead_letter(db, job, str(e.detail))
+        else:  # Invalid, corrupted or empty files never succeed on retry
+            await finish_job(db, job, FAILED, error=str(e.detail))
+
+    except Exception as e:
+        await db.rollback()
+        await db.refresh(job)
+        logger.error(f"Job {job.id} failed: {str(e)}")
+        await retry_or_dead_letter(db, job, str(e))
+
+
+async def postpone_job(db: AsyncSession, job: UploadJob, delay: float, error: str):
+    """
+    Requeue a job the inference pool had no room for, runnable again after `delay` seconds. The attempt
+    is given back: the document never ran, so a burst of uploads cannot dead-letter valid documents.
+    """
+    job.attempts -= 1
+    job.status = QUEUED
+    job.error = error
+    job.available_at = datetime.utcnow() + timedelta(seconds=delay)
+    await db.commit()
+
+
+async def retry_or_dead_letter(db: AsyncSession, job: UploadJob, error: str):
+    """Requeue a failed job, or move it to the dead-letter state once its attempts are used up."""
+    if job.attempts >= job.max_attempts:
+        logger.warning(f"Job {job.id} dead-lettered after {job.attempts} attempts: {error}")
+        await finish_job(db, job, DEAD, error=error)
+    else:
+        await finish_job(db, job, QUEUED, error=error)
+
+
+async def requeue_stale_jobs():
+    """
+    Return jobs left running by a crashed worker to the queue. Jobs whose last attempt crashed the worker
+    (e.g. out of memory on a malformed PDF) are dead-lettered instead, so they cannot crash workers forever.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=JobConfig.JOB_STALE_SECONDS)
+    stale = (UploadJob.status == RUNNING, UploadJob.updated_at < cutoff)
+    async with AsyncSessionLocal() as db:
+        dead = (
+            await db.execute(
+                update(UploadJob)
+                .where(*stale, UploadJob.attempts >= UploadJob.max_attempts)
+                .values(status=DEAD, error=WORKER_LOST, payload=None)
+                .returning(UploadJob.id)
+            )
+        ).scalars().all()
+        requeued = await db.execute(
+            update(UploadJob)
+            .where(*stale)
+            .values(status=QUEUED, available_at=datetime.utcnow())
+        )
+        await db.commit()
+
+    for job_id in dead:
+        logger.warning(f"Job {job_id} dead-lettered: {WORKER_LOST}")
+        notify_finished(job_id)
+    if requeued.rowcount:
+        logger.info(f"Requeued {requeued.rowcount} stale jobs")
+
+
+class JobWorkerPool:
+    """
+    Background workers that process queued upload jobs inside the application process.
+    The Postgres table is the queue, so no external broker is needed and any number of
+    processes can run workers side by side.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+        self._next_sweep = 0.0  # Loop time of the next stale job check
+
+    async def _sweep_stale_jobs(self):
+        """Requeue jobs of crashed workers, at most once per JOB_STALE_SWEEP_INTERVAL for all workers."""
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._next_sweep:
+            return
+        self._next_sweep = loop.time() + JobConfig.JOB_STALE_SWEEP_INTERVAL
+        await requeue_stale_jobs()
+
+    async def _work(self):
+        while True:
+            try:
+                await self._sweep_stale_jobs()
+                async with AsyncSessionLocal() as db:
+                    job = await claim_job(db)
+                    if job is not None:
+                        await run_job(db, job)
+                        continue
+                    # Claimed nothing; a lost race is retried after the poll below
+
+                # Idle: sleep until a local enqueue or the next poll
+                _queue_event.clear()
+                try:
+                    await asyncio.wait_for(_queue_event.wait(), timeout=JobConfig.JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker error: {str(e)}")
+                await asyncio.sleep(JobConfig.JOB_POLL_INTERVAL)
+
+    async def start(self):
+        if self.workers <= 0 or self._tasks:
+            return
+        self._next_sweep = 0.0  # The first worker checks for stale jobs right away
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        logger.info(f"Started {self.workers} upload job workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+async def get_job_response(db: AsyncSession, job_id: int) -> Optional[dict]:
+    """Current state of a job, including its document once done."""
+    job = (
+        await db.execute(
+            select(
+                UploadJob.id, UploadJob.filename, UploadJob.status, UploadJob.priority, UploadJob.attempts,
+                UploadJob.error, UploadJob.document_id, UploadJob.created_at, UploadJob.updated_at,
+            ).where(UploadJob.id == job_id)
+        )
+    ).first()
+    if job is None:
+        return None
+
+    response = dict(job._mapping)
+    document_id = response.pop("document_id")
+    response["document"] = None
+    if document_id is not None:
+        document = (
+            await db.execute(
+                select(*DOCUMENT_LISTING_COLUMNS).where(Document.id == document_id)
+            )
+        ).first()
+        response["document"] = dict(document._mapping) if document else None
+    return response
+
+
+async def wait_for_job(job_id: int, timeout: float) -> Optional[dict]:
+    """
+    Long-poll a job until it reaches a final state or the timeout expires, and return its state.
+    Jobs finished by this process wake the waiter immediately; others are seen on the next poll.
+    """
+    deadline = asyncio.get_running_loop().time() + min(timeout, JobConfig.JOB_MAX_WAIT)
+    event = _job_events.setdefault(job_id, asyncio.Event())
+    _job_waiters[job_id] = _job_waiters.get(job_id, 0) + 1
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                response = await get_job_response(db, job_id)
+            remaining = deadline - asyncio.get_running_loop().time()
+            if response is None or response["status"] in FINAL_STATES or remaining <= 0:
+                return response
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, JobConfig.JOB_POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _job_waiters[job_id] -= 1
+        if not _job_waiters[job_id]:
+            del _job_waiters[job_id]
+            _job_events.pop(job_id, None)
+
+
+async def stream_job_events(job_id: int, timeout: float):
+    """Server-Sent Events with the job state, sent on every status change until the job is final."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    last_status = None
+    while True:
+        # Check at every poll interval; jobs finished by this process wake the stream immediately
+        response = await wait_for_job(job_id, min(deadline - loop.time(), JobConfig.JOB_POLL_INTERVAL))
+        if response is None:
+            yield "event: error\ndata: {\"detail\": \"Job not found\"}\n\n"
+            return
+        if response["status"] != last_status:
+            last_status = response["status"]
+            yield f"event: status\ndata: {json.dumps(jsonable_encoder(response))}\n\n"
+        if response["status"] in FINAL_STATES or loop.time() >= deadline:
+            return
+
+
+# Shared job worker pool for the application
+job_workers = JobWorkerPool(JobConfig.JOB_WORKERS)
@@ -2,15 +2,33 @@
 
 
 # Standard Library Imports
+import time
+import asyncio
 import logging
+from typing import Optional
 
 # Third-party Imports
 from fastapi import FastAPI, Request  # Import FastAPI framework and request object
+from fastapi.responses import JSONResponse  # Response for requests rejected by middleware
 from fastapi.middleware.cors import CORSMiddleware  # Middleware for handling CORS issues
+from fastapi.concurrency import run_in_threadpool  # Load models without stalling the event loop
 
 # Local Application/Library-Specific Imports
-from .database import init_db
+from .database import init_db, AsyncSessionLocal
+from .cache import CacheConfig, purge_stale
+from .ml_model import MODEL_FINGERPRINT
+from .inference import inference_executor
+from .jobs import job_workers
+from .vector_index import index_sync
+from .dedup import signature_sync
+from .extractors import IngestConfig, shutdown_pdf_pool
+from .services import BatchConfig
 from .router import router as document_router
+from .health import AppState, router as health_router
+from .metrics import request_histogram, router as metrics_router
+from .stats import router as stats_router
+from .timing import request_stages, server_timing
+from .model_registry import ModelConfig, model_registry, warmup_names
 
 
 # Configure logging for the application
@@ -37,10 +55,35 @@ async def startup():
     logger.info("Initializing database...")
     await init_db()
     logger.info("Database initialized successfully.")
+    if CacheConfig.CACHE_PERSISTENT:  # Drop cached results of previous model settings
+        async with AsyncSessionLocal() as db:
+            await purge_stale(db, MODEL_FINGERPRINT)
+    inference_executor.start()
+    await job_workers.start()  # Process queued uploads in the background
+    index_sync.start()  # Load stored embeddings into the similarity index in the background
+    signature_sync.start()  # Load stored signatures into the near-duplicate index in the background
+    AppState.started = True
+
+    # Load configured models in the background; /health/ready reports when they are done
+    if ModelConfig.WARMUP_MODELS and not ModelConfig.PRELOAD_MODELS:
+        asyncio.create_task(run_in_threadpool(model_registry.warmup, warmup_names(ModelConfig.WARMUP_MODELS)))
+
+
+# Release job and inference workers on app shutdown
+@app.on_event("shutdown")
+async def shutdown():
+    await job_workers.stop()
+    await index_sync.stop()
+    await signature_sync.stop()
+    inference_executor.shutdown()
+    shutdown_pdf_pool()
 
 
 # Include API routes from the router
 app.include_router(document_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
+app.include_router(stats_router)
 
 
 # Middleware to log incoming requests
@@ -52,6 +95,51 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+# Middleware to time requests and report their pipeline stages in a Server-Timing header
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    stages = []
+    token = request_stages.set(stages)  # Collects every stage timed while serving this request
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_stages.reset(token)
+    seconds = time.perf_counter() - started
+
+    route = request.scope.get("route")  # Label by route template, so path parameters do not add series
+    request_histogram.observe(f"{request.method} {route.path if route else 'unmatched'}", seconds)
+    response.headers["Server-Timing"] = server_timing(stages + [("total", seconds)])
+    return response
+
+
+def upload_size_limit(path: str) -> Optional[int]:
+    """Largest accepted body of an upload endpoint, without the multipart overhead; None for other paths."""
+    if path in ("/upload/", "/upload/stream/"):
+        return IngestConfig.MAX_UPLOAD_BYTES
+    if path == "/upload/batch/":
+        return BatchConfig.BATCH_MAX_BYTES
+    return None
+
+
+# Middleware to reject oversized uploads before their body is received
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    limit = upload_size_limit(request.url.path)
+    content_length = request.headers.get("content-length")
+    if (
+        limit is not None
+        and content_length is not None
+        and content_length.isdigit()
+        and int(content_length) > limit + IngestConfig.MULTIPART_OVERHEAD
+    ):
+        subject = "Batch" if request.url.path == "/upload/batch/" else "File"
+        return JSONResponse(
+            status_code=413, content={"detail": f"{subject} exceeds the maximum size of {limit // (1024 * 1024)} MB"}
+        )
+    return await call_next(request)
+
+
 if __name__ == "__main__":
 
     import uvicorn  # Import uvicorn for running the FastAPI application
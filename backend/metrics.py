@@ -0,0 +1,217 @@
+# backend/metrics.py
+
+
+# Standard Library Imports
+import os
+import logging
+from typing import Dict, List, Optional
+
+# Third-party Imports
+from sqlalchemy import func, select  # Job counts per status
+from fastapi import APIRouter  # FastAPI imports for API routing
+from fastapi.responses import PlainTextResponse  # Prometheus text exposition format
+
+# Local Application/Library-Specific Imports
+from .models import UploadJob
+from .cache import embedding_cache, file_cache, text_cache
+from .inference import inference_executor
+from .ml_model import nli_batcher, tier_counts
+from .summarization import summary_batcher
+from .model_registry import model_registry
+from .timing import Histogram, counter_snapshot, stage_histogram
+from .vector_index import vector_index
+from .dedup import dedup_counts, lsh_index
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Initialize FastAPI Router
+router = APIRouter()
+
+
+# Latency distribution of every route since startup, recorded by the timing middleware
+request_histogram = Histogram()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Dict[str, object]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class Exposition:
+    """Builder of a Prometheus text exposition: one HELP/TYPE header per metric, then its samples."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def metric(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, **labels):
+        self.lines.append(f"{name}{format_labels(labels)} {value if isinstance(value, int) else float(value)!r}")
+
+    def histogram(self, name: str, help_text: str, histogram: Histogram, label: str):
+        self.metric(name, "histogram", help_text)
+        for value, series in sorted(histogram.snapshot().items()):
+            for bound, count in series["buckets"]:
+                self.sample(f"{name}_bucket", count, **{label: value, "le": bound})
+            self.sample(f"{name}_sum", series["sum"], **{label: value})
+            self.sample(f"{name}_count", series["count"], **{label: value})
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Current resident set size of the process, from /proc on Linux; None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """Peak resident set size of the process; None where the resource module is unavailable."""
+    try:
+        import resource  # Unix only
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Reported in KiB on Linux
+
+
+async def job_counts() -> Dict[str, int]:
+    """Upload jobs per status; empty when the database is unreachable, so metrics stay available."""
+    from .database import AsyncSessionLocal  # Imported on first use, the engine needs the database settings
+
+    try:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(select(UploadJob.status, func.count()).group_by(UploadJob.status))).all()
+    except Exception as e:
+        logger.warning(f"Could not count upload jobs for metrics: {e}")
+        return {}
+    return {status: count for status, count in rows}
+
+
+def render_pool(exposition: Exposition):
+    """Database pool occupancy, checkouts and checkout waits."""
+    from .database import pool_stats, pool_status  # Imported on first use, the engine needs the database settings
+
+    status = pool_status()
+    exposition.histogram(
+        "smartapp_db_pool_wait_seconds", "Time spent waiting for a database connection.",
+        pool_stats.wait_histogram, "operation",
+    )
+    for name, kind, help_text in (
+        ("checkouts", "counter", "Database connections handed out."),
+        ("timeouts", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT."),
+        ("size", "gauge", "Connections the pool keeps open."),
+        ("checked_out", "gauge", "Connections currently in use."),
+        ("idle", "gauge", "Open connections waiting in the pool."),
+        ("overflow", "gauge", "Connections opened beyond the pool size."),
+    ):
+        if name in status:
+            metric = f"smartapp_db_pool_{name}" + ("_total" if kind == "counter" else "")
+            exposition.metric(metric, kind, help_text)
+            exposition.sample(metric, status[name])
+
+
+async def render_metrics() -> str:
+    exposition = Exposition()
+
+    exposition.histogram(
+        "smartapp_request_duration_seconds", "Time to serve a request, by route.", request_histogram, "route"
+    )
+    exposition.histogram(
+        "smartapp_stage_duration_seconds", "Time spent in each pipeline stage.", stage_histogram, "stage"
+    )
+
+    # Queue depths
+    exposition.metric("smartapp_inference_pending", "gauge", "Inference jobs running or waiting for a worker.")
+    exposition.sample("smartapp_inference_pending", inference_executor.pending)
+    exposition.metric("smartapp_inference_capacity", "gauge", "Inference jobs admitted before rejecting with 503.")
+    exposition.sample("smartapp_inference_capacity", inference_executor.max_workers + inference_executor.queue_size)
+    exposition.metric("smartapp_batcher_queue_depth", "gauge", "Items waiting to be collected into a model batch.")
+    for batcher in (nli_batcher, summary_batcher):
+        exposition.sample("smartapp_batcher_queue_depth", batcher.queue_depth, batcher=batcher.name)
+    exposition.metric("smartapp_upload_jobs", "gauge", "Upload jobs per status.")
+    for status, count in sorted((await job_counts()).items()):
+        exposition.sample("smartapp_upload_jobs", count, status=status)
+
+    render_pool(exposition)
+
+    # Result caches
+    caches = {"file": file_cache, "text": text_cache, "embedding": embedding_cache}
+    exposition.metric("smartapp_cache_hits_total", "counter", "In-process cache hits.")
+    for name, cache in caches.items():
+        exposition.sample("smartapp_cache_hits_total", cache.hits, cache=name)
+    exposition.metric("smartapp_cache_misses_total", "counter", "In-process cache misses.")
+    for name, cache in caches.items():
+        exposition.sample("smartapp_cache_misses_total", cache.misses, cache=name)
+    exposition.metric("smartapp_cache_hit_ratio", "gauge", "Share of lookups served from the cache since startup.")
+    for name, cache in caches.items():
+        exposition.sample("smartapp_cache_hit_ratio", cache.hits / max(1, cache.hits + cache.misses), cache=name)
+    exposition.metric("smartapp_cache_entries", "gauge", "Entries held by each in-process cache.")
+    for name, cache in caches.items():
+        exposition.sample("smartapp_cache_entries", len(cache), cache=name)
+
+    # Models and classification tiers
+    exposition.metric("smartapp_model_loaded", "gauge", "Whether each registered model is loaded.")
+    for name in model_registry.names:
+        exposition.sample("smartapp_model_loaded", int(model_registry.is_loaded(name)), model=name)
+    exposition.metric("smartapp_model_load_seconds", "gauge", "Time it took to load each model.")
+    for name, seconds in sorted(dict(model_registry.load_times).items()):
+        exposition.sample("smartapp_model_load_seconds", seconds, model=name)
+    exposition.metric("smartapp_classifications_total", "counter", "Documents classified, by deciding tier.")
+    for tier, count in sorted(dict(tier_counts).items()):
+        exposition.sample("smartapp_classifications_total", count, tier=tier)
+    for name, count in sorted(counter_snapshot().items()):
+        exposition.metric(f"smartapp_{name}_total", "counter", f"Pipeline counter {name}.")
+        exposition.sample(f"smartapp_{name}_total", count)
+
+    # Similarity index
+    exposition.metric("smartapp_vector_index_documents", "gauge", "Documents held by the similarity index.")
+    exposition.sample("smartapp_vector_index_documents", len(vector_index))
+    exposition.metric("smartapp_vector_index_trained", "gauge", "Whether queries use the trained clusters.")
+    exposition.sample("smartapp_vector_index_trained", int(vector_index.trained))
+
+    # Near-duplicate detection
+    counts = dict(dedup_counts)
+    exposition.metric("smartapp_dedup_lookups_total", "counter", "Near-duplicate lookups, by result.")
+    for result, count in sorted(counts.items()):
+        exposition.sample("smartapp_dedup_lookups_total", count, result=result)
+    exposition.metric("smartapp_dedup_hit_ratio", "gauge", "Share of lookups that reused a stored classification.")
+    exposition.sample("smartapp_dedup_hit_ratio", counts["hit"] / max(1, counts["hit"] + counts["miss"]))
+    exposition.metric("smartapp_dedup_index_documents", "gauge", "Documents held by the near-duplicate index.")
+    exposition.sample("smartapp_dedup_index_documents", len(lsh_index))
+
+    # Process memory
+    for name, value, help_text in (
+        ("smartapp_resident_memory_bytes", resident_memory_bytes(), "Resident memory of the process."),
+        ("smartapp_peak_resident_memory_bytes", peak_memory_bytes(), "Peak resident memory of the process."),
+    ):
+        if value is not None:
+            exposition.metric(name, "gauge", help_text)
+            exposition.sample(name, value)
+
+    return exposition.render()
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Endpoint exposing request and pipeline stage latency histograms, queue depths, cache hit rates,
+    model load times and memory usage in the Prometheus text format.
+    """
+    return PlainTextResponse(await render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,16 +2,31 @@
 
 
 # Standard Library Imports
+import os
+import math
+import time
 import logging
-from typing import Dict, Tuple
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Third-party Imports
-from transformers import pipeline
-from sentence_transformers import SentenceTransformer
+import torch
+import numpy as np
 
 # Local Application/Library-Specific Imports
-from .utils import chunk_text_by_sentences, chunk_text_by_tokens, preprocess_text, summarize_large_text
-from .exceptions import ModelInferenceError
+from .utils import preprocess_words
+from .utils import SUMMARIZER_MODEL_NAME
+from .summarization import SummaryConfig, summarize_large_text
+from .timing import increment, stage_histogram, timed_stage
+from .pipeline import TokenChunk, TokenizedDocument, pad_batch, sentence_spans
+from .cache import CacheConfig, cache_key, content_hash, file_content_hash, settings_fingerprint, text_cache
+from .cache import embedding_cache
+from .exceptions import ModelInferenceError, UploadCancelled
+from .progress import check_cancelled, report, wait_in_order
+from .batching import MicroBatcher
+from .model_registry import ModelConfig, model_registry, warmup_names
+from .model_backends import BackendConfig, load_pipeline, load_sentence_transformer
+from .classifier_head import ClassifierHead, HeadConfig
 
 
 # Initialize logging
@@ -21,13 +36,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-# Load NLP Models
-# Initialize zero-shot classification model
-classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
-
-# Load embedding model
-embedding_model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-
+# NLP Models, loaded on first use through the model registry
+CLASSIFIER_MODEL_NAME = "facebook/bart-large-mnli"
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
 # Predefined categories for document classification
 categories = [
@@ -39,70 +50,480 @@ categories = [
     "Other",
 ]
 
-# Encode categories for use in classification
-category_embeddings = embedding_model.encode(categories, convert_to_tensor=True)
+# Optionally replace label embeddings with centroids of labelled documents (one row per category)
+CATEGORY_CENTROIDS_PATH = os.getenv("CATEGORY_CENTROIDS_PATH")
+
+
+def load_classifier():
+    """Initialize zero-shot classification model on the configured inference backend."""
+    return load_pipeline("zero-shot-classification", CLASSIFIER_MODEL_NAME)
+
+
+def load_embedding_model():
+    """Load embedding model on the configured inference backend."""
+    return load_sentence_transformer(EMBEDDING_MODEL_NAME)
+
+
+def load_category_embeddings():
+    """Encode categories (or load their centroids) for use in classification."""
+    category_embeddings = model_registry.get("embedding_model").encode(categories, convert_to_tensor=True)
+    if CATEGORY_CENTROIDS_PATH:
+        category_embeddings = torch.from_numpy(np.load(CATEGORY_CENTROIDS_PATH)).to(category_embeddings)
+    return category_embeddings
+
+
+def load_hypothesis_ids():
+    """Token ids of the hypothesis of every category, tokenized once."""
+    tokenizer = model_registry.get("tokenizer")
+    return [
+        tuple(tokenizer(HYPOTHESIS_TEMPLATE.format(category), add_special_tokens=False)["input_ids"])
+        for category in categories
+    ]
+
+
+def load_classifier_head():
+    """Load the trained embedding classifier head (python -m backend.classifier_head train)."""
+    head = ClassifierHead.load(HeadConfig.CLASSIFIER_HEAD_PATH)
+    if head.embedding_model != EMBEDDING_MODEL_NAME:
+        raise ValueError(f"Classifier head was trained on {head.embedding_model}, not {EMBEDDING_MODEL_NAME}")
+    return head
+
+
+# Register models; they are loaded on first use
+model_registry.register("classifier", load_classifier)
+model_registry.register("embedding_model", load_embedding_model)
+model_registry.register("category_embeddings", load_category_embeddings)
+model_registry.register("hypothesis_ids", load_hypothesis_ids)
+if HeadConfig.CLASSIFIER_MODE == "head":  # The head is trained locally, not shipped; only warm it up when it is used
+    model_registry.register("classifier_head", load_classifier_head)
 
 # Initialize Constants for model handling
 MAX_TOKENS = 512  # Token limit per chunk for classification
 SUMMARY_THRESHOLD = 1500  # Summarize if text exceeds this word count
 CONFIDENCE_THRESHOLD = 0.25  # Minimum confidence for valid classification
 
+# Cross-request batching of NLI forward passes
+NLI_BATCHING = os.getenv("NLI_BATCHING", "true").lower() == "true"  # Disable to call the pipeline per chunk
+NLI_MAX_BATCH_SIZE = int(os.getenv("NLI_MAX_BATCH_SIZE", "32"))  # Premise/hypothesis pairs per forward pass
+NLI_MAX_WAIT_MS = float(os.getenv("NLI_MAX_WAIT_MS", "10"))  # Time to wait for a batch to fill up
+HYPOTHESIS_TEMPLATE = "This example is {}."  # Same template the zero-shot pipeline uses
+NLI_EARLY_EXIT = os.getenv("NLI_EARLY_EXIT", "false").lower() == "true"  # Stop scoring chunks once settled
 
-def classify_text(text: str) -> Tuple[str, Dict[str, float]]:
+# Tiered classification: MiniLM similarity first, NLI only for ambiguous documents
+TIERED_CLASSIFICATION = os.getenv("TIERED_CLASSIFICATION", "false").lower() == "true"
+EMBEDDING_MARGIN_THRESHOLD = float(os.getenv("EMBEDDING_MARGIN_THRESHOLD", "0.1"))  # Top-two similarity gap
+EMBEDDING_TEMPERATURE = float(os.getenv("EMBEDDING_TEMPERATURE", "0.05"))  # Softmax temperature for scores
+EMBEDDING_WINDOW_WORDS = 200  # Words per window, within MiniLM's 256 word-piece limit
+
+# Number of documents decided by each tier, used to tune the escalation rate
+tier_counts = {"cache": 0, "embedding": 0, "nli": 0, "head": 0}
+tier_lock = threading.Lock()
+
+# Fingerprint of every setting that affects results; part of all cache keys
+MODEL_FINGERPRINT = settings_fingerprint(
+    classifier=CLASSIFIER_MODEL_NAME,
+    embedding=EMBEDDING_MODEL_NAME,
+    summarizer=SUMMARIZER_MODEL_NAME,
+    inference_backend=BackendConfig.INFERENCE_BACKEND,
+    summary_mode=SummaryConfig.SUMMARY_MODE,
+    summary_words=SummaryConfig.SUMMARY_EXTRACTIVE_WORDS,
+    categories=categories,
+    centroids=file_content_hash(CATEGORY_CENTROIDS_PATH) if CATEGORY_CENTROIDS_PATH else None,
+    max_tokens=MAX_TOKENS,
+    summary_threshold=SUMMARY_THRESHOLD,
+    confidence_threshold=CONFIDENCE_THRESHOLD,
+    hypothesis_template=HYPOTHESIS_TEMPLATE,
+    early_exit=NLI_EARLY_EXIT,
+    tiered=TIERED_CLASSIFICATION,
+    embedding_margin=EMBEDDING_MARGIN_THRESHOLD,
+    embedding_temperature=EMBEDDING_TEMPERATURE,
+    classifier_mode=HeadConfig.CLASSIFIER_MODE,
+    classifier_head=(
+        file_content_hash(HeadConfig.CLASSIFIER_HEAD_PATH)
+        if HeadConfig.CLASSIFIER_MODE == "head" and os.path.exists(HeadConfig.CLASSIFIER_HEAD_PATH) else None
+    ),
+)
+
+
+def entailment_id(classifier) -> int:
+    """Index of the entailment logit in the NLI model output."""
+    return next(
+        (idx for label, idx in classifier.model.config.label2id.items() if label.lower().startswith("entail")), -1
+    )
+
+
+def max_premise_tokens() -> int:
+    """Longest premise that fits the NLI model together with any hypothesis and the special tokens."""
+    tokenizer = model_registry.get("tokenizer")
+    hypothesis_length = max(len(ids) for ids in model_registry.get("hypothesis_ids"))
+    return min(tokenizer.model_max_length, 1024) - hypothesis_length - tokenizer.num_special_tokens_to_add(pair=True)
+
+
+def score_nli_pairs(pairs: List[Tuple[Tuple[int, ...], Tuple[int, ...]]]) -> List[float]:
     """
-    Classify text using zero-shot classification and sentence embeddings.
-    If the confidence level of the top predicted category is below the threshold,
-    classify the document as "Other" with a confidence score of 1.0.
+    Run pre-tokenized (premise, hypothesis) id pairs through the NLI model in one padded batch
+    and return the entailment logit of each pair.
     """
-    try:
-        # Clean and preprocess input text
-        text = preprocess_text(text)
+    classifier = model_registry.get("classifier")
+    tokenizer = classifier.tokenizer
+
+    # Sort by premise length so that similarly sized pairs share padding
+    order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][0]))
+    inputs = pad_batch(
+        tokenizer, [tokenizer.build_inputs_with_special_tokens(list(pairs[i][0]), list(pairs[i][1])) for i in order]
+    )
+
+    with timed_stage("nli_forward"), torch.inference_mode():  # Runs on the batcher thread, shared by requests
+        device = classifier.model.device
+        logits = classifier.model(**{name: tensor.to(device) for name, tensor in inputs.items()}).logits
+    logits = logits[:, entailment_id(classifier)].tolist()
 
-        # Ensure text isn't too long
-        word_limit = 5000  # Set word limit
-        if len(text.split()) > word_limit:  # If text exceeds word limit
-            text = " ".join(text.split()[:word_limit])  # Trim text to limit
+    # Restore the submission order
+    scores = [0.0] * len(pairs)
+    for position, idx in enumerate(order):
+        scores[idx] = logits[position]
+    return scores
 
-        # Summarize large text if needed
-        if len(text.split()) > SUMMARY_THRESHOLD:
-            text = summarize_large_text(text)
 
-        # Chunk text to avoid model failure
-        chunks = chunk_text_by_sentences(text)  # Chunk text by sentences
-        if not chunks or len(chunks) > 10:  # Fallback to token-based chunking if chunks is empty or more than 10
-            chunks = chunk_text_by_tokens(text, max_tokens=MAX_TOKENS)
+# Shared batcher collecting NLI pairs from all in-flight requests
+nli_batcher = MicroBatcher(
+    score_nli_pairs, max_batch_size=NLI_MAX_BATCH_SIZE, max_wait=NLI_MAX_WAIT_MS / 1000, name="nli-batcher"
+)
 
-        # Classify chunks safely
-        aggregated_scores = {category: 0.0 for category in categories}
-        total_length = sum(len(chunk) for chunk in chunks)  # Total length of all chunks
 
+def classify_chunks(document: TokenizedDocument, chunks: List[TokenChunk],
+                    on_chunk: Optional[Callable[[TokenChunk, Dict[str, float]], None]] = None
+                    ) -> List[Dict[str, float]]:
+    """
+    Score every chunk of a document against all categories.
+    With batching enabled, each (chunk, category) pair of token ids is queued on the shared batcher and the
+    entailment logits of a chunk are softmaxed over the categories, as the zero-shot pipeline does.
+    `on_chunk` is called with every chunk and its scores in order, as soon as they are available.
+    The mean time per chunk is recorded in the "nli_chunk" stage histogram.
+    """
+    started = time.perf_counter()
+    chunk_scores = []
+    if not NLI_BATCHING:
+        classifier = model_registry.get("classifier")
         for chunk in chunks:
+            check_cancelled()  # Stop between chunks once a streamed upload is abandoned
+            result = classifier(document.chunk_text(chunk), candidate_labels=categories)
+            chunk_scores.append(dict(zip(result["labels"], result["scores"])))
+            if on_chunk is not None:
+                on_chunk(chunk, chunk_scores[-1])
+        observe_chunks(len(chunks), time.perf_counter() - started)
+        return chunk_scores
+
+    # Queue all pairs of this document at once so they can be batched with other requests
+    hypothesis_ids = model_registry.get("hypothesis_ids")
+    pairs = [(chunk.ids, hypothesis) for chunk in chunks for hypothesis in hypothesis_ids]
+    logits = wait_in_order(nli_batcher.submit_many(pairs))  # Pairs of an abandoned upload are dropped
+
+    for chunk in chunks:
+        chunk_logits = [next(logits) for _ in categories]
+        peak = max(chunk_logits)
+        exps = [math.exp(logit - peak) for logit in chunk_logits]  # Numerically stable softmax
+        total = sum(exps)
+        chunk_scores.append({category: exp / total for category, exp in zip(categories, exps)})
+        if on_chunk is not None:
+            on_chunk(chunk, chunk_scores[-1])
+
+    observe_chunks(len(chunks), time.perf_counter() - started)
+    return chunk_scores
+
+
+def observe_chunks(count: int, seconds: float):
+    """Record `count` chunks that took `seconds` together; batched chunks have no individual duration."""
+    for _ in range(count):
+        stage_histogram.observe("nli_chunk", seconds / count)
+
+
+def embedding_windows(document: TokenizedDocument) -> List[str]:
+    """Word windows of a document, each within MiniLM's input limit."""
+    words = document.words
+    windows = [" ".join(words[i:i + EMBEDDING_WINDOW_WORDS]) for i in range(0, len(words), EMBEDDING_WINDOW_WORDS)]
+    return windows or [document.text]  # Keep a single (empty) window for texts without words
+
+
+def embed_documents(documents: List[TokenizedDocument]) -> torch.Tensor:
+    """Mean MiniLM embedding of the windows of every document, encoded in one call."""
+    windows = [embedding_windows(document) for document in documents]
+    window_embeddings = model_registry.get("embedding_model").encode(
+        [window for document_windows in windows for window in document_windows],
+        convert_to_tensor=True,
+        normalize_embeddings=True,
+    )
+    bounds = np.cumsum([0] + [len(document_windows) for document_windows in windows])
+    return torch.stack([window_embeddings[start:end].mean(dim=0) for start, end in zip(bounds[:-1], bounds[1:])])
+
+
+def prepare_document(text: str, words: Optional[List[str]] = None) -> TokenizedDocument:
+    """
+    Preprocess text into the document every classifier sees, limited to 5000 words.
+    `words` are the already preprocessed words of `text`, when the caller has them.
+    """
+    if words is None:
+        with timed_stage("preprocess"):
+            words = preprocess_words(text)
+    word_limit = 5000  # Set word limit
+    return TokenizedDocument(" ".join(words[:word_limit]), words[:word_limit])
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Document embeddings of raw texts, preprocessed as for classification; used to train the head."""
+    return embed_documents([prepare_document(text) for text in texts]).cpu().numpy()
+
+
+def embedding_key(text: str) -> str:
+    return cache_key(MODEL_FINGERPRINT, "embedding", content_hash(text))
+
+
+def document_embeddings(texts: List[str]) -> np.ndarray:
+    """
+    Unit-length float16 document embeddings of raw texts, as stored for similarity search.
+    Embeddings computed while classifying the same texts are reused from the embedding cache.
+    """
+    embeddings = [embedding_cache.get(embedding_key(text)) if CacheConfig.CACHE_ENABLED else None for text in texts]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        computed = embed_documents([prepare_document(texts[i]) for i in missing])
+        for i, embedding in zip(missing, computed):
+            embeddings[i] = embedding
+    stacked = torch.nn.functional.normalize(torch.stack(embeddings).float(), dim=1)
+    return stacked.cpu().numpy().astype(np.float16)
+
+
+def document_embedding(text: str) -> np.ndarray:
+    return document_embeddings([text])[0]
+
 
-            # Skip empty chunks
-            if not chunk.strip():
-                continue
+def embedding_scores(document: TokenizedDocument, document_embedding: Optional[torch.Tensor] = None
+                     ) -> Tuple[Dict[str, float], float]:
+    """
+    Cheap first-tier classification with MiniLM.
+    The document is embedded in word windows whose mean is compared to the category embeddings
+    by cosine similarity. Returns softmaxed similarities as scores, plus the similarity margin
+    between the two closest categories.
+    """
+    category_embeddings = model_registry.get("category_embeddings")
+    if document_embedding is None:
+        document_embedding = embed_documents([document])[0]
+
+    # Cosine similarity of the document against every category
+    similarities = torch.nn.functional.cosine_similarity(
+        document_embedding.unsqueeze(0), category_embeddings, dim=1
+    ).tolist()
+    ranked = sorted(similarities, reverse=True)
+    margin = ranked[0] - ranked[1] if len(ranked) > 1 else ranked[0]
+
+    # Turn similarities into a probability-like distribution
+    peak = max(similarities)
+    exps = [math.exp((similarity - peak) / EMBEDDING_TEMPERATURE) for similarity in similarities]
+    total = sum(exps)
+    return {category: exp / total for category, exp in zip(categories, exps)}, margin
+
+
+def running_category(scores: Dict[str, float]) -> Tuple[str, Dict[str, float]]:
+    """Leading category and scores normalized by their sum, for a partial aggregate."""
+    weight = sum(scores.values())
+    normalized = {label: score / weight for label, score in scores.items()} if weight else dict(scores)
+    return max(normalized, key=normalized.get), normalized
+
+
+class ChunkAggregator:
+    """
+    Length-weighted sum of chunk scores, added chunk by chunk. Every chunk is reported to a streamed
+    upload with its own scores and the running category of the chunks scored so far.
+    """
+
+    def __init__(self, chunk_count: int, total_length: int):
+        self.chunk_count = chunk_count
+        self.total_length = total_length
+        self.scores = {category: 0.0 for category in categories}
+        self.scored = 0
+
+    def add(self, chunk: TokenChunk, scores: Dict[str, float]):
+        for label, score in scores.items():
+            self.scores[label] += score * chunk.length / self.total_length  # Weighted score based on chunk length
+        self.scored += 1
+
+        category, running_scores = running_category(self.scores)
+        report(
+            "chunk", scored=self.scored, chunks=self.chunk_count, start=chunk.start, end=chunk.end,
+            scores=scores, category=category, running_scores=running_scores,
+        )
+
+
+def nli_scores(document: TokenizedDocument) -> Dict[str, float]:
+    """
+    Second-tier classification with the zero-shot NLI model, aggregated over chunks
+    weighted by chunk length.
+    """
+    # Summarize large text if needed
+    if document.word_count > SUMMARY_THRESHOLD:
+        document = TokenizedDocument(summarize_large_text(document.text))
+
+    # Chunk the token ids by sentences, or by token count for text with more than 10 sentence chunks
+    with timed_stage("chunk"):
+        spans = sentence_spans(document.text)
+        if spans and len(spans) <= 10:
+            chunks = document.span_chunks(spans, max_premise_tokens())  # Long spans are truncated
+        else:
+            chunks = document.token_chunks(MAX_TOKENS)
+
+    # Classify chunks safely
+    total_length = sum(chunk.length for chunk in chunks)  # Total length of all chunks
+
+    # Skip empty chunks
+    chunks = [chunk for chunk in chunks if chunk.ids]
+    aggregator = ChunkAggregator(len(chunks), total_length)
+    if not chunks:
+        return aggregator.scores
+
+    # Perform classification on all chunks, or stop early once the decision is settled
+    with timed_stage("nli_early_exit" if NLI_EARLY_EXIT else "nli"):  # Separate stages to compare latency
+        if NLI_EARLY_EXIT:
+            return early_exit_scores(document, chunks, total_length)
+        classify_chunks(document, chunks, on_chunk=aggregator.add)  # Aggregated as every chunk completes
+
+    return aggregator.scores
+
+
+def chunk_waves(chunks: List[TokenChunk]) -> List[List[TokenChunk]]:
+    """Chunks in priority order: the first chunk, then the longest remaining one, then the rest."""
+    if len(chunks) <= 2:
+        return [[chunk] for chunk in chunks]
+    longest = max(range(1, len(chunks)), key=lambda i: chunks[i].length)
+    rest = [chunk for i, chunk in enumerate(chunks) if i not in (0, longest)]
+    return [[chunks[0]], [chunks[longest]], rest]
+
+
+def decision_settled(aggregated_scores: Dict[str, float], remaining: float) -> bool:
+    """
+    Whether the chunks left, carrying `remaining` of the total weight, can no longer change the outcome:
+    the leader's margin exceeds the remaining weight, and the confidence threshold check is decided.
+    """
+    ranked = sorted(aggregated_scores.values(), reverse=True)
+    top, runner_up = ranked[0], ranked[1]
+    threshold_decided = top >= CONFIDENCE_THRESHOLD or top + remaining < CONFIDENCE_THRESHOLD
+    return top - runner_up > remaining and threshold_decided
+
+
+def early_exit_scores(document: TokenizedDocument, chunks: List[TokenChunk], total_length: int) -> Dict[str, float]:
+    """
+    Aggregate length-weighted chunk scores wave by wave, and stop as soon as the remaining chunks
+    cannot overturn the leading category. Scores are normalized by the weight of the chunks scored,
+    so skipped chunks do not deflate them.
+    """
+    aggregator = ChunkAggregator(len(chunks), total_length)
+    aggregated_scores = aggregator.scores
+    remaining = sum(chunk.length for chunk in chunks) / total_length
+    scored = 0
+
+    for wave in chunk_waves(chunks):
+        for chunk, scores in zip(wave, classify_chunks(document, wave)):
+            aggregator.add(chunk, scores)
+            remaining -= chunk.length / total_length
+        scored += len(wave)
+        if scored < len(chunks) and decision_settled(aggregated_scores, remaining):
+            break
+
+    skipped = len(chunks) - scored
+    increment("nli_chunks_scored", scored)
+    increment("nli_chunks_skipped", skipped)
+    increment("nli_early_exits", int(skipped > 0))
+
+    return running_category(aggregated_scores)[1]
+
+
+def classify_text_with_tier(text: str, words: Optional[List[str]] = None) -> Tuple[str, Dict[str, float], str]:
+    """
+    Classify text and report which tier decided it ("cache", "head", "embedding" or "nli").
+    `words` are the already preprocessed words of `text`, so uploads preprocess only once.
+    With CLASSIFIER_MODE=head, the trained embedding head decides alone. Otherwise the MiniLM similarity
+    answer is kept when its top-two margin reaches EMBEDDING_MARGIN_THRESHOLD, and the document
+    escalates to zero-shot NLI classification if not.
+    If the confidence level of the top predicted category is below the threshold (calibrated per
+    category for the head), classify the document as "Other" with a confidence score of 1.0.
+    """
+    try:
+        # Clean and preprocess input text, splitting it into words once, within the word limit
+        document = prepare_document(text, words)
+
+        # Reuse the result of an identical normalized text
+        key = cache_key(MODEL_FINGERPRINT, "text", content_hash(document.text))
+        cached = text_cache.get(key) if CacheConfig.CACHE_ENABLED else None
+        if cached is not None:
+            with tier_lock:
+                tier_counts["cache"] += 1
+            return cached[0], dict(cached[1]), "cache"
+
+        # Use the trained head if configured, otherwise try the cheap embedding tier first
+        aggregated_scores, tier, threshold, embedding = None, "nli", CONFIDENCE_THRESHOLD, None
+        if HeadConfig.CLASSIFIER_MODE == "head":  # Calibrated per-category thresholds
+            head = model_registry.get("classifier_head")
+            with timed_stage("head"):
+                embedding = embed_documents([document])[0]
+                aggregated_scores = head.scores(embedding.cpu().numpy())[0]
+            tier = "head"
+            threshold = head.thresholds.get(max(aggregated_scores, key=aggregated_scores.get), CONFIDENCE_THRESHOLD)
+
+        elif TIERED_CLASSIFICATION:
+            with timed_stage("embedding"):
+                embedding = embed_documents([document])[0]
+                scores, margin = embedding_scores(document, embedding)
+            if margin >= EMBEDDING_MARGIN_THRESHOLD:  # Decisive enough to skip the NLI model
+                aggregated_scores, tier = scores, "embedding"
+            report(
+                "embedding", category=max(scores, key=scores.get), scores=scores, margin=margin,
+                escalated=aggregated_scores is None,
+            )
 
-            # Perform classification on chunk
-            result = classifier(chunk, candidate_labels=categories)
+        # Keep the embedding for the similarity index
+        if embedding is not None and CacheConfig.CACHE_ENABLED:
+            embedding_cache.set(embedding_key(text), embedding)
 
-            # Aggregate scores
-            for label, score in zip(result["labels"], result["scores"]):
-                aggregated_scores[label] += score * len(chunk) / total_length  # Weighted score based on chunk length
+        # Escalate ambiguous documents to the NLI model
+        if aggregated_scores is None:
+            check_cancelled()
+            aggregated_scores = nli_scores(document)
+
+        with tier_lock:
+            tier_counts[tier] += 1
 
         # Compute final category and confidence score
         top_category = max(aggregated_scores, key=aggregated_scores.get)  # Get category with the highest score
         top_score = aggregated_scores[top_category]  # Get corresponding score
 
         # Check confidence threshold
-        if top_score < CONFIDENCE_THRESHOLD:  # If the score is below the threshold
+        if top_score < threshold:  # If the score is below the threshold
             logging.warning(f"Low confidence prediction: {top_category} ({top_score})")  # Log warning
             # Override to "Other" with full confidence
             top_category = "Other"
             aggregated_scores = {category: 0.0 for category in categories}  # Reset scores
             aggregated_scores["Other"] = 1.0  # Assign full confidence to "Other"
 
-        return top_category, aggregated_scores  # Return classified category and scores
+        if CacheConfig.CACHE_ENABLED:
+            text_cache.set(key, (top_category, dict(aggregated_scores)))
+
+        return top_category, aggregated_scores, tier  # Return classified category, scores and deciding tier
 
+    except UploadCancelled:
+        raise  # The client of a streamed upload is gone; not a model failure
     except Exception as e:
         logging.error(f"Error during text classification: {str(e)}")
         raise ModelInferenceError(str(e))  # Raise a model inference error
+
+
+def classify_text(text: str) -> Tuple[str, Dict[str, float]]:
+    """
+    Classify text using sentence embeddings and zero-shot classification.
+    Returns the predicted category and the confidence score of every category.
+    """
+    top_category, aggregated_scores, _ = classify_text_with_tier(text)
+    return top_category, aggregated_scores
+
+
+# Optionally load models at import, before a pre-forking server starts its workers
+if ModelConfig.PRELOAD_MODELS:
+    model_registry.warmup(warmup_names(ModelConfig.WARMUP_MODELS or "all"))
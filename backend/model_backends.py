@@ -0,0 +1,90 @@
+# backend/model_backends.py
+
+
+# Standard Library Imports
+import os
+import logging
+from typing import Optional
+
+# Third-party Imports
+import torch
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch inference backend settings from environment variables
+class BackendConfig:
+    # "pytorch" (fp32), "int8" (PyTorch dynamic quantization) or "onnx" (ONNX Runtime, needs optimum[onnxruntime])
+    INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "pytorch").lower()
+    # Directory where models exported to ONNX are kept, so the export only runs once
+    ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", os.path.join(os.path.dirname(__file__), "onnx_models"))
+
+
+BACKENDS = ("pytorch", "int8", "onnx")
+
+# ONNX Runtime model class for every pipeline task
+ORT_MODEL_CLASSES = {
+    "zero-shot-classification": "ORTModelForSequenceClassification",
+    "summarization": "ORTModelForSeq2SeqLM",
+}
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """The requested backend, or the configured one; raises ValueError for unknown backends."""
+    backend = (backend or BackendConfig.INFERENCE_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {', '.join(BACKENDS)}")
+    return backend
+
+
+def quantize_int8(module: torch.nn.Module) -> torch.nn.Module:
+    """Quantize the Linear layers of a model to int8 in place; activations are quantized on the fly."""
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_onnx_model(task: str, model_name: str):
+    """Load a model for ONNX Runtime, exporting it to ONNX_CACHE_DIR on first use."""
+    try:
+        import optimum.onnxruntime as ort  # Optional dependency, only needed for the onnx backend
+    except ImportError as e:
+        raise RuntimeError("The onnx inference backend requires `pip install optimum[onnxruntime]`") from e
+
+    model_class = getattr(ort, ORT_MODEL_CLASSES[task])
+    export_dir = os.path.join(BackendConfig.ONNX_CACHE_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        return model_class.from_pretrained(export_dir)
+
+    logger.info(f"Exporting {model_name} to ONNX in {export_dir}...")
+    model = model_class.from_pretrained(model_name, export=True)
+    model.save_pretrained(export_dir)
+    return model
+
+
+def load_pipeline(task: str, model_name: str, backend: Optional[str] = None):
+    """Load a transformers pipeline running on the given (or configured) inference backend."""
+    from transformers import AutoTokenizer, pipeline  # Imported on first use to keep startup fast
+
+    backend = resolve_backend(backend)
+    if backend == "onnx":
+        model = load_onnx_model(task, model_name)
+        return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+    loaded = pipeline(task, model=model_name)
+    if backend == "int8":
+        quantize_int8(loaded.model)
+    return loaded
+
+
+def load_sentence_transformer(model_name: str, backend: Optional[str] = None):
+    """Load a SentenceTransformer running on the given (or configured) inference backend."""
+    from sentence_transformers import SentenceTransformer  # Imported on first use to keep startup fast
+
+    backend = resolve_backend(backend)
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")  # Exported by sentence-transformers on first load
+
+    model = SentenceTransformer(model_name)
+    if backend == "int8":
+        quantize_int8(model)
+    return model
@@ -0,0 +1,85 @@
+# backend/model_registry.py
+
+
+# Standard Library Imports
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch model loading settings from environment variables
+class ModelConfig:
+    # Comma-separated models to load at startup ("all" for every registered model, empty for none)
+    WARMUP_MODELS = os.getenv("WARMUP_MODELS", "")
+    # Load warmup models at import time, so that a pre-forking server (e.g. `gunicorn --preload`)
+    # shares the weights copy-on-write between its workers
+    PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "false").lower() == "true"
+
+
+class ModelRegistry:
+    """
+    Registry of named model loaders. Each model is loaded on first use, exactly once, even when
+    several threads ask for it concurrently. Load times are recorded for monitoring.
+    Weights are loaded from safetensors files, which are memory-mapped, so workers on the same
+    host share the page cache for the model files.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self.load_times: Dict[str, float] = {}  # Seconds spent loading each model
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register a loader without running it."""
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    @property
+    def names(self) -> list:
+        return list(self._loaders)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        """Return the named model, loading it on first use."""
+        model = self._models.get(name)
+        if model is not None:  # Fast path once loaded
+            return model
+
+        with self._locks[name]:
+            if name not in self._models:  # Another thread may have loaded it meanwhile
+                logger.info(f"Loading model '{name}'...")
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self.load_times[name] = time.perf_counter() - start
+                logger.info(f"Model '{name}' loaded in {self.load_times[name]:.1f} seconds")
+        return self._models[name]
+
+    def unload(self, name: str):
+        """Drop a loaded model so it is reloaded on next use."""
+        with self._locks[name]:
+            self._models.pop(name, None)
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Load the given models (all registered ones by default) and return their load times."""
+        for name in names or self.names:
+            self.get(name)
+        return {name: self.load_times.get(name, 0.0) for name in names or self.names}
+
+
+def warmup_names(setting: str) -> list:
+    """Parse a WARMUP_MODELS style setting into model names."""
+    if setting.strip().lower() == "all":
+        return model_registry.names
+    return [name.strip() for name in setting.split(",") if name.strip()]
+
+
+# Shared model registry for the application
+model_registry = ModelRegistry()
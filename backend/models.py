@@ -5,7 +5,7 @@
 from datetime import datetime
 
 # Third-party Imports
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, LargeBinary, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -15,7 +15,81 @@ class Document(Base):
     __tablename__ = "documents"
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=True, index=True)  # Extracted text, stored in document_contents
+    predicted_category = Column(String, nullable=False)
+    confidence_scores = Column(JSON, nullable=False)
+    upload_time = Column(DateTime, nullable=False, default=datetime.utcnow)  # Listing order, never NULL
+    duplicate_of = Column(Integer, nullable=True)  # Near-duplicate original whose classification was reused
+
+    # Indexes backing the keyset-paginated listing and its filters
+    __table_args__ = (
+        Index("ix_documents_upload_time", "upload_time", "id"),
+        Index("ix_documents_category_upload_time", "predicted_category", "upload_time", "id"),
+        Index("ix_documents_filename", "filename", postgresql_ops={"filename": "varchar_pattern_ops"}),
+        Index("ix_documents_duplicate_of", "duplicate_of"),
+    )
+
+
+class DocumentContent(Base):
+    __tablename__ = "document_contents"
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of the text; identical texts are stored once
+    encoding = Column(String(10), nullable=False)  # Compression of `data`: zlib, zstd or none
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # Uncompressed UTF-8 bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class DocumentEmbedding(Base):
+    __tablename__ = "document_embeddings"
+    document_id = Column(Integer, primary_key=True)  # One MiniLM embedding per document
+    embedding = Column(LargeBinary, nullable=False)  # Unit-length float16 vector, little-endian
+
+
+class DocumentSignature(Base):
+    __tablename__ = "document_signatures"
+    document_id = Column(Integer, primary_key=True)  # One MinHash signature per document
+    signature = Column(LargeBinary, nullable=False)  # DEDUP_NUM_PERM little-endian uint32 hashes
+
+
+class CategoryStats(Base):
+    __tablename__ = "category_stats"
+    category = Column(String, primary_key=True)
+    documents = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)  # Sum of the predicted category's confidence
+
+
+class UploadBucket(Base):
+    __tablename__ = "upload_buckets"
+    granularity = Column(String(5), primary_key=True)  # "hour" or "day"
+    bucket_start = Column(DateTime, primary_key=True)
+    category = Column(String, primary_key=True)
+    documents = Column(Integer, nullable=False, default=0)
+
+
+class ClassificationCache(Base):
+    __tablename__ = "classification_cache"
+    cache_key = Column(String(64), primary_key=True)
+    fingerprint = Column(String(64), nullable=False, index=True)
+    content_hash = Column(String(64), nullable=False)
     content = Column(String, nullable=False)
     predicted_category = Column(String, nullable=False)
     confidence_scores = Column(JSON, nullable=False)
-    upload_time = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String, nullable=False)
+    payload = Column(LargeBinary, nullable=True)  # Raw file, cleared once the job has finished
+    status = Column(String, nullable=False, default="queued")
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    error = Column(String, nullable=True)
+    document_id = Column(Integer, nullable=True)
+    available_at = Column(DateTime, default=datetime.utcnow)  # Earliest time the job may run (retry backoff)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (Index("ix_upload_jobs_claim", "status", "priority", "id"),)
@@ -0,0 +1,127 @@
+# backend/pipeline.py
+
+
+# Standard Library Imports
+from bisect import bisect_left, bisect_right
+from typing import List, NamedTuple, Optional, Tuple
+
+# Third-party Imports
+import torch
+from nltk.tokenize import sent_tokenize  # Sentence tokenization
+
+# Local Application/Library-Specific Imports
+from .model_registry import model_registry
+
+
+class TokenChunk(NamedTuple):
+    ids: Tuple[int, ...]  # Token ids, without special tokens
+    start: int  # Character offset of the chunk in the document text
+    end: int  # Character offset just past the chunk
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+def sentence_spans(text: str, max_sentences: int = 7) -> List[Tuple[int, int]]:
+    """Character spans of consecutive groups of `max_sentences` sentences."""
+    spans, position, group_start, in_group = [], 0, None, 0
+    for sentence in sent_tokenize(text):
+        start = text.find(sentence, position)
+        if start < 0:  # The tokenizer normalized the sentence; fall back to the current position
+            start = position
+        position = start + len(sentence)
+        group_start = start if group_start is None else group_start
+        in_group += 1
+        if in_group >= max_sentences:
+            spans.append((group_start, position))
+            group_start, in_group = None, 0
+
+    if group_start is not None:  # Remaining sentences
+        spans.append((group_start, position))
+    return spans
+
+
+def pad_batch(tokenizer, sequences: List[List[int]]) -> dict:
+    """Right-pad token id sequences into input_ids and attention_mask tensors."""
+    width = max(len(sequence) for sequence in sequences)
+    input_ids = torch.full((len(sequences), width), tokenizer.pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(sequences), width), dtype=torch.long)
+    for row, sequence in enumerate(sequences):
+        input_ids[row, :len(sequence)] = torch.tensor(sequence, dtype=torch.long)
+        attention_mask[row, :len(sequence)] = 1
+    return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class TokenizedDocument:
+    """
+    A document tokenized once and shared by every stage of the classification pipeline.
+    Words are split once; token ids and their character offsets are computed on first use
+    and sliced into chunks, so no stage decodes ids back to text to tokenize them again.
+    """
+
+    def __init__(self, text: str, words: Optional[List[str]] = None, tokenizer=None):
+        self.text = text
+        self._words = words
+        self._tokenizer = tokenizer
+        self._ids: Optional[List[int]] = None
+        self._starts: Optional[List[int]] = None  # Start offset of every token
+        self._ends: Optional[List[int]] = None  # End offset of every token
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            self._tokenizer = model_registry.get("tokenizer")
+        return self._tokenizer
+
+    @property
+    def words(self) -> List[str]:
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    def _encode(self):
+        encoding = self.tokenizer(
+            self.text, add_special_tokens=False, return_offsets_mapping=True, truncation=False, verbose=False
+        )
+        self._ids = encoding["input_ids"]
+        self._starts = [start for start, _ in encoding["offset_mapping"]]
+        self._ends = [end for _, end in encoding["offset_mapping"]]
+
+    @property
+    def token_ids(self) -> List[int]:
+        if self._ids is None:
+            self._encode()
+        return self._ids
+
+    def _chunk(self, first: int, last: int) -> TokenChunk:
+        """Chunk of tokens [first, last)."""
+        return TokenChunk(tuple(self._ids[first:last]), self._starts[first], self._ends[last - 1])
+
+    def token_chunks(self, max_tokens: int) -> List[TokenChunk]:
+        """Consecutive chunks of at most `max_tokens` tokens."""
+        ids = self.token_ids
+        return [self._chunk(i, min(i + max_tokens, len(ids))) for i in range(0, len(ids), max_tokens)]
+
+    def span_chunks(self, spans: List[Tuple[int, int]], max_tokens: int, split: bool = False) -> List[TokenChunk]:
+        """
+        Chunks of the tokens inside each character span. Spans longer than `max_tokens` are
+        truncated, or split into several chunks when `split` is set. Empty spans are skipped.
+        """
+        self.token_ids  # Make sure offsets are available
+        chunks = []
+        for span_start, span_end in spans:
+            first = bisect_left(self._starts, span_start)
+            last = bisect_right(self._ends, span_end, lo=first)
+            steps = range(first, last, max_tokens) if split else range(first, min(first + 1, last))
+            for start in steps:
+                chunks.append(self._chunk(start, min(start + max_tokens, last)))
+        return chunks
+
+    def chunk_text(self, chunk: TokenChunk) -> str:
+        """Original text of a chunk."""
+        return self.text[chunk.start:chunk.end]
@@ -0,0 +1,78 @@
+# backend/progress.py
+
+
+# Standard Library Imports
+import asyncio
+import logging
+import threading
+from contextvars import ContextVar
+from concurrent.futures import Future, wait
+from typing import Any, Iterator, List, Optional
+
+# Local Application/Library-Specific Imports
+from .exceptions import UploadCancelled
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+CANCEL_POLL_INTERVAL = 0.1  # Seconds between cancellation checks while waiting for a batcher
+
+
+class ProgressReporter:
+    """
+    Pipeline events of one streamed upload. Events are emitted from inference threads and queued on the
+    event loop of the request, which sends them to the client; `cancel` tells those threads to stop.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.events: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self.cancelled = threading.Event()
+
+    def emit(self, event: str, data: dict):
+        """Queue an event from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self.events.put_nowait, (event, data))
+        except RuntimeError:
+            logger.debug(f"Dropped {event} event of a finished upload")  # The request's loop is gone
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+# Reporter of the streamed upload being processed; None for every other request.
+# Inference jobs run in a copy of the caller's context, so their threads see it too.
+progress_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar("progress_reporter", default=None)
+
+
+def report(event: str, **data):
+    """Send an event to the client of the current streamed upload, if any."""
+    reporter = progress_reporter.get()
+    if reporter is not None:
+        reporter.emit(event, data)
+
+
+def check_cancelled():
+    """Raise UploadCancelled once the client of the current streamed upload is gone."""
+    reporter = progress_reporter.get()
+    if reporter is not None and reporter.cancelled.is_set():
+        raise UploadCancelled()
+
+
+def wait_in_order(futures: List[Future], return_exceptions: bool = False) -> Iterator[Any]:
+    """
+    Results of batcher futures in submission order, as each one completes. When the upload is cancelled
+    meanwhile, the futures not yet collected into a batch are cancelled, so the batcher skips them.
+    With `return_exceptions`, a failed future yields its exception instead of raising it.
+    """
+    reporter = progress_reporter.get()
+    for position, future in enumerate(futures):
+        while reporter is not None and not future.done():
+            if reporter.cancelled.is_set():
+                for pending in futures[position:]:
+                    pending.cancel()  # Only succeeds for items no batch has started on
+                raise UploadCancelled()
+            wait([future], timeout=CANCEL_POLL_INTERVAL)
+        error = future.exception() if return_exceptions else None
+        yield error if error is not None else future.result()
@@ -2,84 +2,71 @@
 
 
 # Standard Library Imports
-import os  # Module for interacting with the operating system
-import shutil  # Module for file operations like copying and moving files
+import os
 import logging  # Logging module for application events
-import tempfile  # Module for creating temporary files/directories
+from datetime import datetime
+from typing import Optional
 
 # Third-party Imports
+from sqlalchemy import select  # Query construction
 from sqlalchemy.ext.asyncio import AsyncSession  # Async session for SQLAlchemy
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends  # FastAPI imports for API routing
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Request, Response, Query  # FastAPI routing
+from starlette.datastructures import UploadFile as StarletteUploadFile  # Files of a manually parsed form
+from fastapi.concurrency import run_in_threadpool  # Run blocking I/O without stalling the event loop
+from fastapi.responses import JSONResponse, StreamingResponse  # Job responses and streamed results
+from fastapi.encoders import jsonable_encoder  # JSON-compatible job responses
 
 # Local Application/Library-Specific Imports
-from .models import Document
+from .models import Document, DocumentEmbedding, DocumentSignature
 from .database import get_db
-from .schemas import DocumentResponse
-from .utils import extract_text_from_file
-from .ml_model import classify_text
-from .exceptions import InvalidFileType, ModelInferenceError, CorruptedFile
+from .schemas import DocumentContentResponse, DocumentResponse, JobResponse, SimilarDocumentResponse
+from .services import BatchConfig, analyze_file, persist_documents, expand_batch_uploads, stream_batch_results
+from .services import ListingConfig, list_documents, similar_documents, stream_upload_events
+from .ml_model import document_embedding
+from .inference import inference_executor
+from .vector_index import SimilarityConfig, decode_embedding, vector_index
+from .dedup import lsh_index
+from .content_store import delete_unreferenced, load_content
+from .stats import record_documents
+from .jobs import JobConfig, enqueue_job, get_job_response, wait_for_job, stream_job_events
+from .extractors import IngestConfig, UploadStream, SUPPORTED_EXTENSIONS
+from .exceptions import CorruptedFile, FileTooLarge, InvalidFileType
 
 
 # Initialize FastAPI Router
 router = APIRouter()
 
 
-@router.post("/upload/", response_model=DocumentResponse, summary="Upload a document and classify it")
-async def upload_file(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+@router.post(
+    "/upload/",
+    response_model=DocumentResponse,
+    responses={202: {"model": JobResponse, "description": "Upload queued for background processing"}},
+    summary="Upload a document and classify it",
+)
+async def upload_file(
+    response: Response,
+    file: UploadFile = File(...),
+    async_mode: bool = Query(False, alias="async"),
+    priority: int = Query(0),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Endpoint to upload files and classify them.
+    With `async=true` the file is queued and a job is returned immediately (202); poll /jobs/{job_id}.
     """
+    if async_mode:
+        return await enqueue_upload(file, priority, db)
+
     try:
-        # Validate file type
-        file_extension = os.path.splitext(file.filename)[1].lower()  # Get the file extension
-        if file_extension not in ['.txt', '.pdf', '.docx']:  # Check for supported formats
-            raise InvalidFileType()  # Raise an error for invalid file types
-
-        with tempfile.TemporaryDirectory() as temp_dir:  # Create a temporary directory for the uploaded file
-            file_path = os.path.join(temp_dir, file.filename)  # Set file path in the temp directory
-            with open(file_path, "wb") as buffer:  # Open the file for writing
-                shutil.copyfileobj(file.file, buffer)  # Copy the uploaded file into the temp directory
-
-            # Extract text from file based on file extension
-            try:
-                content = extract_text_from_file(file_path, file_extension)
-            except Exception as e:
-                # If there's an error while extracting text, raise a CorruptedFile error
-                logging.error(f"Error extracting text from file: {e}")
-                raise CorruptedFile("This file appears to be corrupted. Please upload a valid file.")
-
-            # Check if the extracted content is empty
-            if not content:
-                raise HTTPException(status_code=400, detail="File is empty")  # Raise error for empty content
-
-            # Classify the text
-            try:
-                # Classify the extracted text
-                predicted_category, confidence_scores = classify_text(content)
-            except Exception as e:
-                logging.error(f"Error during classification: {e}")  # Log any errors during classification
-                raise ModelInferenceError(str(e))  # Raise a model inference error
-
-            # Save to database with creating a new document object
-            db_document = Document(
-                filename=file.filename,
-                content=content,
-                predicted_category=predicted_category,
-                confidence_scores=confidence_scores,
-            )
-
-            db.add(db_document)  # Add the document to the database
-            await db.commit()  # Commit the transaction
-            await db.refresh(db_document)  # Refresh the document object to get the latest data from the database
-
-            # Return the document response
-            return {
-                "id": db_document.id,
-                "filename": file.filename,
-                "predicted_category": predicted_category,
-                "confidence_scores": confidence_scores,
-                "upload_time": db_document.upload_time,
-            }
+        # Extract and classify the uploaded file
+        analysis = await analyze_file(file.filename, file.file, file.size)
+
+        # Report which classifier tier decided this document
+        response.headers["X-Classification-Tier"] = analysis["tier"]
+
+        # Save to database and return the document response
+        documents = await persist_documents(db, [analysis])
+        return documents[0]
 
     except HTTPException as e:
         raise e
@@ -88,26 +75,238 @@ async def upload_file(file: UploadFile = File(...), db: AsyncSession = Depends(g
         raise HTTPException(status_code=500, detail="Internal Server Error")  # Raise a generic error
 
 
+@router.post(
+    "/upload/stream/",
+    summary="Upload a document and stream its classification progress",
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                }
+            }
+        }
+    },
+)
+async def upload_file_stream(request: Request):
+    """
+    Endpoint to upload a file and follow its classification as Server-Sent Events: the word count once
+    extracted, summarization progress, the scores of every chunk with the running category, and finally
+    the stored document. Closing the connection cancels the upload.
+    """
+    # Parse the form ourselves so that the uploaded file stays open while events are streamed
+    form = await request.form(max_files=1)
+    file = form.get("file")
+    if not isinstance(file, StarletteUploadFile):
+        await form.close()
+        raise HTTPException(status_code=400, detail="No file uploaded")
+
+    async def events():
+        try:
+            async for event in stream_upload_events(file.filename, file.file, file.size):
+                yield event
+        finally:
+            await form.close()  # Release the spooled upload once it is processed or abandoned
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def enqueue_upload(file: UploadFile, priority: int, db: AsyncSession) -> JSONResponse:
+    """Validate an upload, store it as a queued job and return the job with status 202."""
+    # Validate file type and size before queueing, so that bad uploads fail fast
+    extension = os.path.splitext(file.filename)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise InvalidFileType()
+    if file.size is not None and file.size > IngestConfig.MAX_UPLOAD_BYTES:
+        raise FileTooLarge(IngestConfig.MAX_UPLOAD_BYTES)
+
+    payload = await run_in_threadpool(UploadStream(file.file).read)  # Enforces the size limit while reading
+    job = await enqueue_job(db, file.filename, payload, priority)
+    return JSONResponse(status_code=202, content=jsonable_encoder(await get_job_response(db, job.id)))
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse, summary="Get the status of an upload job")
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Endpoint to retrieve the status of an upload job, with its document once done.
+    """
+    job = await get_job_response(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/wait", response_model=JobResponse, summary="Wait for an upload job to finish")
+async def wait_job(job_id: int, timeout: float = Query(JobConfig.JOB_MAX_WAIT, gt=0)):
+    """
+    Endpoint to long-poll an upload job: returns as soon as the job is done, failed or dead,
+    or with its current state once `timeout` seconds (at most JOB_MAX_WAIT) have passed.
+    """
+    job = await wait_for_job(job_id, timeout)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/events", summary="Stream status changes of an upload job")
+async def job_events(job_id: int, timeout: float = Query(JobConfig.JOB_MAX_WAIT, gt=0)):
+    """
+    Endpoint to follow an upload job as Server-Sent Events, one event per status change.
+    """
+    return StreamingResponse(stream_job_events(job_id, timeout), media_type="text/event-stream")
+
+
+@router.post(
+    "/upload/batch/",
+    summary="Upload several documents or an archive and classify them",
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"files": {"type": "array", "items": {"type": "string", "format": "binary"}}},
+                        "required": ["files"],
+                    }
+                }
+            }
+        }
+    },
+)
+async def upload_batch(request: Request):
+    """
+    Endpoint to upload many files at once, as multiple files and/or zip/tar archives.
+    Results are streamed back as newline-delimited JSON, one line per file, as they complete;
+    failures are reported per file without aborting the batch.
+    """
+    # Parse the form ourselves so that the uploaded files stay open while results are streamed
+    form = await request.form(max_files=BatchConfig.BATCH_MAX_FILES)
+    files = [upload for upload in form.getlist("files") if isinstance(upload, StarletteUploadFile)]
+    if not files:
+        await form.close()
+        raise HTTPException(status_code=400, detail="No files uploaded")
+
+    try:
+        items = await run_in_threadpool(expand_batch_uploads, files)  # Expand archives into their members
+    except Exception as e:
+        await form.close()
+        logging.error(f"Error reading batch archive: {str(e)}")
+        raise CorruptedFile("This archive appears to be corrupted. Please upload a valid archive.")
+
+    async def results():
+        try:
+            async for line in stream_batch_results(items):
+                yield line
+        finally:
+            await form.close()  # Release spooled uploads once every file is processed
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.get("/documents/", response_model=list[DocumentResponse], summary="Retrieve classified documents")
-async def get_documents(db: AsyncSession = Depends(get_db)):
+async def get_documents(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=ListingConfig.DOCUMENTS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    uploaded_after: Optional[datetime] = Query(None),
+    uploaded_before: Optional[datetime] = Query(None),
+    filename_prefix: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
     """
-    Endpoint to retrieve a list of classified documents.
+    Endpoint to retrieve a list of classified documents, newest first.
+    Pages are requested with `limit`; the cursor of the next page is returned in the X-Next-Cursor header.
     """
     try:
-        # Execute a query to select all documents
-        result = await db.execute(Document.__table__.select())
+        # Fetch one page of documents without their content
+        documents, next_cursor = await list_documents(
+            db,
+            limit=limit or ListingConfig.DOCUMENTS_PAGE_SIZE or None,
+            cursor=cursor,
+            category=category,
+            uploaded_after=uploaded_after,
+            uploaded_before=uploaded_before,
+            filename_prefix=filename_prefix,
+        )
 
-        # Fetch all documents from the result
-        documents = result.fetchall()
+        # Point the client at the next page, if any
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         # Return the documents as a list of response models
-        return [DocumentResponse(**dict(doc._mapping)) for doc in documents]
+        return documents
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logging.error(f"Error fetching documents: {str(e)}")  # Log any errors during fetching
         raise HTTPException(status_code=500, detail="Internal Server Error")  # Raise a generic error
 
 
+@router.get(
+    "/documents/{doc_id}/content", response_model=DocumentContentResponse, summary="Retrieve the text of a document"
+)
+async def get_document_content(doc_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Endpoint to retrieve the extracted text of a document, decompressed from content storage on demand.
+    """
+    row = (await db.execute(select(Document.content_hash).where(Document.id == doc_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    content = await load_content(db, row.content_hash) if row.content_hash else None
+    if content is None:
+        raise HTTPException(status_code=404, detail="Document content not found")
+    return {"id": doc_id, "content_hash": row.content_hash, "content": content}
+
+
+def require_similarity():
+    if not SimilarityConfig.SIMILARITY_ENABLED:
+        raise HTTPException(status_code=503, detail="Similarity search is disabled")
+
+
+@router.get(
+    "/documents/{doc_id}/similar",
+    response_model=list[SimilarDocumentResponse],
+    summary="Find the documents most similar to a document",
+)
+async def get_similar_documents(
+    doc_id: int, k: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_db)
+):
+    """
+    Endpoint to find the `k` documents whose embeddings are closest to the given document's, most similar first.
+    """
+    require_similarity()
+
+    # The index holds the embedding, unless the document was stored by another process moments ago
+    vector = vector_index.vector(doc_id)
+    if vector is None:
+        row = (await db.execute(select(DocumentEmbedding.embedding).where(DocumentEmbedding.document_id == doc_id))).first()
+        if row is None:
+            exists = (await db.execute(select(Document.id).where(Document.id == doc_id))).first()
+            raise HTTPException(status_code=404, detail="Document has no embedding" if exists else "Document not found")
+        vector = decode_embedding(row.embedding)
+
+    return await similar_documents(db, vector, k, exclude=doc_id)
+
+
+@router.get("/search", response_model=list[SimilarDocumentResponse], summary="Search documents by meaning")
+async def search_documents(
+    q: str = Query(..., min_length=1), k: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_db)
+):
+    """
+    Endpoint to find the `k` documents closest to a free-text query, embedded like uploaded documents.
+    """
+    require_similarity()
+    query = await inference_executor.run(document_embedding, q)
+    return await similar_documents(db, query, k)
+
+
 @router.delete("/documents/{doc_id}/", summary="Delete a document by ID")
 async def delete_document(doc_id: int, db: AsyncSession = Depends(get_db)):
     """
@@ -115,10 +314,15 @@ async def delete_document(doc_id: int, db: AsyncSession = Depends(get_db)):
     """
     try:
         # Find the document by ID
-        result = await db.execute(Document.__table__.select().where(Document.id == doc_id))
+        result = await db.execute(
+            select(
+                Document.id, Document.content_hash, Document.predicted_category,
+                Document.confidence_scores, Document.upload_time,
+            ).where(Document.id == doc_id)
+        )
 
         # Get the document object
-        document = result.scalar_one_or_none()
+        document = result.first()
 
         # If the document does not exist
         if document is None:
@@ -127,9 +331,23 @@ async def delete_document(doc_id: int, db: AsyncSession = Depends(get_db)):
 
         # Delete the document from the database
         await db.execute(Document.__table__.delete().where(Document.id == doc_id))
+        await db.execute(DocumentEmbedding.__table__.delete().where(DocumentEmbedding.document_id == doc_id))
+        await db.execute(DocumentSignature.__table__.delete().where(DocumentSignature.document_id == doc_id))
+
+        # Its near-duplicates keep their classification, but no longer point to it
+        await db.execute(Document.__table__.update().where(Document.duplicate_of == doc_id).values(duplicate_of=None))
+
+        # Drop its stored text unless another document has the same text
+        if document.content_hash:
+            await delete_unreferenced(db, document.content_hash)
+
+        # Remove it from the category statistics
+        await record_documents(db, [dict(document._mapping)], removed=True)
 
         # Commit the transaction
         await db.commit()
+        vector_index.remove(doc_id)  # Keep the similarity and duplicate indexes in sync
+        lsh_index.remove(doc_id)
 
         # Return success message
         return {"message": "Document deleted successfully"}
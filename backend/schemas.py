@@ -2,7 +2,7 @@
 
 
 # Standard Library Imports
-from typing import Dict  # Importing Dict for type annotations
+from typing import Dict, List, Optional  # Importing Dict, List and Optional for type annotations
 from datetime import datetime  # Importing datetime for timestamping
 
 # Third-party Imports
@@ -24,6 +24,54 @@ class DocumentResponse(BaseModel):
     predicted_category: str  # Predicted category
     confidence_scores: Dict[str, float]  # Confidence scores
     upload_time: datetime  # Timestamp when the document was uploaded
+    duplicate_of: Optional[int] = None  # Near-duplicate original whose classification was reused
 
     class Config:
         orm_mode = True  # Enable ORM mode for compatibility with SQLAlchemy
+
+
+# Schema for a document found by similarity search
+class SimilarDocumentResponse(DocumentResponse):
+    similarity: float  # Cosine similarity of the document embeddings
+
+
+# Schema for the extracted text of a document
+class DocumentContentResponse(BaseModel):
+    id: int  # Document ID
+    content_hash: str  # SHA-256 of the text, shared by documents with identical text
+    content: str  # Extracted text content
+
+
+# Schema for the statistics of one category
+class CategoryStatsResponse(BaseModel):
+    category: str  # Predicted category
+    documents: int  # Documents classified in the category
+    mean_confidence: float  # Mean confidence of the category over its documents
+
+
+# Schema for the uploads of one hour or day
+class UploadBucketResponse(BaseModel):
+    bucket_start: datetime  # Start of the hour or day
+    documents: int  # Documents uploaded in the bucket
+    categories: Dict[str, int]  # Documents uploaded in the bucket per category
+
+
+# Schema for the dashboard statistics
+class StatsResponse(BaseModel):
+    total_documents: int  # Documents stored
+    categories: List[CategoryStatsResponse]  # Per-category counts and confidence
+    granularity: str  # "hour" or "day"
+    uploads: List[UploadBucketResponse]  # Upload buckets, oldest first
+
+
+# Schema for asynchronous upload job status
+class JobResponse(BaseModel):
+    id: int  # Job ID
+    filename: str  # Name of the uploaded file
+    status: str  # queued, running, done, failed or dead
+    priority: int  # Higher priorities run first
+    attempts: int  # Processing attempts so far
+    error: Optional[str] = None  # Last error, if any
+    document: Optional[DocumentResponse] = None  # Classified document once the job is done
+    created_at: datetime  # Timestamp when the job was queued
+    updated_at: datetime  # Timestamp of the last status change
@@ -0,0 +1,527 @@
+# backend/services.py
+
+
+# Standard Library Imports
+import io
+import os
+import json
+import base64
+import asyncio
+import logging
+import tarfile
+import zipfile
+import threading
+from datetime import datetime
+from functools import partial
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+# Third-party Imports
+import numpy as np
+from sqlalchemy import insert, select, and_, or_  # Bulk INSERT ... RETURNING and listing queries
+from sqlalchemy.ext.asyncio import AsyncSession  # Async session for SQLAlchemy
+from fastapi import HTTPException  # Exception handling for FastAPI
+from fastapi.encoders import jsonable_encoder  # JSON-compatible batch result lines
+from fastapi.concurrency import run_in_threadpool  # Run blocking I/O without stalling the event loop
+
+# Local Application/Library-Specific Imports
+from .models import Document, DocumentEmbedding, DocumentSignature
+from .database import AsyncSessionLocal
+from .ml_model import classify_text_with_tier, document_embedding, MODEL_FINGERPRINT
+from .cache import CacheConfig, cache_key, file_cache, load_persistent, store_persistent
+from .content_store import store_contents
+from .stats import record_documents
+from .vector_index import SimilarityConfig, encode_embedding, vector_index
+from .dedup import DedupConfig, document_signature, encode_signature, find_duplicate, lsh_index
+from .inference import inference_executor
+from .timing import timed_stage
+from .utils import preprocess_words
+from .progress import ProgressReporter, progress_reporter, report
+from .extractors import IngestConfig, UploadStream, SUPPORTED_EXTENSIONS, STREAMED_EXTENSIONS
+from .extractors import extract_text_from_stream
+from .exceptions import InvalidFileType, ModelInferenceError, CorruptedFile, FileTooLarge
+
+
+# Fetch batch upload settings from environment variables
+class BatchConfig:
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", str(os.cpu_count() or 1)))  # Files processed at once
+    BATCH_INSERT_SIZE = int(os.getenv("BATCH_INSERT_SIZE", "32"))  # Documents per bulk INSERT
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "10000"))  # Files accepted per multipart request
+    BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(1024 * 1024 * 1024)))  # Largest batch request body
+
+
+# Fetch document listing settings from environment variables
+class ListingConfig:
+    DOCUMENTS_PAGE_SIZE = int(os.getenv("DOCUMENTS_PAGE_SIZE", "0"))  # Default page size, 0 lists everything
+    DOCUMENTS_MAX_PAGE_SIZE = int(os.getenv("DOCUMENTS_MAX_PAGE_SIZE", "1000"))  # Largest page a client may ask for
+
+
+ZIP_EXTENSIONS = ('.zip',)
+TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+
+async def lookup_file_cache(key: str):
+    """
+    Find a previous result for identical file bytes, first in memory, then in Postgres.
+    """
+    if not CacheConfig.CACHE_ENABLED:
+        return None
+
+    cached = file_cache.get(key)
+    if cached is None and CacheConfig.CACHE_PERSISTENT:
+        async with AsyncSessionLocal() as db:  # Own session, so concurrent lookups never share one
+            cached = await load_persistent(db, key)
+        if cached is not None:
+            file_cache.set(key, cached)  # Promote to the in-process tier
+    return cached
+
+
+async def analyze_file(filename: str, raw: BinaryIO, size: Optional[int] = None) -> dict:
+    """
+    Run the upload pipeline for one file up to, but excluding, persistence:
+    validation, reading and hashing, cache lookup, text extraction, near-duplicate lookup and classification.
+    Raises HTTPException subclasses for files that cannot be processed.
+    """
+    # Validate file type
+    file_extension = os.path.splitext(filename)[1].lower()  # Get the file extension
+    if file_extension not in SUPPORTED_EXTENSIONS:  # Check for supported formats
+        raise InvalidFileType()  # Raise an error for invalid file types
+
+    # Reject oversized uploads before reading them
+    if size is not None and size > IngestConfig.MAX_UPLOAD_BYTES:
+        raise FileTooLarge(IngestConfig.MAX_UPLOAD_BYTES)
+
+    # Read the upload in place; text is decoded while hashing, other formats are hashed first
+    stream = UploadStream(raw)
+    content = None
+    try:
+        if file_extension in STREAMED_EXTENSIONS:
+            with timed_stage(f"extract_{file_extension.lstrip('.')}"):  # Read and extracted in one pass
+                content = await run_in_threadpool(extract_text_from_stream, stream, file_extension)
+        else:
+            with timed_stage("read"):
+                await run_in_threadpool(stream.consume)
+    except HTTPException:
+        raise  # Propagate size limit errors unchanged
+    except Exception as e:
+        # If there's an error while reading the file, raise a CorruptedFile error
+        logging.error(f"Error reading uploaded file: {e}")
+        raise CorruptedFile("This file appears to be corrupted. Please upload a valid file.")
+
+    # Serve re-uploads of identical files from the cache
+    file_digest = stream.hexdigest()
+    key = cache_key(MODEL_FINGERPRINT, "file", f"{file_extension}:{file_digest}")
+    cached = await lookup_file_cache(key)
+    signature, duplicate_of = None, None
+
+    if cached is not None:
+        content, predicted_category, confidence_scores = cached
+        tier = "cache"
+        report("extracted", words=len(content.split()))
+
+    else:
+        # Extract text from the rewound upload based on file extension
+        if content is None:
+            try:
+                with timed_stage(f"extract_{file_extension.lstrip('.')}"):
+                    content = await run_in_threadpool(extract_text_from_stream, raw, file_extension)
+            except Exception as e:
+                # If there's an error while extracting text, raise a CorruptedFile error
+                logging.error(f"Error extracting text from file: {e}")
+                raise CorruptedFile("This file appears to be corrupted. Please upload a valid file.")
+
+        # Check if the extracted content is empty
+        if not content:
+            raise HTTPException(status_code=400, detail="File is empty")  # Raise error for empty content
+        report("extracted", words=len(content.split()))  # First event of a streamed upload
+
+        # Reuse the classification of a near-identical stored document, preprocessing once for both
+        duplicate, words = None, None
+        if DedupConfig.DEDUP_ENABLED:
+            try:
+                with timed_stage("preprocess"):
+                    words = await run_in_threadpool(preprocess_words, content)
+                with timed_stage("dedup"):
+                    signature = await run_in_threadpool(document_signature, content, words)
+                    duplicate = await find_duplicate(signature) if signature is not None else None
+            except Exception as e:
+                logging.warning(f"Near-duplicate lookup failed for {filename}: {e}")  # Classify as usual
+
+        if duplicate is not None:
+            predicted_category, confidence_scores = duplicate["predicted_category"], duplicate["confidence_scores"]
+            tier, duplicate_of = "duplicate", duplicate["duplicate_of"]
+
+        # Classify the text
+        else:
+            try:
+                # Classify the extracted text on the inference pool, keeping the event loop free
+                with timed_stage("classify"):  # Includes the wait for a free inference worker
+                    predicted_category, confidence_scores, tier = await inference_executor.run(
+                        classify_text_with_tier, content, words
+                    )
+            except HTTPException:
+                raise  # Propagate backpressure and timeout errors unchanged
+            except Exception as e:
+                logging.error(f"Error during classification: {e}")  # Log any errors during classification
+                raise ModelInferenceError(str(e))  # Raise a model inference error
+
+        # Remember the result for identical uploads
+        if CacheConfig.CACHE_ENABLED:
+            file_cache.set(key, (content, predicted_category, dict(confidence_scores)))
+
+    logging.info(f"Classified {filename} as {predicted_category} by the {tier} tier")
+
+    # Index re-uploads of cached files too, so their near-duplicates are found
+    if DedupConfig.DEDUP_ENABLED and signature is None and tier == "cache":
+        try:
+            signature = await run_in_threadpool(document_signature, content)
+        except Exception as e:
+            logging.warning(f"Could not sign {filename} for near-duplicate detection: {e}")
+
+    # Embed the document for similarity search; reused from classification or from the near-duplicate
+    embedding = vector_index.vector(duplicate_of) if duplicate_of is not None else None
+    if SimilarityConfig.SIMILARITY_ENABLED and embedding is None:
+        try:
+            with timed_stage("document_embedding"):
+                embedding = await inference_executor.run(document_embedding, content)
+        except Exception as e:
+            logging.warning(f"Could not embed {filename} for similarity search: {e}")  # The upload still succeeds
+
+    return {
+        "filename": filename,
+        "content": content,
+        "predicted_category": predicted_category,
+        "confidence_scores": confidence_scores,
+        "tier": tier,
+        "cache_key": key,
+        "file_digest": file_digest,
+        "embedding": embedding,
+        "signature": signature,
+        "duplicate_of": duplicate_of,
+    }
+
+
+# Built once: SQLAlchemy reuses its compiled form, and every full batch sends asyncpg the same SQL,
+# so the statement prepared on each pooled connection is reused (see DB_STATEMENT_CACHE_SIZE)
+INSERT_DOCUMENTS = insert(Document).returning(Document.id, Document.upload_time, sort_by_parameter_order=True)
+
+
+async def persist_documents(db: AsyncSession, analyses: List[dict],
+                            before_commit: Optional[Callable[[List[dict]], None]] = None) -> List[dict]:
+    """
+    Save analyzed documents with a single INSERT ... RETURNING and commit once; their text is stored
+    compressed in document_contents. Returns the document responses in the order of `analyses`.
+    `before_commit` is called with the responses before the commit, to change other rows of the session
+    (e.g. the job that produced the documents) in the same transaction.
+    """
+    with timed_stage("db_insert"):
+        content_hashes = await store_contents(db, [analysis["content"] for analysis in analyses])
+        rows = (
+            await db.execute(
+                INSERT_DOCUMENTS,
+                [
+                    {
+                        "filename": analysis["filename"],
+                        "content_hash": digest,
+                        "predicted_category": analysis["predicted_category"],
+                        "confidence_scores": analysis["confidence_scores"],
+                        "duplicate_of": analysis.get("duplicate_of"),
+                    }
+                    for analysis, digest in zip(analyses, content_hashes)
+                ],
+            )
+        ).all()
+
+    # Keep new file results in the persistent cache, in the same transaction
+    if CacheConfig.CACHE_ENABLED and CacheConfig.CACHE_PERSISTENT:
+        for analysis in analyses:
+            if analysis["tier"] != "cache":
+                await store_persistent(
+                    db, analysis["cache_key"], MODEL_FINGERPRINT, analysis["file_digest"], analysis["content"],
+                    analysis["predicted_category"], analysis["confidence_scores"],
+                )
+
+    # Keep document embeddings for similarity search, in the same transaction
+    embedded = [(row.id, analysis["embedding"]) for analysis, row in zip(analyses, rows)
+                if analysis.get("embedding") is not None]
+    if embedded:
+        db.add_all([DocumentEmbedding(document_id=doc_id, embedding=encode_embedding(vector))
+                    for doc_id, vector in embedded])
+
+    # Keep near-duplicate signatures, in the same transaction
+    signed = [(row.id, analysis["signature"]) for analysis, row in zip(analyses, rows)
+              if analysis.get("signature") is not None]
+    if signed:
+        db.add_all([DocumentSignature(document_id=doc_id, signature=encode_signature(signature))
+                    for doc_id, signature in signed])
+
+    # Count the documents in the category statistics last, as their rows are shared by concurrent uploads
+    await record_documents(db, [
+        {**analysis, "upload_time": row.upload_time} for analysis, row in zip(analyses, rows)
+    ])
+
+    documents = [
+        {
+            "id": row.id,
+            "filename": analysis["filename"],
+            "predicted_category": analysis["predicted_category"],
+            "confidence_scores": analysis["confidence_scores"],
+            "upload_time": row.upload_time,
+            "duplicate_of": analysis.get("duplicate_of"),
+        }
+        for analysis, row in zip(analyses, rows)
+    ]
+    if before_commit is not None:
+        before_commit(documents)
+
+    with timed_stage("db_commit"):
+        await db.commit()  # Commit the transaction
+
+    # Index the committed documents in this process; other processes pick them up from the tables
+    if embedded:
+        vector_index.add([doc_id for doc_id, _ in embedded], [vector for _, vector in embedded])
+    for doc_id, signature in signed:
+        lsh_index.add(doc_id, signature)
+
+    return documents
+
+
+# Columns returned by the document listing; the extracted content is never loaded
+DOCUMENT_LISTING_COLUMNS = (
+    Document.id, Document.filename, Document.predicted_category, Document.confidence_scores, Document.upload_time,
+    Document.duplicate_of,
+)
+
+
+def encode_cursor(upload_time: datetime, doc_id: int) -> str:
+    """Opaque cursor pointing just past the given document in listing order."""
+    return base64.urlsafe_b64encode(f"{upload_time.isoformat()}|{doc_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises HTTPException 400 for malformed cursors."""
+    try:
+        upload_time, doc_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(upload_time), int(doc_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def list_documents(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    uploaded_after: Optional[datetime] = None,
+    uploaded_before: Optional[datetime] = None,
+    filename_prefix: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    List documents newest first with keyset pagination on (upload_time, id).
+    Returns the page and the cursor of the next page, or None on the last page.
+    """
+    query = select(*DOCUMENT_LISTING_COLUMNS)
+
+    # Filters, each served by an index on the documents table
+    if category is not None:
+        query = query.where(Document.predicted_category == category)
+    if uploaded_after is not None:
+        query = query.where(Document.upload_time >= uploaded_after)
+    if uploaded_before is not None:
+        query = query.where(Document.upload_time < uploaded_before)
+    if filename_prefix:
+        escaped = filename_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.where(Document.filename.like(f"{escaped}%", escape="\\"))
+
+    # Continue after the last document of the previous page
+    if cursor is not None:
+        last_time, last_id = decode_cursor(cursor)
+        query = query.where(
+            or_(Document.upload_time < last_time, and_(Document.upload_time == last_time, Document.id < last_id))
+        )
+
+    query = query.order_by(Document.upload_time.desc(), Document.id.desc())
+    if limit:
+        query = query.limit(limit + 1)  # One extra row tells whether another page follows
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].upload_time, rows[-1].id)
+
+    return [dict(row._mapping) for row in rows], next_cursor
+
+
+async def similar_documents(db: AsyncSession, query: np.ndarray, k: int, exclude: Optional[int] = None) -> List[dict]:
+    """
+    The `k` documents closest to a query embedding, with their listing columns and cosine similarity.
+    A few extra neighbours are fetched, as documents deleted by other processes may still be indexed here.
+    """
+    with timed_stage("similarity_search"):
+        matches = await run_in_threadpool(vector_index.search, query, k + max(4, k // 4), exclude)
+    if not matches:
+        return []
+
+    rows = (
+        await db.execute(select(*DOCUMENT_LISTING_COLUMNS).where(Document.id.in_([doc_id for doc_id, _ in matches])))
+    ).all()
+    documents = {row.id: dict(row._mapping) for row in rows}
+    return [
+        {**documents[doc_id], "similarity": similarity} for doc_id, similarity in matches if doc_id in documents
+    ][:k]
+
+
+def read_tar_member(archive: tarfile.TarFile, member: tarfile.TarInfo, lock: threading.Lock) -> BinaryIO:
+    """Read a tar member into memory; tar files are not safe for concurrent reads."""
+    with lock:
+        return io.BytesIO(archive.extractfile(member).read())
+
+
+def expand_batch_uploads(uploads) -> List[tuple]:
+    """
+    Turn uploaded files into batch items of (filename, size, open function).
+    Zip and tar archives are expanded into their members; members are only read when processed.
+    """
+    items = []
+    for upload in uploads:
+        name = upload.filename.lower()
+
+        if name.endswith(ZIP_EXTENSIONS):
+            archive = zipfile.ZipFile(upload.file)
+            for info in archive.infolist():
+                if not info.is_dir():
+                    items.append((info.filename, info.file_size, lambda a=archive, i=info: io.BytesIO(a.read(i))))
+
+        elif name.endswith(TAR_EXTENSIONS):
+            archive, lock = tarfile.open(fileobj=upload.file, mode="r:*"), threading.Lock()
+            for member in archive.getmembers():
+                if member.isfile():
+                    items.append((member.name, member.size, partial(read_tar_member, archive, member, lock)))
+
+        else:
+            items.append((upload.filename, upload.size, lambda f=upload.file: f))
+
+    return items
+
+
+async def analyze_batch_item(semaphore: asyncio.Semaphore, item: tuple) -> tuple:
+    """Analyze one batch item, returning (filename, analysis, error)."""
+    filename, size, open_item = item
+    async with semaphore:
+        try:
+            # Check the declared size before reading archive members into memory
+            if size is not None and size > IngestConfig.MAX_UPLOAD_BYTES:
+                raise FileTooLarge(IngestConfig.MAX_UPLOAD_BYTES)
+            raw = await run_in_threadpool(open_item)
+            return filename, await analyze_file(os.path.basename(filename), raw, size), None
+        except HTTPException as e:
+            return filename, None, {"status_code": e.status_code, "detail": e.detail}
+        except Exception as e:
+            logging.error(f"Error processing batch item {filename}: {str(e)}")
+            return filename, None, {"status_code": 500, "detail": "Internal Server Error"}
+
+
+async def stream_batch_results(items: List[tuple]):
+    """
+    Process batch items concurrently and yield one NDJSON line per item as results become available.
+    Successful documents are inserted in groups of BATCH_INSERT_SIZE, each with a single bulk INSERT.
+    """
+    semaphore = asyncio.Semaphore(BatchConfig.BATCH_CONCURRENCY)
+    tasks = [asyncio.ensure_future(analyze_batch_item(semaphore, item)) for item in items]
+    pending: List[tuple] = []  # (path in batch, analysis) awaiting insertion
+
+    def line(filename: str, **fields) -> str:
+        return json.dumps(jsonable_encoder({"filename": filename, **fields})) + "\n"
+
+    async def flush(db: AsyncSession):
+        batch, pending[:] = list(pending), []
+        try:
+            documents = await persist_documents(db, [analysis for _, analysis in batch])
+        except Exception as e:
+            await db.rollback()
+            logging.error(f"Bulk insert of {len(batch)} documents failed: {str(e)}")
+            return [
+                line(name, status="error", status_code=500, detail="Database operation failed") for name, _ in batch
+            ]
+        return [line(name, status="ok", document=document) for (name, _), document in zip(batch, documents)]
+
+    try:
+        async with AsyncSessionLocal() as db:
+            for next_done in asyncio.as_completed(tasks):
+                filename, analysis, error = await next_done
+                if error is not None:
+                    yield line(filename, status="error", **error)  # Report failures immediately
+                    continue
+
+                pending.append((filename, analysis))
+                if len(pending) >= BatchConfig.BATCH_INSERT_SIZE:
+                    for result in await flush(db):
+                        yield result
+
+            if pending:
+                for result in await flush(db):
+                    yield result
+    finally:
+        for task in tasks:  # Stop remaining work if the client went away
+            task.cancel()
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+async def analyze_and_store(filename: str, raw: BinaryIO, size: Optional[int] = None) -> dict:
+    """Analyze one upload and store it in its own session, returning the stored document."""
+    analysis = await analyze_file(filename, raw, size)
+    report(
+        "classified", category=analysis["predicted_category"], scores=analysis["confidence_scores"],
+        tier=analysis["tier"], duplicate_of=analysis["duplicate_of"],
+    )
+    async with AsyncSessionLocal() as db:
+        return (await persist_documents(db, [analysis]))[0]
+
+
+async def stream_upload_events(filename: str, raw: BinaryIO, size: Optional[int] = None):
+    """
+    Process one upload and yield Server-Sent Events as its pipeline advances: `extracted` (word count),
+    `summarizing` and `summarized` for long documents, `embedding` (the first-tier answer), `chunk` for every
+    NLI chunk with the running category, `classified`, and finally `document` with the stored document,
+    or `error`. If the client goes away, inference stops at its next chunk and nothing is stored.
+    """
+    reporter = ProgressReporter()
+    token = progress_reporter.set(reporter)
+    try:
+        task = asyncio.ensure_future(analyze_and_store(filename, raw, size))  # Runs in a copy of this context
+    finally:
+        progress_reporter.reset(token)
+
+    next_event = None
+    try:
+        # Forward events until the pipeline is done; events of worker threads are queued before their results
+        while not task.done():
+            next_event = asyncio.ensure_future(reporter.events.get())
+            done, _ = await asyncio.wait({task, next_event}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event in done:
+                yield sse_event(*next_event.result())
+            else:
+                next_event.cancel()  # The event stays queued and is drained below
+        while not reporter.events.empty():
+            yield sse_event(*reporter.events.get_nowait())
+
+        try:
+            document = task.result()
+        except HTTPException as e:
+            yield sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+            return
+        except Exception as e:
+            logging.error(f"Error occurred during streamed upload of {filename}: {str(e)}")
+            yield sse_event("error", {"status_code": 500, "detail": "Internal Server Error"})
+            return
+        yield sse_event("document", document)
+
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+        if not task.done():  # The client disconnected
+            reporter.cancel()  # Inference threads stop at their next chunk or batch
+            task.cancel()
@@ -0,0 +1,208 @@
+# backend/stats.py
+#
+# Category statistics kept up to date in the transaction of every insert and delete, so the dashboard
+# reads O(categories × buckets) rows instead of scanning `documents`. Rebuild them from `documents` with:
+# python -m backend.stats rebuild [--batch-size 5000]
+
+
+# Standard Library Imports
+import asyncio
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Third-party Imports
+from sqlalchemy import delete, select, text  # Query construction
+from sqlalchemy.dialects import postgresql, sqlite  # INSERT ... ON CONFLICT support
+from sqlalchemy.ext.asyncio import AsyncSession  # Async session for SQLAlchemy
+from fastapi import APIRouter, Depends, Query  # FastAPI imports for API routing
+
+# Local Application/Library-Specific Imports
+from .models import CategoryStats, Document, UploadBucket
+from .database import AsyncSessionLocal, engine, get_db
+from .schemas import StatsResponse
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Initialize FastAPI Router
+router = APIRouter()
+
+
+GRANULARITIES = ("hour", "day")  # Upload buckets kept for every document
+
+
+def bucket_start(upload_time: datetime, granularity: str) -> datetime:
+    """Start of the hour or day an upload falls in."""
+    start = upload_time.replace(minute=0, second=0, microsecond=0)
+    return start.replace(hour=0) if granularity == "day" else start
+
+
+def upsert_adding(db: AsyncSession, model, keys: List[str], counters: List[str]):
+    """INSERT ... ON CONFLICT DO UPDATE that adds the inserted counters to an existing row."""
+    dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+    statement = dialect.insert(model)
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={counter: getattr(model, counter) + getattr(statement.excluded, counter) for counter in counters},
+    )
+
+
+class StatsDelta:
+    """
+    Changes to the statistics from a set of added or removed documents, combined per row, so a batch
+    costs two statements. Rows are written in key order, so concurrent transactions lock them in the
+    same order and cannot deadlock.
+    """
+
+    def __init__(self):
+        self.categories: Dict[str, List[float]] = {}  # Category -> [documents, confidence sum]
+        self.buckets: Dict[Tuple[str, datetime, str], int] = {}  # (granularity, start, category) -> documents
+
+    def add(self, category: str, confidence_scores: dict, upload_time: datetime, sign: int = 1):
+        totals = self.categories.setdefault(category, [0, 0.0])
+        totals[0] += sign
+        totals[1] += sign * float(confidence_scores.get(category, 0.0))  # Confidence of the predicted category
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(upload_time, granularity), category)
+            self.buckets[key] = self.buckets.get(key, 0) + sign
+
+    async def apply(self, db: AsyncSession):
+        """Write the changes in the caller's transaction."""
+        if self.categories:
+            await db.execute(
+                upsert_adding(db, CategoryStats, ["category"], ["documents", "confidence_sum"]),
+                [
+                    {"category": category, "documents": int(documents), "confidence_sum": confidence_sum}
+                    for category, (documents, confidence_sum) in sorted(self.categories.items())
+                ],
+            )
+        if self.buckets:
+            await db.execute(
+                upsert_adding(db, UploadBucket, ["granularity", "bucket_start", "category"], ["documents"]),
+                [
+                    {"granularity": granularity, "bucket_start": start, "category": category, "documents": documents}
+                    for (granularity, start, category), documents in sorted(self.buckets.items())
+                ],
+            )
+
+
+async def record_documents(db: AsyncSession, documents: Iterable[dict], removed: bool = False):
+    """
+    Count stored (or, with `removed`, deleted) documents in the statistics, in the caller's transaction.
+    Every document needs `predicted_category`, `confidence_scores` and `upload_time`.
+    """
+    delta = StatsDelta()
+    for document in documents:
+        delta.add(
+            document["predicted_category"], document["confidence_scores"], document["upload_time"],
+            sign=-1 if removed else 1,
+        )
+    await delta.apply(db)
+
+
+async def load_stats(db: AsyncSession, granularity: str = "day", since: Optional[datetime] = None,
+                     until: Optional[datetime] = None) -> dict:
+    """Documents and mean confidence per category, and uploads per category in every bucket of the range."""
+    categories = (
+        await db.execute(select(CategoryStats).where(CategoryStats.documents > 0).order_by(CategoryStats.category))
+    ).scalars().all()
+
+    query = select(UploadBucket.bucket_start, UploadBucket.category, UploadBucket.documents).where(
+        UploadBucket.granularity == granularity, UploadBucket.documents > 0
+    )
+    if since is not None:
+        query = query.where(UploadBucket.bucket_start >= bucket_start(since, granularity))
+    if until is not None:
+        query = query.where(UploadBucket.bucket_start < until)
+
+    uploads: Dict[datetime, Dict[str, int]] = {}
+    for row in (await db.execute(query.order_by(UploadBucket.bucket_start, UploadBucket.category))).all():
+        uploads.setdefault(row.bucket_start, {})[row.category] = row.documents
+
+    return {
+        "total_documents": sum(stats.documents for stats in categories),
+        "categories": [
+            {
+                "category": stats.category,
+                "documents": stats.documents,
+                "mean_confidence": stats.confidence_sum / stats.documents,
+            }
+            for stats in categories
+        ],
+        "granularity": granularity,
+        "uploads": [
+            {"bucket_start": start, "documents": sum(counts.values()), "categories": counts}
+            for start, counts in uploads.items()
+        ],
+    }
+
+
+@router.get("/stats/", response_model=StatsResponse, summary="Category and upload statistics")
+async def stats(
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Endpoint reporting the number of documents and mean confidence of every category, and uploads per
+    category in hourly or daily buckets (optionally between `since` and `until`), from the summary tables.
+    """
+    return await load_stats(db, granularity, since, until)
+
+
+async def rebuild(batch_size: int):
+    """
+    Recompute the statistics from the documents table. On Postgres the summary tables are locked first,
+    so uploads committing meanwhile wait and then add their own changes on top of the rebuilt rows.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(CategoryStats.__table__.create, checkfirst=True)
+        await conn.run_sync(UploadBucket.__table__.create, checkfirst=True)
+
+    async with AsyncSessionLocal() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            await db.execute(text("LOCK TABLE category_stats, upload_buckets IN EXCLUSIVE MODE"))
+        await db.execute(delete(CategoryStats))
+        await db.execute(delete(UploadBucket))
+
+        delta, last_id, counted = StatsDelta(), 0, 0
+        while True:
+            rows = (
+                await db.execute(
+                    select(Document.id, Document.predicted_category, Document.confidence_scores, Document.upload_time)
+                    .where(Document.id > last_id)
+                    .order_by(Document.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                delta.add(row.predicted_category, row.confidence_scores, row.upload_time)
+            last_id, counted = rows[-1].id, counted + len(rows)
+            logger.info(f"Counted {counted} documents")
+
+        await delta.apply(db)
+        await db.commit()
+    print(f"Rebuilt statistics of {counted} documents in {len(delta.categories)} categories")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the category statistics tables.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = commands.add_parser("rebuild", help="Recompute the statistics from the documents table")
+    rebuild_parser.add_argument("--batch-size", type=int, default=5000, help="Documents read per query")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(rebuild(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
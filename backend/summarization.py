@@ -0,0 +1,182 @@
+# backend/summarization.py
+
+
+# Standard Library Imports
+import os
+import time
+import logging
+from typing import List, Tuple
+
+# Third-party Imports
+import torch
+from nltk.tokenize import sent_tokenize  # Sentence tokenization
+
+# Local Application/Library-Specific Imports
+from .pipeline import TokenizedDocument, pad_batch, sentence_spans
+from .batching import MicroBatcher
+from .model_registry import model_registry
+from .timing import timed_stage
+from .exceptions import UploadCancelled
+from .progress import check_cancelled, report, wait_in_order
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch summarization settings from environment variables
+class SummaryConfig:
+    SUMMARY_MODE = os.getenv("SUMMARY_MODE", "abstractive").lower()  # "abstractive" (BART) or "extractive" (MiniLM)
+    SUMMARY_BATCHING = os.getenv("SUMMARY_BATCHING", "true").lower() == "true"  # Share generate() calls
+    SUMMARY_MAX_BATCH_SIZE = int(os.getenv("SUMMARY_MAX_BATCH_SIZE", "8"))  # Chunks per generate() call
+    SUMMARY_MAX_WAIT_MS = float(os.getenv("SUMMARY_MAX_WAIT_MS", "20"))  # Time to wait for a batch to fill up
+    SUMMARY_EXTRACTIVE_WORDS = int(os.getenv("SUMMARY_EXTRACTIVE_WORDS", "1000"))  # Words kept by extractive mode
+
+
+SUMMARY_MAX_LENGTH = 500  # Maximum length for each summarization chunk
+SUMMARY_MIN_LENGTH = 100  # Minimum length for meaningful summaries
+SUMMARY_CHUNK_SENTENCES = 10  # Sentences per summarized chunk
+EXTRACTIVE_WINDOW_WORDS = 30  # Pseudo-sentence size for text without sentence boundaries
+
+
+def summary_chunks(text: str) -> List[Tuple[int, ...]]:
+    """
+    Token ids of every chunk of sentences, tokenized once for the whole text. Chunks longer than the
+    summarizer's input limit are split by tokens, so that no chunk is silently truncated or rejected.
+    """
+    tokenizer = model_registry.get("summarizer").tokenizer
+    max_tokens = min(tokenizer.model_max_length, 1024) - tokenizer.num_special_tokens_to_add()
+    document = TokenizedDocument(text, tokenizer=tokenizer)
+    spans = sentence_spans(text, max_sentences=SUMMARY_CHUNK_SENTENCES)
+    return [chunk.ids for chunk in document.span_chunks(spans, max_tokens, split=True)]
+
+
+def generate_summaries(chunks: List[Tuple[int, ...]]) -> List[str]:
+    """
+    Summarize pre-tokenized chunks with BART in one padded generate() call.
+    Chunks are sorted by length so that similarly sized inputs share padding.
+    """
+    summarizer = model_registry.get("summarizer")
+    tokenizer = summarizer.tokenizer
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+    inputs = pad_batch(tokenizer, [tokenizer.build_inputs_with_special_tokens(list(chunks[i])) for i in order])
+
+    with torch.inference_mode():
+        device = summarizer.model.device
+        output_ids = summarizer.model.generate(
+            **{name: tensor.to(device) for name, tensor in inputs.items()},
+            max_length=SUMMARY_MAX_LENGTH,
+            min_length=SUMMARY_MIN_LENGTH,
+            do_sample=False,
+        )
+    texts = tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+    # Restore the submission order
+    summaries = [""] * len(chunks)
+    for position, idx in enumerate(order):
+        summaries[idx] = texts[position].strip()
+    return summaries
+
+
+# Shared batcher collecting summary chunks from all in-flight requests
+summary_batcher = MicroBatcher(
+    generate_summaries,
+    max_batch_size=SummaryConfig.SUMMARY_MAX_BATCH_SIZE,
+    max_wait=SummaryConfig.SUMMARY_MAX_WAIT_MS / 1000,
+    name="summary-batcher",
+)
+
+
+def summarize_chunk(chunk: Tuple[int, ...]) -> str:
+    """
+    Summarize a single chunk, unless its streamed upload has been abandoned.
+    A chunk that fails is dropped (empty summary), so it does not cost the document its other chunks.
+    """
+    check_cancelled()
+    try:
+        return generate_summaries([chunk])[0]
+    except Exception as e:
+        logger.error(f"Summarization failed for a chunk of {len(chunk)} tokens: {e}")
+        return ""
+
+
+def abstractive_summary(text: str) -> str:
+    """
+    Summarize every chunk of the text with BART, batched with the chunks of concurrent documents.
+    Every summarized chunk is reported to a streamed upload; chunks that fail are left out of the summary.
+    """
+    chunks = summary_chunks(text)
+    report("summarizing", done=0, chunks=len(chunks))
+    if SummaryConfig.SUMMARY_BATCHING:
+        # Chunks of an abandoned upload are dropped; failed batches come back as exceptions
+        results = wait_in_order(summary_batcher.submit_many(chunks), return_exceptions=True)
+    else:
+        results = map(summarize_chunk, chunks)  # Lazily, one generate() call per chunk
+
+    summaries = []
+    for chunk, summary in zip(chunks, results):
+        if isinstance(summary, Exception):  # The batch may have failed on another chunk; retry this one alone
+            summary = summarize_chunk(chunk)
+        summaries.append(summary)
+        report("summarizing", done=len(summaries), chunks=len(chunks))
+    return " ".join(summary for summary in summaries if summary)
+
+
+def extractive_summary(text: str, max_words: int = SummaryConfig.SUMMARY_EXTRACTIVE_WORDS) -> str:
+    """
+    Keep the sentences closest to the document's MiniLM centroid, in document order, up to `max_words`.
+    Much cheaper than BART, and enough for classification, which only needs the dominant topic.
+    """
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+
+    sentences = sent_tokenize(text)
+    if len(sentences) <= 1:  # Preprocessed text has no punctuation left; use fixed word windows instead
+        sentences = [
+            " ".join(words[i:i + EXTRACTIVE_WINDOW_WORDS]) for i in range(0, len(words), EXTRACTIVE_WINDOW_WORDS)
+        ]
+
+    embeddings = model_registry.get("embedding_model").encode(
+        sentences, convert_to_tensor=True, normalize_embeddings=True
+    )
+    centroid = torch.nn.functional.normalize(embeddings.mean(dim=0), dim=0)
+    ranking = torch.argsort(embeddings @ centroid, descending=True).tolist()
+
+    # Take the most central sentences until the word budget is used up
+    selected, word_count = [], 0
+    for idx in ranking:
+        length = len(sentences[idx].split())
+        if word_count + length > max_words and selected:
+            continue
+        selected.append(idx)
+        word_count += length
+        if word_count >= max_words:
+            break
+
+    return " ".join(sentences[idx] for idx in sorted(selected))
+
+
+def summarize_large_text(text: str) -> str:
+    """
+    Shorten large text before classification, with BART (abstractive) or MiniLM (extractive)
+    as configured by SUMMARY_MODE.
+    """
+    mode = SummaryConfig.SUMMARY_MODE
+    started = time.perf_counter()
+    with timed_stage(f"summarize_{mode}"):
+        try:
+            summary = extractive_summary(text) if mode == "extractive" else abstractive_summary(text)
+        except UploadCancelled:
+            raise  # Nothing to fall back to for an abandoned upload
+        except Exception as e:
+            logger.error(f"Summarization failed: {e}")
+            summary = ""
+
+    logger.info(
+        f"Summarized {len(text.split())} words to {len(summary.split())} ({mode}) "
+        f"in {time.perf_counter() - started:.2f} seconds"
+    )
+    summary = summary or text[:2000]  # Use the summary or a fallback if empty
+    report("summarized", mode=mode, words=len(text.split()), summary_words=len(summary.split()))
+    return summary
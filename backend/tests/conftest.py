@@ -0,0 +1,40 @@
+# tests/conftest.py
+
+
+# Standard Library Imports
+import os
+import asyncio
+
+# Run the module engine on an in-memory SQLite database, before any test imports backend.database
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Third-party Imports
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Local Application/Library-Specific Imports
+from backend.models import Base
+
+
+@pytest.fixture
+def db_engine(request, tmp_path):
+    """
+    Engine of a fresh SQLite database with the application schema. Engine options can be passed with
+    indirect parametrization, e.g. to test a pool configuration.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", **getattr(request, "param", {}))
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def db_session(db_engine):
+    """Session factory of the test database; objects stay loaded after a commit."""
+    return sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
@@ -0,0 +1,174 @@
+# tests/test_batch_upload.py
+
+
+# Standard Library Imports
+import io
+import json
+import asyncio
+import tarfile
+import zipfile
+
+# Third-party Imports
+import pytest
+from sqlalchemy import select
+from fastapi.testclient import TestClient
+
+# Local Application/Library-Specific Imports
+import backend.services as services
+from backend.main import app
+from backend.models import Document
+from backend.cache import CacheConfig
+from backend.dedup import DedupConfig
+from backend.extractors import IngestConfig
+from backend.vector_index import SimilarityConfig
+
+
+def zip_archive(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def tar_archive(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def fake_classify(text: str, words: list = None):
+    """Category taken from the first word of the text, so results can be told apart."""
+    return text.split()[0], {text.split()[0]: 0.9, "Other": 0.1}, "nli"
+
+
+@pytest.fixture
+def Session(db_session, monkeypatch):
+    """Session factory of the test database used by the upload pipeline, with the models stubbed out."""
+    monkeypatch.setattr(services, "AsyncSessionLocal", db_session)
+    monkeypatch.setattr(services, "classify_text_with_tier", fake_classify)
+    monkeypatch.setattr(CacheConfig, "CACHE_ENABLED", False)
+    monkeypatch.setattr(DedupConfig, "DEDUP_ENABLED", False)
+    monkeypatch.setattr(SimilarityConfig, "SIMILARITY_ENABLED", False)
+    return db_session
+
+
+def upload_batch(files: list) -> list:
+    response = TestClient(app).post("/upload/batch/", files=[("files", file) for file in files])
+    assert response.status_code == 200 and response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def stored_documents(Session) -> dict:
+    async def load():
+        async with Session() as db:
+            return (await db.execute(select(Document.id, Document.filename, Document.predicted_category))).all()
+
+    return {row.id: (row.filename, row.predicted_category) for row in asyncio.run(load())}
+
+
+class TestBatchUpload:
+
+    # Test that plain files and zip/tar members are all classified, with one error line for the bad member
+    def test_mixed_batch(self, Session):
+        lines = upload_batch([
+            ("a.txt", b"Invoice for march", "text/plain"),
+            ("docs.zip", zip_archive({"b.txt": b"Contract between parties", "tool.exe": b"MZ"}), "application/zip"),
+            ("more.tar.gz", tar_archive({"c.txt": b"Report on sales"}), "application/gzip"),
+        ])
+
+        results = {line["filename"]: line for line in lines}
+        assert sorted(results) == ["a.txt", "b.txt", "c.txt", "tool.exe"]
+        assert results["tool.exe"]["status"] == "error" and results["tool.exe"]["status_code"] == 400
+        assert {name: results[name]["document"]["predicted_category"] for name in ("a.txt", "b.txt", "c.txt")} == {
+            "a.txt": "Invoice", "b.txt": "Contract", "c.txt": "Report",
+        }
+        assert sorted(filename for filename, _ in stored_documents(Session).values()) == ["a.txt", "b.txt", "c.txt"]
+
+    # Test that an archive member over the size limit is rejected from its declared size
+    def test_oversized_member(self, Session, monkeypatch):
+        monkeypatch.setattr(IngestConfig, "MAX_UPLOAD_BYTES", 100)
+        lines = upload_batch([
+            ("docs.zip", zip_archive({"small.txt": b"Memo about lunch", "big.txt": b"Manual " * 100}), "application/zip"),
+        ])
+
+        results = {line["filename"]: line for line in lines}
+        assert results["big.txt"]["status_code"] == 413
+        assert results["small.txt"]["status"] == "ok"
+
+    # Test that documents inserted in several bulk INSERT ... RETURNING groups get their own ids back
+    def test_chunked_insert_order(self, Session, monkeypatch):
+        monkeypatch.setattr(services.BatchConfig, "BATCH_INSERT_SIZE", 2)
+        files = [(f"{i}.txt", f"Category{i} text".encode(), "text/plain") for i in range(5)]
+        lines = upload_batch(files)
+
+        stored = stored_documents(Session)
+        assert len(lines) == len(stored) == 5
+        for line in lines:
+            document = line["document"]
+            assert stored[document["id"]] == (line["filename"], document["predicted_category"])
+            assert document["predicted_category"] == f"Category{line['filename'].split('.')[0]}"
+
+    # Test that an upload is preprocessed once, for both its near-duplicate signature and its classification
+    def test_preprocessed_once(self, Session, monkeypatch):
+        calls = []
+
+        def preprocess_words(text):
+            calls.append(text)
+            return text.lower().split()
+
+        def classify(text, words=None):
+            assert words == ["contract", "between", "parties"]
+            return fake_classify(text)
+
+        async def find_duplicate(signature):
+            return None
+
+        monkeypatch.setattr(DedupConfig, "DEDUP_ENABLED", True)
+        monkeypatch.setattr(DedupConfig, "DEDUP_MIN_WORDS", 1)
+        monkeypatch.setattr(services, "preprocess_words", preprocess_words)
+        monkeypatch.setattr(services, "classify_text_with_tier", classify)
+        monkeypatch.setattr(services, "find_duplicate", find_duplicate)
+
+        analysis = asyncio.run(services.analyze_file("a.txt", io.BytesIO(b"Contract between parties")))
+        assert analysis["predicted_category"] == "Contract" and analysis["signature"] is not None
+        assert calls == ["Contract between parties"]
+
+    # Test that a corrupted archive fails the whole request
+    def test_corrupted_archive(self, Session):
+        response = TestClient(app).post("/upload/batch/", files=[("files", ("bad.zip", b"not a zip", "application/zip"))])
+        assert response.status_code == 400
+
+    # Test that items still running are cancelled when the client stops reading the results
+    def test_disconnect_cancels_remaining(self, Session, monkeypatch):
+        started, cancelled = [], []
+
+        async def analyze_file(filename, raw, size=None):
+            if filename.startswith("slow"):
+                started.append(filename)
+                try:
+                    await asyncio.sleep(30)
+                except asyncio.CancelledError:
+                    cancelled.append(filename)
+                    raise
+            raise services.InvalidFileType()  # Fast items report an error line without touching the database
+
+        monkeypatch.setattr(services, "analyze_file", analyze_file)
+        monkeypatch.setattr(services.BatchConfig, "BATCH_CONCURRENCY", 3)
+        items = [(name, 1, lambda: io.BytesIO(b"x")) for name in ("fast.exe", "slow1.txt", "slow2.txt")]
+
+        async def scenario():
+            results = services.stream_batch_results(items)
+            first = await results.__anext__()
+            while len(started) < 2:  # Both slow items are being processed
+                await asyncio.sleep(0.01)
+            await results.aclose()  # The client went away
+            await asyncio.sleep(0.01)
+            return json.loads(first)
+
+        assert asyncio.run(scenario())["filename"] == "fast.exe"
+        assert sorted(cancelled) == ["slow1.txt", "slow2.txt"]
@@ -0,0 +1,56 @@
+# tests/test_batching.py
+
+
+# Standard Library Imports
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party Imports
+import pytest
+
+# Local Application/Library-Specific Imports
+from backend.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+
+    # Test that concurrent submissions are grouped and results scattered back in order
+    def test_batches_across_callers(self):
+        batch_sizes = []
+
+        def process(items):
+            batch_sizes.append(len(items))
+            return [item * 10 for item in items]
+
+        batcher = MicroBatcher(process, max_batch_size=8, max_wait=0.1)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda start: batcher.map([start, start + 1]), [0, 10, 20, 30]))
+
+        assert results == [[0, 10], [100, 110], [200, 210], [300, 310]]
+        assert max(batch_sizes) <= 8
+        assert len(batch_sizes) < 8  # At least some pairs shared a batch
+
+    # Test that a failing batch propagates the error to every caller
+    def test_batch_error_propagates(self):
+        def process(items):
+            raise ValueError("model failure")
+
+        batcher = MicroBatcher(process, max_batch_size=4, max_wait=0.01)
+
+        with pytest.raises(ValueError):
+            batcher.map([1, 2])
+
+    # Test that items whose futures were cancelled before batching are never processed
+    def test_cancelled_items_skipped(self):
+        processed = []
+
+        def process(items):
+            processed.extend(items)
+            return items
+
+        batcher = MicroBatcher(process, max_batch_size=8, max_wait=0.05)
+        futures = batcher.submit_many([1, 2, 3])
+        futures[1].cancel()
+
+        assert futures[0].result(timeout=5) == 1 and futures[2].result(timeout=5) == 3
+        assert processed == [1, 3]
@@ -0,0 +1,48 @@
+# tests/test_benchmarks.py
+
+
+# Local Application/Library-Specific Imports
+from backend.utils import extract_text_from_file
+from backend.benchmarks.compare import compare
+from backend.benchmarks.corpus import generate_corpus, load_manifest
+from backend.benchmarks.report import latency_summary, percentile
+
+
+class TestBenchmarks:
+
+    # Test that the same seed writes the same texts, and that every format extracts back to them
+    def test_corpus_reproducible(self, tmp_path):
+        first = generate_corpus(str(tmp_path / "a"), sizes=(50, 300), per_size=1, seed=3)
+        second = generate_corpus(str(tmp_path / "b"), sizes=(50, 300), per_size=1, seed=3)
+        assert first == second
+        assert {document["extension"] for document in first} == {".txt", ".pdf", ".docx"}
+
+        for document in load_manifest(str(tmp_path / "a")):
+            text = extract_text_from_file(document["path"], document["extension"])
+            assert len(text.split()) == document["words"]
+        with open(tmp_path / "a" / "doc_300w_0.txt", encoding="utf-8") as f, \
+                open(tmp_path / "b" / "doc_300w_0.txt", encoding="utf-8") as g:
+            assert f.read() == g.read()
+
+    # Test nearest-rank percentiles and the throughput of sequential and concurrent runs
+    def test_latency_summary(self):
+        seconds = [i / 1000 for i in range(1, 101)]  # 1 ms to 100 ms
+        assert percentile(sorted(seconds), 0.95) == 0.095
+
+        summary = latency_summary(seconds)
+        assert summary["documents"] == 100
+        assert round(summary["p50_ms"], 6) == 50.0
+        assert round(summary["p99_ms"], 6) == 99.0
+        assert round(summary["docs_per_sec"], 3) == round(100 / sum(seconds), 3)
+        assert latency_summary(seconds, wall_seconds=2.0)["docs_per_sec"] == 50.0
+
+    # Test that reports are compared stage by stage, with per-format extraction rows
+    def test_compare_reports(self):
+        def report(docs_per_sec):
+            summary = {"docs_per_sec": docs_per_sec, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0}
+            return {"benchmark": "stages", "stages": {"extract": {"by_format": {"pdf": summary}}, "classify": summary}}
+
+        rows = compare(report(10.0), report(20.0))
+        assert set(rows) == {"extract_pdf", "classify"}
+        assert rows["classify"]["docs_per_sec"]["ratio"] == 2.0
+        assert rows["extract_pdf"]["p95_ms"]["ratio"] == 1.0
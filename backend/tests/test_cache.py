@@ -0,0 +1,42 @@
+# tests/test_cache.py
+
+
+# Standard Library Imports
+import time
+
+# Local Application/Library-Specific Imports
+from backend.cache import LRUCache, cache_key, settings_fingerprint
+
+
+class TestCache:
+
+    # Test that the least recently used entry is evicted first
+    def test_lru_eviction(self):
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" becomes the least recently used entry
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert (cache.hits, cache.misses) == (3, 1)
+
+    # Test that entries expire after their time-to-live
+    def test_ttl_expiry(self):
+        cache = LRUCache(max_entries=2, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    # Test that changing a model setting changes every cache key
+    def test_fingerprint_invalidates_keys(self):
+        before = settings_fingerprint(categories=["A", "B"], confidence_threshold=0.25)
+        after = settings_fingerprint(categories=["A", "B"], confidence_threshold=0.3)
+
+        assert before != after
+        assert cache_key(before, "file", "abc") != cache_key(after, "file", "abc")
+        assert cache_key(before, "file", "abc") != cache_key(before, "text", "abc")
@@ -0,0 +1,101 @@
+# tests/test_classifier_head.py
+
+
+# Standard Library Imports
+import json
+from argparse import Namespace
+
+# Third-party Imports
+import numpy as np
+import pytest
+
+# Local Application/Library-Specific Imports
+import backend.ml_model as ml_model
+import backend.classifier_head as classifier_head
+from backend.classifier_head import ClassifierHead, THRESHOLD_GRID, in_holdout
+
+
+CATEGORIES = ["Legal Document", "Academic Paper", "Other"]
+
+
+def make_dataset(rows_per_category: int = 30, seed: int = 0):
+    """Gaussian clusters standing in for MiniLM embeddings, one per category."""
+    rng = np.random.default_rng(seed)
+    centers = np.eye(len(CATEGORIES), 8) * 3
+    embeddings = np.vstack([rng.normal(center, 1.0, (rows_per_category, 8)) for center in centers])
+    labels = [category for category in CATEGORIES for _ in range(rows_per_category)]
+    return embeddings, labels
+
+
+class TestClassifierHead:
+
+    # Test that the head learns the clusters and calibrates a threshold per category
+    def test_fit_and_predict(self):
+        embeddings, labels = make_dataset()
+        head = ClassifierHead(CATEGORIES + ["Business Proposal"], "test-model").fit(embeddings, labels)
+
+        accuracy = np.mean(np.asarray(head.predict(embeddings)) == np.asarray(labels))
+        assert accuracy > 0.9
+        assert all(head.thresholds[category] in THRESHOLD_GRID for category in ["Legal Document", "Academic Paper"])
+
+        # Categories absent from training get zero probability
+        scores = head.scores(embeddings[0])[0]
+        assert scores["Business Proposal"] == 0.0
+        assert abs(sum(scores.values()) - 1.0) < 1e-6
+
+    # Test that predictions below the category threshold fall back to "Other"
+    def test_threshold_fallback(self):
+        head = ClassifierHead(CATEGORIES, "test-model").fit(*make_dataset())
+        head.thresholds["Legal Document"] = 1.01  # Unreachable
+
+        assert head.decide({"Legal Document": 0.9, "Other": 0.1}) == ("Legal Document", False)
+        assert "Legal Document" not in head.predict(make_dataset(5, seed=1)[0])
+
+    # Test that a saved head loads with its thresholds
+    def test_save_and_load(self, tmp_path):
+        head = ClassifierHead(CATEGORIES, "test-model").fit(*make_dataset())
+        path = tmp_path / "head.joblib"
+        head.save(str(path))
+
+        loaded = ClassifierHead.load(str(path))
+        assert loaded.thresholds == head.thresholds
+        assert loaded.embedding_model == "test-model"
+
+    # Test that the held-out split is stable, close to the requested fraction and independent of row order
+    def test_holdout_split(self):
+        texts = [f"document number {i}" for i in range(2000)]
+        held_out = [text for text in texts if in_holdout(text, 0.2)]
+        assert 0.17 < len(held_out) / len(texts) < 0.23
+        assert [text for text in reversed(texts) if in_holdout(text, 0.2)] == held_out[::-1]
+        assert not any(in_holdout(text, 0.0) for text in texts)
+
+    # Test that evaluating on the training data only scores held-out rows, and is refused without any
+    def test_evaluate_skips_training_rows(self, tmp_path, monkeypatch):
+        embeddings, labels = make_dataset(40)
+        texts = [f"{label} text {i}" for i, label in enumerate(labels)]
+        data = tmp_path / "labelled.jsonl"
+        data.write_text("".join(json.dumps({"text": t, "label": l}) + "\n" for t, l in zip(texts, labels)))
+        vectors = dict(zip(texts, embeddings))
+        monkeypatch.setattr(ml_model, "embed_texts", lambda batch: np.stack([vectors[text] for text in batch]))
+        scored = []
+        monkeypatch.setattr(classifier_head, "classification_report", lambda truth, *args, **kwargs: scored.append(truth) or "")
+
+        def train(holdout):
+            path = str(tmp_path / f"head_{holdout}.joblib")
+            classifier_head.train(Namespace(data=str(data), limit=None, holdout=holdout, C=4.0, output=path))
+            return path
+
+        def evaluate(head, data_path=str(data)):
+            classifier_head.evaluate(Namespace(data=data_path, limit=None, head=head))
+            return scored[-1]  # Labels of the scored documents
+
+        head = train(0.25)
+        assert ClassifierHead.load(head).metadata["rows"] == sum(not in_holdout(text, 0.25) for text in texts)
+        assert len(evaluate(head)) == sum(in_holdout(text, 0.25) for text in texts)
+
+        other = tmp_path / "other.jsonl"  # Data the head was not trained on is scored whole
+        other.write_text(data.read_text())
+        assert len(evaluate(head, str(other))) == len(texts)
+
+        with pytest.raises(SystemExit):
+            evaluate(train(0.0))
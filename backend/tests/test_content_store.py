@@ -0,0 +1,97 @@
+# tests/test_content_store.py
+
+
+# Standard Library Imports
+import asyncio
+
+# Third-party Imports
+import pytest
+from sqlalchemy import func, select  # Row counts
+from sqlalchemy.dialects import postgresql
+
+# Local Application/Library-Specific Imports
+from backend.models import Document, DocumentContent
+from backend.content_store import compress, decompress, delete_unreferenced, load_content, store_contents
+
+
+def run_with_session(Session, scenario):
+    """Run `scenario(db)` in a session of the test database."""
+    async def run():
+        async with Session() as db:
+            return await scenario(db)
+
+    return asyncio.run(run())
+
+
+class TestContentStore:
+
+    # Test that every encoding restores the original text, and zlib actually shrinks repetitive text
+    def test_round_trip(self):
+        content = "Quarterly revenue grew by 12% — ünïcode included. " * 50
+        for encoding in ("zlib", "none"):
+            stored_encoding, data = compress(content, encoding)
+            assert stored_encoding == encoding
+            assert decompress(stored_encoding, data) == content
+        assert len(compress(content, "zlib")[1]) < len(content.encode("utf-8")) / 5
+
+        with pytest.raises(ValueError):
+            compress(content, "lz4")
+
+    # Test that identical texts are stored once, within a batch and across batches
+    def test_deduplication(self, db_session):
+        async def scenario(db):
+            first = await store_contents(db, ["alpha text", "beta text", "alpha text"])
+            second = await store_contents(db, ["beta text", "gamma text"])
+            await db.commit()
+            count = (await db.execute(select(func.count()).select_from(DocumentContent))).scalar()
+            return first, second, count, await load_content(db, first[1])
+
+        first, second, count, beta = run_with_session(db_session, scenario)
+        assert first[0] == first[2] and first[1] == second[0]
+        assert count == 3
+        assert beta == "beta text"
+
+    # Test that a shared text is only deleted with the last document referring to it
+    def test_delete_unreferenced(self, db_session):
+        async def scenario(db):
+            digest = (await store_contents(db, ["shared text"]))[0]
+            db.add_all([
+                Document(filename=name, content_hash=digest, predicted_category="Other", confidence_scores={})
+                for name in ("a.txt", "b.txt")
+            ])
+            await db.commit()
+
+            await db.execute(Document.__table__.delete().where(Document.filename == "a.txt"))
+            await delete_unreferenced(db, digest)
+            kept = await load_content(db, digest)
+
+            await db.execute(Document.__table__.delete().where(Document.filename == "b.txt"))
+            await delete_unreferenced(db, digest)
+            return kept, await load_content(db, digest)
+
+        kept, removed = run_with_session(db_session, scenario)
+        assert kept == "shared text"
+        assert removed is None
+
+    # Test that both sides lock the text row on Postgres, so a delete cannot race an upload reusing the text
+    def test_content_row_locks(self, db_session):
+        async def scenario(db):
+            statements, execute = [], db.execute
+
+            async def recording_execute(statement, *args, **kwargs):
+                if statement.is_select:  # The INSERT is built for SQLite's ON CONFLICT syntax
+                    statements.append(str(statement.compile(dialect=postgresql.dialect())))
+                return await execute(statement, *args, **kwargs)
+
+            db.execute = recording_execute
+            digest = (await store_contents(db, ["shared text"]))[0]
+            await store_contents(db, ["shared text"])
+            await delete_unreferenced(db, digest)
+            return statements
+
+        statements = run_with_session(db_session, scenario)
+        lookups = [statement for statement in statements if statement.startswith("SELECT document_contents")]
+        assert len(lookups) == 3
+        assert lookups[0].endswith("FOR KEY SHARE") and lookups[1].endswith("FOR KEY SHARE")
+        assert lookups[2].endswith("FOR UPDATE")
+        assert statements[-1].startswith("SELECT EXISTS")  # References counted after the lock
@@ -0,0 +1,59 @@
+# tests/test_database.py
+
+
+# Standard Library Imports
+import asyncio
+
+# Third-party Imports
+import pytest
+from sqlalchemy import text  # Raw test query
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+# Local Application/Library-Specific Imports
+from backend import database
+from backend.database import EngineConfig, TimedQueuePool, engine_options, pool_stats
+
+
+class TestDatabase:
+
+    # Test that Postgres gets the tuned pool and the prepared statement cache, without SQL echo by default
+    def test_postgres_options(self, monkeypatch):
+        monkeypatch.setattr(EngineConfig, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(EngineConfig, "DB_STATEMENT_CACHE_SIZE", 250)
+        options = engine_options("postgresql+asyncpg://user:secret@db:5432/smart")
+
+        assert options["echo"] is False
+        assert options["poolclass"] is TimedQueuePool
+        assert options["pool_size"] == 7
+        assert options["connect_args"] == {"prepared_statement_cache_size": 250}
+
+    # Test that in-memory SQLite keeps its own pool and gets no asyncpg arguments
+    def test_sqlite_memory_options(self):
+        options = engine_options("sqlite+aiosqlite:///:memory:")
+        assert "poolclass" not in options and "connect_args" not in options
+
+    # Test that checkouts and their waits are counted, and pool timeouts are reported separately
+    @pytest.mark.parametrize(
+        "db_engine", [{"poolclass": TimedQueuePool, "pool_size": 1, "max_overflow": 0, "pool_timeout": 0.1}],
+        indirect=True,
+    )
+    def test_pool_checkouts_and_timeouts(self, db_engine):
+        checkouts, timeouts = pool_stats.checkouts, pool_stats.timeouts
+
+        async def scenario():
+            async with db_engine.connect() as first:
+                await first.execute(text("SELECT 1"))
+                with pytest.raises(PoolTimeout):  # The only connection is in use
+                    async with db_engine.connect():
+                        pass
+
+        asyncio.run(scenario())
+        assert pool_stats.checkouts == checkouts + 1
+        assert pool_stats.timeouts == timeouts + 1
+        assert pool_stats.wait_histogram.snapshot()["checkout"]["count"] >= 2
+
+    # Test that schema creation is skipped on request
+    def test_skip_schema_init(self, monkeypatch):
+        monkeypatch.setattr(EngineConfig, "SKIP_SCHEMA_INIT", True)
+        monkeypatch.setattr(database, "engine", None)  # Any use of the engine would fail
+        asyncio.run(database.init_db())
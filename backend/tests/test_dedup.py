@@ -0,0 +1,84 @@
+# tests/test_dedup.py
+
+
+# Standard Library Imports
+import random
+
+# Third-party Imports
+import numpy as np
+import pytest
+
+# Local Application/Library-Specific Imports
+from backend.dedup import (
+    LSHIndex, decode_signature, encode_signature, estimated_jaccard, minhash, shingles,
+)
+
+
+def random_words(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(5000)]
+    return [rng.choice(vocabulary) for _ in range(count)]
+
+
+def revise(words: list, edits: int, seed: int) -> list:
+    """Replace `edits` words at random positions, like a lightly revised document."""
+    rng = random.Random(seed)
+    words = list(words)
+    for position in rng.sample(range(len(words)), edits):
+        words[position] = f"edit{rng.randrange(10 ** 6)}"
+    return words
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b)
+
+
+class TestDedup:
+
+    # Test that shingles are runs of consecutive words and short texts form a single shingle
+    def test_shingles(self):
+        assert shingles(["a", "b", "c", "d"], size=3) == {"a b c", "b c d"}
+        assert shingles(["a", "b"], size=3) == {"a b"}
+        assert shingles([], size=3) == set()
+
+    # Test that signatures are deterministic and estimate the Jaccard similarity of the shingle sets
+    def test_minhash_estimate(self):
+        original = shingles(random_words(2000, seed=0))
+        revised = shingles(revise(random_words(2000, seed=0), edits=40, seed=1))
+
+        assert np.array_equal(minhash(original), minhash(original))
+        assert abs(estimated_jaccard(minhash(original), minhash(revised)) - jaccard(original, revised)) < 0.1
+        assert estimated_jaccard(minhash(original), minhash(shingles(random_words(2000, seed=2)))) < 0.1
+
+    # Test that signatures survive the byte encoding stored in the database
+    def test_encoding_round_trip(self):
+        signature = minhash(shingles(random_words(100, seed=3)))
+        assert np.array_equal(decode_signature(encode_signature(signature)), signature)
+        assert len(encode_signature(signature)) == 4 * len(signature)
+
+    # Test that a revised document finds its original, and an unrelated one finds nothing
+    def test_lsh_query(self):
+        index = LSHIndex(num_perm=128, bands=16, threshold=0.8)
+        documents = {doc_id: random_words(1500, seed=doc_id) for doc_id in range(1, 51)}
+        for doc_id, words in documents.items():
+            index.add(doc_id, minhash(shingles(words)))
+
+        match = index.query(minhash(shingles(revise(documents[17], edits=10, seed=4))))
+        assert match is not None and match[0] == 17 and match[1] >= 0.8
+        assert index.query(minhash(shingles(random_words(1500, seed=999)))) is None
+
+    # Test that removed documents are no longer matched and re-adding replaces the old signature
+    def test_remove_and_replace(self):
+        index = LSHIndex(num_perm=64, bands=8, threshold=0.9)
+        signature = minhash(shingles(random_words(500, seed=5)), num_perm=64)
+        index.add(1, signature)
+        index.add(1, signature)
+        assert len(index) == 1 and index.query(signature) == (1, 1.0)
+
+        assert index.remove(1) and not index.remove(1)
+        assert index.query(signature) is None
+
+    # Test that the band count must divide the signature length
+    def test_invalid_bands(self):
+        with pytest.raises(ValueError):
+            LSHIndex(num_perm=128, bands=10)
@@ -0,0 +1,50 @@
+# tests/test_early_exit.py
+
+
+# Local Application/Library-Specific Imports
+import backend.ml_model as ml_model
+from backend.pipeline import TokenChunk
+from backend.timing import counter_snapshot
+
+
+def chunk(start: int, length: int) -> TokenChunk:
+    return TokenChunk((1,) * length, start, start + length)
+
+
+def scores_for(category: str, confidence: float = 0.9) -> dict:
+    rest = (1 - confidence) / (len(ml_model.categories) - 1)
+    return {c: confidence if c == category else rest for c in ml_model.categories}
+
+
+class TestEarlyExit:
+
+    # Test the priority order: first chunk, then the longest, then the rest in document order
+    def test_chunk_waves(self):
+        chunks = [chunk(0, 10), chunk(10, 5), chunk(15, 40), chunk(55, 20)]
+        assert ml_model.chunk_waves(chunks) == [[chunks[0]], [chunks[2]], [chunks[1], chunks[3]]]
+
+    # Test that the decision is settled only when the remaining weight cannot overturn it
+    def test_decision_settled(self):
+        leading = {"Legal Document": 0.6, "Other": 0.1}
+        assert ml_model.decision_settled(leading, remaining=0.4)
+        assert not ml_model.decision_settled(leading, remaining=0.6)
+        assert not ml_model.decision_settled({"Legal Document": 0.2, "Other": 0.0}, remaining=0.1)  # Threshold open
+
+    # Test that unambiguous documents skip chunks and keep the full-document category
+    def test_early_exit_scores(self, monkeypatch):
+        chunks = [chunk(0, 60), chunk(60, 10), chunk(70, 10), chunk(80, 20)]
+        calls = []
+
+        def fake_classify(document, wave):
+            calls.append(len(wave))
+            return [scores_for("Legal Document") for _ in wave]
+
+        monkeypatch.setattr(ml_model, "classify_chunks", fake_classify)
+        before = counter_snapshot().get("nli_chunks_skipped", 0)
+
+        scores = ml_model.early_exit_scores(None, chunks, total_length=100)
+
+        assert max(scores, key=scores.get) == "Legal Document"
+        assert abs(sum(scores.values()) - 1.0) < 1e-9
+        assert calls == [1]  # 0.6 weight at 0.9 confidence settles the document
+        assert counter_snapshot()["nli_chunks_skipped"] - before == 3
@@ -0,0 +1,240 @@
+# tests/test_extractors.py
+
+
+# Standard Library Imports
+import io
+import os
+import random
+import hashlib
+
+# Third-party Imports
+import pytest
+from docx import Document as DocxDocument  # Reference extraction and sample generation
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+# Local Application/Library-Specific Imports
+import backend.extractors as extractors
+from backend.extractors import IngestConfig, UploadStream, extract_pdf_text, extract_text_from_stream, extract_text_stream
+from backend.extractors import extract_docx_text, limit_words
+from backend.benchmarks.corpus import generate_corpus, load_manifest
+from backend.exceptions import FileTooLarge
+
+
+class TestExtractors:
+
+    # Test that short text files are returned unchanged, with newlines normalized
+    def test_short_text_unchanged(self):
+        stream = io.BytesIO("first line\r\nsecond line\n".encode("utf-8"))
+        assert extract_text_from_stream(stream, ".txt") == "first line\nsecond line\n"
+
+    # Test that reading stops once the word limit is reached
+    def test_text_stops_at_word_limit(self):
+        raw = io.BytesIO(("word " * 100_000).encode("utf-8"))
+        stream = UploadStream(raw)
+        text = extract_text_stream(stream, word_limit=50, chunk_size=64)
+
+        assert text == " ".join(["word"] * 50)
+        assert stream.bytes_read < 1024  # Only the first few chunks were read
+
+    # Test that words and multi-byte characters cut by chunk boundaries are kept intact
+    def test_chunk_boundaries(self):
+        words = [f"wörd{i}" for i in range(200)]
+        stream = io.BytesIO(" ".join(words).encode("utf-8"))
+        assert extract_text_stream(stream, word_limit=150, chunk_size=7) == " ".join(words[:150])
+
+    # Test that the size limit is enforced while reading
+    def test_size_limit(self):
+        stream = UploadStream(io.BytesIO(b"x" * 2048), max_bytes=1024)
+        with pytest.raises(FileTooLarge):
+            stream.consume(chunk_size=512)
+
+    # Test that consuming hashes the whole stream and rewinds it
+    def test_consume_hashes_and_rewinds(self):
+        raw = io.BytesIO(b"binary content")
+        stream = UploadStream(raw)
+        stream.consume()
+
+        assert stream.bytes_read == len(b"binary content")
+        assert raw.tell() == 0
+        assert stream.hexdigest() == hashlib.sha256(b"binary content").hexdigest()
+
+
+def make_pdf(pages) -> bytes:
+    """Build a minimal PDF with one line of text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 10 Tf 20 700 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    output, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return output
+
+
+class TestPdfExtraction:
+
+    # Test that extraction stops at the first page meeting the word budget
+    def test_stops_at_word_budget(self):
+        pdf = make_pdf([f"page{i} " + "alpha beta gamma" for i in range(40)])
+        timings = []
+        text = extract_pdf_text(io.BytesIO(pdf), word_limit=10, timings=timings)
+
+        assert text.split()[:4] == ["page0", "alpha", "beta", "gamma"]
+        assert len(timings) == 3  # Three pages of four words meet a budget of ten
+
+    # Test that parallel extraction keeps page order
+    def test_parallel_pages_in_order(self, monkeypatch):
+        monkeypatch.setattr(IngestConfig, "PDF_SEQUENTIAL_PAGES", 2)
+        monkeypatch.setattr(IngestConfig, "PDF_WORKERS", 2)
+        monkeypatch.setattr(IngestConfig, "PDF_PAGES_PER_TASK", 3)
+        pdf = make_pdf([f"page{i}" for i in range(20)])
+
+        text = extract_pdf_text(io.BytesIO(pdf), word_limit=100)
+        assert text.split() == [f"page{i}" for i in range(20)]
+
+    # Test that pool tasks carry a shared file path and their page range, not the PDF, and the file is removed
+    def test_parallel_tasks_share_file(self, monkeypatch):
+        monkeypatch.setattr(IngestConfig, "PDF_SEQUENTIAL_PAGES", 2)
+        monkeypatch.setattr(IngestConfig, "PDF_WORKERS", 2)
+        monkeypatch.setattr(IngestConfig, "PDF_PAGES_PER_TASK", 3)
+        pool, tasks = extractors.get_pdf_pool(), []
+
+        class RecordingPool:
+            def submit(self, function, *args):
+                tasks.append(args)
+                return pool.submit(function, *args)
+
+        monkeypatch.setattr(extractors, "get_pdf_pool", RecordingPool)
+        text = extract_pdf_text(io.BytesIO(make_pdf([f"page{i}" for i in range(14)])), word_limit=100)
+
+        assert text.split() == [f"page{i}" for i in range(14)]
+        assert [args[1:] for args in tasks] == [(2, 5), (5, 8), (8, 11), (11, 14)]
+        assert len({args[0] for args in tasks}) == 1 and not os.path.exists(tasks[0][0])
+
+
+WPS = "http://schemas.microsoft.com/office/word/2010/wordprocessingShape"  # Text box shapes
+
+
+def save_docx(document) -> bytes:
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def rich_docx() -> bytes:
+    """A DOCX exercising run content, hyperlinks, breaks, tables, content controls and text boxes."""
+    document = DocxDocument()
+    document.add_heading("Master Services Agreement", level=1)
+    paragraph = document.add_paragraph("Between ")
+    paragraph.add_run("Acme Corp.").bold = True
+    paragraph.add_run("\tand\tGlobex — ünïcode included")
+    paragraph.add_run().add_break()  # Line break
+    paragraph.add_run("after the break  ")
+    document.add_paragraph("")
+    document.add_paragraph("   ")
+
+    # Page break, soft carriage return, non-breaking hyphen and a hyperlink
+    special = document.add_paragraph("Page one")
+    special._p.append(parse_xml(
+        f'<w:r {nsdecls("w")}><w:br w:type="page"/><w:t>page two</w:t><w:cr/><w:t>e</w:t>'
+        '<w:noBreakHyphen/><w:t>mail</w:t><w:ptab w:relativeTo="margin" w:alignment="right" w:leader="none"/></w:r>'
+    ))
+    special._p.append(parse_xml(
+        f'<w:hyperlink {nsdecls("w", "r")} r:id="rId99"><w:r><w:t xml:space="preserve"> see </w:t></w:r>'
+        '<w:r><w:t>example.com</w:t></w:r></w:hyperlink>'
+    ))
+
+    # Tables, one of them nested in a cell
+    table = document.add_table(rows=3, cols=3)
+    for row in range(3):
+        for column in range(3):
+            table.cell(row, column).text = f"cell {row}-{column}"
+    table.cell(1, 1).add_table(rows=1, cols=2).cell(0, 1).text = "nested cell"
+    document.add_paragraph("After the table.")
+
+    # Content control and text box, which python-docx leaves out of the body paragraphs
+    document.element.body.insert(-1, parse_xml(
+        f'<w:sdt {nsdecls("w")}><w:sdtContent><w:p><w:r><w:t>inside a content control</w:t></w:r></w:p>'
+        '</w:sdtContent></w:sdt>'
+    ))
+    boxed = document.add_paragraph("Text box anchor")
+    boxed._p.append(parse_xml(
+        f'<w:r {nsdecls("w", "a", "wp")} xmlns:wps="{WPS}"><w:drawing><wp:inline><a:graphic><a:graphicData>'
+        '<wps:wsp><wps:txbx><w:txbxContent><w:p><w:r><w:t>boxed text</w:t></w:r></w:p></w:txbxContent>'
+        '</wps:txbx></wps:wsp></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>'
+    ))
+
+    for i in range(30):
+        document.add_paragraph(f"Clause {i}: the supplier shall deliver item {i} within {i + 1} days.")
+    return save_docx(document)
+
+
+def large_docx(paragraphs: int = 3000, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    document = DocxDocument()
+    for _ in range(paragraphs):
+        document.add_paragraph(" ".join(f"w{rng.randrange(100000)}" for _ in range(30)))
+    return save_docx(document)
+
+
+def python_docx_text(data: bytes, word_limit: int) -> str:
+    """Text of the former python-docx extraction, trimmed to the word limit."""
+    return limit_words("\n".join(paragraph.text for paragraph in DocxDocument(io.BytesIO(data)).paragraphs), word_limit)
+
+
+class CountingStream(io.BytesIO):
+    """In-memory file that counts the bytes read from it."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class TestDocxExtraction:
+
+    # Test that the streaming extractor returns exactly the python-docx text on a corpus of samples
+    def test_parity_with_python_docx(self, tmp_path):
+        generate_corpus(str(tmp_path), sizes=(40, 800, 6000), per_size=2, formats=(".docx",), seed=3)
+        samples = [open(document["path"], "rb").read() for document in load_manifest(str(tmp_path))]
+        samples += [rich_docx(), large_docx(200)]
+
+        for data in samples:
+            for word_limit in (5000, 120, 7):
+                expected = python_docx_text(data, word_limit)
+                assert limit_words(extract_docx_text(io.BytesIO(data), word_limit, include_tables=False), word_limit) == expected
+                assert extract_text_from_stream(io.BytesIO(data), ".docx", word_limit) == expected
+
+    # Test that table cells are included in document order when requested, and nested tables too
+    def test_include_tables(self):
+        text = extract_docx_text(io.BytesIO(rich_docx()), include_tables=True)
+        lines = text.split("\n")
+
+        assert "cell 0-0" in lines and "cell 2-2" in lines and "nested cell" in lines
+        assert lines.index("cell 2-2") < lines.index("After the table.")
+        assert "boxed text" not in text and "inside a content control" not in text
+
+    # Test that extraction stops reading the archive once the word limit is exceeded
+    def test_stops_at_word_limit(self):
+        data = large_docx()
+        stream = CountingStream(data)
+        text = extract_docx_text(stream, word_limit=100)
+
+        assert len(text.split()) > 100  # Trimmed later by extract_text_from_stream
+        assert stream.bytes_read < len(data) / 4
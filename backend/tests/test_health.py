@@ -0,0 +1,86 @@
+# tests/test_health.py
+
+
+# Third-party Imports
+import pytest
+from fastapi.testclient import TestClient
+
+# Local Application/Library-Specific Imports
+import backend.health as health
+import backend.ml_model as ml_model
+import backend.model_registry as model_registry_module
+from backend.main import app
+from backend.health import AppState
+from backend.classifier_head import HeadConfig
+from backend.model_registry import ModelConfig, ModelRegistry, warmup_names
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Registry of stub models used by the health endpoints, with startup not finished yet."""
+    registry = ModelRegistry()
+    registry.register("nli", lambda: "nli model")
+    registry.register("embedding", lambda: "embedding model")
+    monkeypatch.setattr(health, "model_registry", registry)
+    monkeypatch.setattr(AppState, "started", False)
+    monkeypatch.setattr(ModelConfig, "WARMUP_MODELS", "nli")
+    return registry
+
+
+class TestHealth:
+
+    # Test that the liveness probe answers whatever the startup state
+    def test_live(self, registry):
+        response = TestClient(app).get("/health/live")
+        assert response.status_code == 200 and response.json() == {"status": "ok"}
+
+    # Test that the startup probe fails until startup has completed
+    def test_startup(self, registry, monkeypatch):
+        client = TestClient(app)
+        assert client.get("/health/startup").status_code == 503
+        monkeypatch.setattr(AppState, "started", True)
+        assert client.get("/health/startup").json() == {"status": "started"}
+
+    # Test that readiness waits for startup and for the warmup models, but not for the others
+    def test_ready(self, registry, monkeypatch):
+        client = TestClient(app)
+        response = client.get("/health/ready")
+        assert response.status_code == 503 and response.json()["detail"]["pending_models"] == ["nli"]
+
+        monkeypatch.setattr(AppState, "started", True)
+        assert client.get("/health/ready").status_code == 503  # Started, but the NLI model is not loaded
+
+        registry.get("nli")
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["models"]["nli"]["loaded"] and not response.json()["models"]["embedding"]["loaded"]
+
+    # Test that warmup loads the requested models and rejects unknown ones
+    def test_warmup(self, registry):
+        client = TestClient(app)
+        response = client.post("/warmup/", params={"models": ["embedding"]})
+        assert response.status_code == 200
+        assert list(response.json()["load_times"]) == ["embedding"]
+        assert registry.is_loaded("embedding") and not registry.is_loaded("nli")
+
+        response = client.post("/warmup/", params={"models": ["embedding", "ocr"]})
+        assert response.status_code == 400 and "ocr" in response.json()["detail"]
+
+        assert sorted(client.post("/warmup/").json()["load_times"]) == ["embedding", "nli"]
+
+    # Test that without CLASSIFIER_MODE=head the untrained classifier head is neither registered nor warmed up
+    def test_warmup_all_without_head(self, registry, monkeypatch):
+        assert HeadConfig.CLASSIFIER_MODE != "head"
+        assert "classifier_head" not in warmup_names("all") and "classifier" in warmup_names("all")
+
+        # Every registered model, with stub loaders in place of the real weights
+        stubs = ModelRegistry()
+        for name in ml_model.model_registry.names:
+            stubs.register(name, lambda name=name: f"{name} model")
+        monkeypatch.setattr(health, "model_registry", stubs)
+        monkeypatch.setattr(model_registry_module, "model_registry", stubs)
+        monkeypatch.setattr(HeadConfig, "CLASSIFIER_HEAD_PATH", "/nonexistent/classifier_head.joblib")
+
+        response = TestClient(app).post("/warmup/")
+        assert response.status_code == 200
+        assert sorted(response.json()["load_times"]) == sorted(warmup_names("all"))
@@ -0,0 +1,61 @@
+# tests/test_inference.py
+
+
+# Standard Library Imports
+import time
+import asyncio
+import threading
+
+# Third-party Imports
+import pytest
+
+# Local Application/Library-Specific Imports
+from backend.inference import InferenceExecutor
+from backend.exceptions import InferenceQueueFull, InferenceTimeout
+
+
+class TestInferenceExecutor:
+
+    # Test that results are returned from the worker pool
+    def test_run_returns_result(self):
+        executor = InferenceExecutor(max_workers=2, queue_size=2, timeout=5, retry_after=1)
+        try:
+            assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+            assert executor.pending == 0
+        finally:
+            executor.shutdown()
+
+    # Test that a saturated pool rejects new work with a 503 and Retry-After
+    def test_full_queue_rejected(self):
+        executor = InferenceExecutor(max_workers=1, queue_size=0, timeout=5, retry_after=7)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)  # Let the first job occupy the only slot
+            with pytest.raises(InferenceQueueFull) as error:
+                await executor.run(sum, [1])
+            release.set()
+            await running
+            return error.value
+
+        try:
+            error = asyncio.run(scenario())
+            assert error.status_code == 503
+            assert error.headers["Retry-After"] == "7"
+        finally:
+            executor.shutdown()
+
+    # Test that slow jobs time out while keeping their slot until they finish
+    def test_timeout(self):
+        executor = InferenceExecutor(max_workers=1, queue_size=0, timeout=0.05, retry_after=1)
+
+        async def scenario():
+            with pytest.raises(InferenceTimeout):
+                await executor.run(time.sleep, 0.3)
+            assert executor.pending == 1  # Worker is still busy with the abandoned job
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
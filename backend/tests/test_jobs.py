@@ -0,0 +1,238 @@
+# tests/test_jobs.py
+
+
+# Standard Library Imports
+import time
+import asyncio
+from datetime import datetime, timedelta
+
+# Third-party Imports
+import pytest
+from sqlalchemy import select, update
+
+# Local Application/Library-Specific Imports
+from backend import jobs
+from backend.jobs import JobConfig, claim_job, enqueue_job, finish_job, requeue_stale_jobs, retry_or_dead_letter
+from backend.jobs import run_job, wait_for_job
+from backend.models import Document, UploadJob
+from backend.exceptions import InferenceQueueFull, InvalidFileType, ModelInferenceError
+
+
+def analysis(filename: str) -> dict:
+    """Result of analyze_file for a classified text upload."""
+    return {
+        "filename": filename, "content": "quarterly revenue grew", "predicted_category": "Business Proposal",
+        "confidence_scores": {"Business Proposal": 0.9, "Other": 0.1}, "tier": "nli", "cache_key": f"file:{filename}",
+        "file_digest": filename, "embedding": None, "signature": None, "duplicate_of": None,
+    }
+
+
+@pytest.fixture
+def Session(db_session, monkeypatch):
+    """Session factory of the test database, also used by the job module's own sessions."""
+    monkeypatch.setattr(jobs, "AsyncSessionLocal", db_session)
+    return db_session
+
+
+async def load_job(Session, job_id: int) -> UploadJob:
+    async with Session() as db:
+        return await db.get(UploadJob, job_id)
+
+
+class TestJobs:
+
+    # Test that concurrent claims hand a job to exactly one worker, highest priority first
+    def test_claim_is_exclusive(self, Session):
+        async def scenario():
+            async with Session() as db:
+                low = await enqueue_job(db, "low.txt", b"low")
+                high = await enqueue_job(db, "high.txt", b"high", priority=5)
+
+            async def claim():
+                async with Session() as db:
+                    job = await claim_job(db)
+                    return job.id if job is not None else None
+
+            first = await asyncio.gather(*[claim() for _ in range(4)])
+            second = await asyncio.gather(*[claim() for _ in range(4)])
+            return low.id, high.id, first, second, await load_job(Session, high.id)
+
+        low_id, high_id, first, second, high = asyncio.run(scenario())
+        claimed = [job_id for job_id in first + second if job_id is not None]
+        assert sorted(claimed) == sorted([low_id, high_id])  # Each job handed out once
+        assert [job_id for job_id in first if job_id is not None][0] == high_id
+        assert high.status == jobs.RUNNING and high.attempts == 1
+
+    # Test that failed attempts back off exponentially and the last one dead-letters the job
+    def test_retry_backoff_and_dead_letter(self, Session):
+        async def scenario():
+            async with Session() as db:
+                job = await enqueue_job(db, "a.txt", b"a")
+                job = await claim_job(db)
+                await retry_or_dead_letter(db, job, "model failure")
+                retried = (job.status, job.available_at, await claim_job(db))  # Not runnable during the backoff
+
+                await db.refresh(job)  # Expired by the rollback of the empty claim
+                job.attempts = job.max_attempts
+                await retry_or_dead_letter(db, job, "model failure")
+            return retried, await load_job(Session, job.id)
+
+        started = datetime.utcnow()
+        (status, available_at, claimed), dead = asyncio.run(scenario())
+        assert status == jobs.QUEUED and claimed is None
+        assert available_at - started >= timedelta(seconds=JobConfig.JOB_RETRY_DELAY * 0.9)
+        assert dead.status == jobs.DEAD and dead.error == "model failure" and dead.payload is None
+
+    # Test that invalid files fail without retries, model errors are retried, and successes store the document
+    def test_run_job_outcomes(self, Session, monkeypatch):
+        async def analyze_file(filename, raw, size=None):
+            if filename.endswith(".exe"):
+                raise InvalidFileType()
+            if filename.startswith("flaky"):
+                raise ModelInferenceError("out of memory")
+            return analysis(filename)
+
+        monkeypatch.setattr(jobs, "analyze_file", analyze_file)
+
+        async def scenario():
+            results = {}
+            for filename in ("bad.exe", "flaky.txt", "good.txt"):
+                async with Session() as db:
+                    job = await enqueue_job(db, filename, b"payload")
+                    await run_job(db, await claim_job(db))
+                results[filename] = await load_job(Session, job.id)
+            async with Session() as db:
+                documents = (await db.execute(select(Document.id, Document.filename))).all()
+            return results, documents
+
+        results, documents = asyncio.run(scenario())
+        assert results["bad.exe"].status == jobs.FAILED and results["bad.exe"].attempts == 1
+        assert results["bad.exe"].payload is None
+        assert results["flaky.txt"].status == jobs.QUEUED and "out of memory" in results["flaky.txt"].error
+        assert results["good.txt"].status == jobs.DONE
+        assert [(row.id, row.filename) for row in documents] == [(results["good.txt"].document_id, "good.txt")]
+
+    # Test that a failed commit stores neither the document nor the job's done state
+    def test_document_and_job_commit_together(self, Session, monkeypatch):
+        monkeypatch.setattr(jobs, "analyze_file", lambda *args: asyncio.sleep(0, result=analysis("a.txt")))
+
+        async def failing_record(db, documents, removed=False):
+            raise RuntimeError("statistics unavailable")
+
+        monkeypatch.setattr("backend.services.record_documents", failing_record)
+
+        async def scenario():
+            async with Session() as db:
+                job = await enqueue_job(db, "a.txt", b"a")
+                await run_job(db, await claim_job(db))
+                stored = (await db.execute(select(Document.id))).all()
+            return stored, await load_job(Session, job.id)
+
+        stored, job = asyncio.run(scenario())
+        assert stored == []
+        assert job.status == jobs.QUEUED and job.document_id is None
+
+    # Test that jobs without attempts left are dead-lettered instead of being claimed again
+    def test_claim_dead_letters_exhausted_jobs(self, Session):
+        async def scenario():
+            async with Session() as db:
+                exhausted = await enqueue_job(db, "crash.pdf", b"crash")
+                fresh = await enqueue_job(db, "fresh.txt", b"fresh")
+                await db.execute(update(UploadJob).where(UploadJob.id == exhausted.id).values(attempts=3))
+                await db.commit()
+                claimed = await claim_job(db)
+            return claimed.id, fresh.id, await load_job(Session, exhausted.id)
+
+        claimed_id, fresh_id, exhausted = asyncio.run(scenario())
+        assert claimed_id == fresh_id
+        assert exhausted.status == jobs.DEAD and exhausted.payload is None
+
+    # Test that silent running jobs are requeued, or dead-lettered when their last attempt crashed the worker
+    def test_requeue_stale_jobs(self, Session):
+        async def scenario():
+            async with Session() as db:
+                ids = [(await enqueue_job(db, f"{name}.txt", b"x")).id for name in ("stale", "crashed", "live")]
+                old = datetime.utcnow() - timedelta(seconds=JobConfig.JOB_STALE_SECONDS + 60)
+                for job_id, attempts, updated_at in zip(ids, (1, 3, 1), (old, old, datetime.utcnow())):
+                    await db.execute(
+                        update(UploadJob).where(UploadJob.id == job_id)
+                        .values(status=jobs.RUNNING, attempts=attempts, updated_at=updated_at)
+                    )
+                await db.commit()
+            await requeue_stale_jobs()
+            return [await load_job(Session, job_id) for job_id in ids]
+
+        stale, crashed, live = asyncio.run(scenario())
+        assert stale.status == jobs.QUEUED
+        assert crashed.status == jobs.DEAD and crashed.error == jobs.WORKER_LOST
+        assert live.status == jobs.RUNNING
+
+    # Test that the heartbeat keeps a running job fresh, so the stale sweep leaves it alone
+    def test_heartbeat(self, Session, monkeypatch):
+        monkeypatch.setattr(JobConfig, "JOB_HEARTBEAT_INTERVAL", 0.01)
+
+        async def scenario():
+            async with Session() as db:
+                job = await enqueue_job(db, "slow.txt", b"x")
+                old = datetime.utcnow() - timedelta(seconds=JobConfig.JOB_STALE_SECONDS + 60)
+                await db.execute(
+                    update(UploadJob).where(UploadJob.id == job.id).values(status=jobs.RUNNING, updated_at=old)
+                )
+                await db.commit()
+
+            beat = asyncio.create_task(jobs.heartbeat(job.id))
+            await asyncio.sleep(0.2)
+            beat.cancel()
+            await requeue_stale_jobs()
+            return await load_job(Session, job.id)
+
+        assert asyncio.run(scenario()).status == jobs.RUNNING
+
+    # Test that a finished job wakes every waiter, even after another waiter on it timed out
+    def test_wait_for_job_wakeup(self, Session, monkeypatch):
+        monkeypatch.setattr(JobConfig, "JOB_POLL_INTERVAL", 30)  # Only a wakeup can return in time
+
+        async def scenario():
+            async with Session() as db:
+                job = await enqueue_job(db, "a.txt", b"a")
+
+            impatient = asyncio.create_task(wait_for_job(job.id, timeout=0.05))
+            patient = asyncio.create_task(wait_for_job(job.id, timeout=10))
+            timed_out = await impatient
+
+            started = time.monotonic()
+            async with Session() as db:
+                await finish_job(db, await db.get(UploadJob, job.id), jobs.FAILED, error="rejected")
+            finished = await asyncio.wait_for(patient, timeout=5)
+            return timed_out, finished, time.monotonic() - started, job.id
+
+        timed_out, finished, elapsed, job_id = asyncio.run(scenario())
+        assert timed_out["status"] == jobs.QUEUED  # The timeout returns the current state
+        assert finished["status"] == jobs.FAILED and elapsed < 1
+        assert job_id not in jobs._job_events and job_id not in jobs._job_waiters
+
+    # Test that waiting on an unknown job returns nothing
+    def test_wait_for_unknown_job(self, Session):
+        assert asyncio.run(wait_for_job(12345, timeout=0.1)) is None
+
+    # Test that a full inference pool postpones a job by its Retry-After without using up its attempts
+    def test_queue_full_postpones(self, Session, monkeypatch):
+        async def analyze_file(filename, raw, size=None):
+            raise InferenceQueueFull(retry_after=5)
+
+        monkeypatch.setattr(jobs, "analyze_file", analyze_file)
+
+        async def scenario():
+            async with Session() as db:
+                job = await enqueue_job(db, "a.txt", b"payload")
+                for _ in range(JobConfig.JOB_MAX_ATTEMPTS + 2):  # More rejections than attempts
+                    await db.execute(update(UploadJob).where(UploadJob.id == job.id).values(available_at=datetime.utcnow()))
+                    await db.commit()
+                    await run_job(db, await claim_job(db))
+                return await load_job(Session, job.id), await claim_job(db)
+
+        started = datetime.utcnow()
+        job, claimed = asyncio.run(scenario())
+        assert job.status == jobs.QUEUED and job.attempts == 0 and claimed is None
+        assert job.payload == b"payload" and "queue is full" in job.error
+        assert job.available_at - started >= timedelta(seconds=4)
@@ -0,0 +1,127 @@
+# tests/test_listing.py
+
+
+# Standard Library Imports
+import asyncio
+from datetime import datetime, timedelta
+
+# Third-party Imports
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+# Local Application/Library-Specific Imports
+from backend.main import app
+from backend.database import get_db
+from backend.models import Document
+from backend.services import decode_cursor, encode_cursor, list_documents
+
+
+START = datetime(2024, 5, 1, 12)
+
+# (filename, category, minutes after START); several documents share an upload time
+DOCUMENTS = [
+    ("report_a.txt", "Academic Paper", 0), ("report_b.txt", "Academic Paper", 0), ("contract.pdf", "Legal Document", 0),
+    ("manual.docx", "Technical Documentation", 5), ("report_c.txt", "Academic Paper", 5),
+    ("memo_%.txt", "Other", 10), ("memo_1.txt", "Other", 10),
+]
+
+
+@pytest.fixture
+def Session(db_session):
+    """Session factory of the test database holding DOCUMENTS."""
+    async def create():
+        async with db_session() as db:
+            db.add_all([
+                Document(filename=filename, predicted_category=category, confidence_scores={category: 1.0},
+                         upload_time=START + timedelta(minutes=minutes))
+                for filename, category, minutes in DOCUMENTS
+            ])
+            await db.commit()
+
+    asyncio.run(create())
+    return db_session
+
+
+def listing(Session, **filters) -> tuple:
+    async def run():
+        async with Session() as db:
+            return await list_documents(db, **filters)
+
+    return asyncio.run(run())
+
+
+def all_pages(Session, limit: int, **filters) -> list:
+    """Filenames of every page, following the cursors."""
+    pages, cursor = [], None
+    while True:
+        documents, cursor = listing(Session, limit=limit, cursor=cursor, **filters)
+        pages.append([document["filename"] for document in documents])
+        if cursor is None:
+            return pages
+
+
+class TestListing:
+
+    # Test that a cursor decodes to the upload time and id it was made from
+    def test_cursor_round_trip(self):
+        upload_time = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        assert decode_cursor(encode_cursor(upload_time, 42)) == (upload_time, 42)
+
+    # Test that malformed cursors are rejected with 400, directly and through the endpoint
+    def test_malformed_cursor(self, Session):
+        for cursor in ("garbage", encode_cursor(START, 1)[:-4], "bm90LWEtZGF0ZXwx"):  # Last one: "not-a-date|1"
+            with pytest.raises(HTTPException) as error:
+                decode_cursor(cursor)
+            assert error.value.status_code == 400
+
+        async def get_test_db():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = get_test_db
+        try:
+            response = TestClient(app).get("/documents/", params={"limit": 2, "cursor": "garbage"})
+        finally:
+            app.dependency_overrides.pop(get_db)
+        assert response.status_code == 400 and response.json()["detail"] == "Invalid cursor"
+
+    # Test that pages follow each other without gaps or repeats, also across documents sharing an upload time
+    def test_stable_paging(self, Session):
+        everything, cursor = listing(Session)
+        assert cursor is None and len(everything) == len(DOCUMENTS)
+        expected = [document["filename"] for document in everything]  # Newest first, then highest id
+
+        for limit in (1, 2, 3):
+            pages = all_pages(Session, limit)
+            assert [filename for page in pages for filename in page] == expected
+            assert all(len(page) == limit for page in pages[:-1])
+
+        assert expected[:3] == ["memo_1.txt", "memo_%.txt", "report_c.txt"]
+
+    # Test that the category, date and filename filters combine with paging
+    def test_filters(self, Session):
+        assert all_pages(Session, 2, category="Academic Paper") == [["report_c.txt", "report_b.txt"], ["report_a.txt"]]
+
+        documents, _ = listing(Session, uploaded_after=START + timedelta(minutes=5),
+                               uploaded_before=START + timedelta(minutes=10))
+        assert [document["filename"] for document in documents] == ["report_c.txt", "manual.docx"]
+
+        documents, _ = listing(Session, filename_prefix="report_")
+        assert sorted(document["filename"] for document in documents) == ["report_a.txt", "report_b.txt", "report_c.txt"]
+
+        documents, _ = listing(Session, filename_prefix="memo_%")  # Wildcards match literally
+        assert [document["filename"] for document in documents] == ["memo_%.txt"]
+
+    # Test that documents cannot be stored without an upload time, which the listing order relies on
+    def test_upload_time_required(self, Session):
+        async def insert_null():
+            async with Session() as db:
+                await db.execute(insert(Document).values(
+                    filename="x.txt", predicted_category="Other", confidence_scores={}, upload_time=None
+                ))
+
+        with pytest.raises(IntegrityError):
+            asyncio.run(insert_null())
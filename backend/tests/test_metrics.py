@@ -0,0 +1,70 @@
+# tests/test_metrics.py
+
+
+# Standard Library Imports
+import asyncio
+
+# Local Application/Library-Specific Imports
+from backend import metrics
+from backend.inference import InferenceExecutor
+from backend.timing import Histogram, request_stages, server_timing, stage_histogram, timed_stage
+
+
+class TestMetrics:
+
+    # Test that buckets are cumulative and end with +Inf holding every observation
+    def test_histogram_buckets(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe("stage", seconds)
+
+        series = histogram.snapshot()["stage"]
+        assert series["buckets"] == [(0.1, 1), (1.0, 3), ("+Inf", 4)]
+        assert series["count"] == 4
+        assert abs(series["sum"] - 4.25) < 1e-9
+
+    # Test that repeated stages are summed into one Server-Timing entry in milliseconds
+    def test_server_timing(self):
+        header = server_timing([("extract_pdf", 0.01), ("nli", 0.2), ("extract_pdf", 0.0025)])
+        assert header == "extract_pdf;dur=12.5, nli;dur=200.0"
+
+    # Test that stages timed on the inference pool are reported to the request that submitted them
+    def test_stages_reach_request_from_worker(self):
+        executor = InferenceExecutor(max_workers=1, queue_size=0, timeout=5, retry_after=1)
+
+        def work():
+            with timed_stage("test_worker_stage"):
+                return 1
+
+        async def scenario():
+            stages = []
+            request_stages.set(stages)
+            await executor.run(work)
+            return stages
+
+        try:
+            stages = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert [name for name, _ in stages] == ["test_worker_stage"]
+        assert stage_histogram.snapshot()["test_worker_stage"]["count"] >= 1
+
+    # Test that the exposition lists stage histograms, queue depths, caches and memory
+    def test_render_metrics(self, monkeypatch):
+        async def no_jobs():
+            return {"queued": 2}
+
+        monkeypatch.setattr(metrics, "job_counts", no_jobs)
+        with timed_stage("test_render_stage"):
+            pass
+
+        text = asyncio.run(metrics.render_metrics())
+        assert "# TYPE smartapp_stage_duration_seconds histogram" in text
+        assert 'smartapp_stage_duration_seconds_bucket{stage="test_render_stage",le="+Inf"} 1' in text
+        assert 'smartapp_batcher_queue_depth{batcher="nli-batcher"} 0' in text
+        assert 'smartapp_upload_jobs{status="queued"} 2' in text
+        assert 'smartapp_cache_hit_ratio{cache="file"}' in text
+        assert 'smartapp_cache_entries{cache="embedding"}' in text
+        assert "smartapp_inference_pending " in text
+        assert "smartapp_db_pool_checkouts_total " in text
+        assert text.endswith("\n")
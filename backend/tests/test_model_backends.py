@@ -0,0 +1,69 @@
+# tests/test_model_backends.py
+
+
+# Third-party Imports
+import pytest
+import torch
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Local Application/Library-Specific Imports
+import backend.ml_model as ml_model
+from backend.utils import WORD_PATTERN
+from backend.model_backends import quantize_int8, resolve_backend
+from backend.benchmarks.parity import DEFAULT_EVAL_SETS, agreement_by_set, compare, load_eval_set
+
+
+class TestModelBackends:
+
+    # Test that unknown backends are rejected and the configured one is used by default
+    def test_resolve_backend(self):
+        assert resolve_backend("ONNX") == "onnx"
+        assert resolve_backend() in ("pytorch", "int8", "onnx")
+        with pytest.raises(ValueError):
+            resolve_backend("tensorrt")
+
+    # Test that int8 quantization replaces Linear layers and keeps outputs close
+    def test_quantize_int8(self):
+        torch.manual_seed(0)
+        model = torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), torch.nn.Linear(32, 4))
+        inputs = torch.randn(8, 16)
+        expected = model(inputs)
+
+        quantized = quantize_int8(model)
+
+        assert not any(type(layer) is torch.nn.Linear for layer in quantized.modules())
+        assert torch.allclose(quantized(inputs), expected, atol=0.05)
+
+
+class TestParity:
+
+    # Test the agreement report between two backend runs
+    def test_compare(self):
+        def run(categories, latency):
+            predictions = [{"category": c, "scores": {c: 0.9, "Other": 0.1}} for c in categories]
+            return {"predictions": predictions, "accuracy": 1.0, "mean_latency": latency}
+
+        report = compare(run(["Legal Document", "Business Proposal"], 2.0), run(["Legal Document", "Academic Paper"], 1.0))
+
+        assert report["agreement"] == 0.5
+        assert report["speedup"] == 2.0
+        assert report["max_score_diff"] == pytest.approx(0.9)
+
+    # Test that the bundled evaluation sets cover every category and include documents long enough to be summarized
+    def test_eval_sets(self):
+        short, long = (load_eval_set(path) for path in DEFAULT_EVAL_SETS)
+        assert {document["label"] for document in short} == {document["label"] for document in long} == set(ml_model.categories)
+        # Words left after stop word removal; sklearn's list is longer than NLTK's, so this undercounts
+        kept = [
+            len([word for word in WORD_PATTERN.findall(document["text"].lower()) if word not in ENGLISH_STOP_WORDS])
+            for document in long
+        ]
+        assert sum(words > ml_model.SUMMARY_THRESHOLD for words in kept) >= 4
+        assert {document["eval_set"] for document in long} == {"eval_set_long.jsonl"}
+
+    # Test that agreement is also reported per evaluation set
+    def test_agreement_by_set(self):
+        documents = [{"eval_set": "short"}, {"eval_set": "short"}, {"eval_set": "long"}]
+        reference = {"predictions": [{"category": c} for c in ("Legal Document", "Other", "Academic Paper")]}
+        candidate = {"predictions": [{"category": c} for c in ("Legal Document", "Other", "Other")]}
+        assert agreement_by_set(reference, candidate, documents) == {"short": 1.0, "long": 0.0}
@@ -0,0 +1,101 @@
+# tests/test_model_registry.py
+
+
+# Standard Library Imports
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party Imports
+import pytest
+
+# Local Application/Library-Specific Imports
+from backend.model_registry import ModelRegistry
+
+
+class SlowLoader:
+    """Loader counting its calls, which blocks until released so callers pile up on the model lock."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        return f"{self.name} model #{self.calls}"
+
+
+class TestModelRegistry:
+
+    # Test that concurrent gets of a model being loaded wait for that single load and share its result
+    def test_concurrent_get_loads_once(self):
+        registry, loader = ModelRegistry(), SlowLoader("nli")
+        registry.register("nli", loader)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(registry.get, "nli") for _ in range(8)]
+            time.sleep(0.1)  # Every thread is now waiting on the load started by the first one
+            assert not registry.is_loaded("nli")
+            loader.release.set()
+            results = [future.result(timeout=5) for future in futures]
+
+        assert loader.calls == 1
+        assert results == ["nli model #1"] * 8
+        assert registry.is_loaded("nli") and registry.load_times["nli"] >= 0.1
+
+    # Test that a slow model only blocks its own callers, not those of another model
+    def test_lock_per_model(self):
+        registry, slow = ModelRegistry(), SlowLoader("summarizer")
+        registry.register("summarizer", slow)
+        registry.register("embedding", lambda: "embedding model")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            loading = pool.submit(registry.get, "summarizer")
+            time.sleep(0.05)
+            assert pool.submit(registry.get, "embedding").result(timeout=1) == "embedding model"
+            assert not loading.done()
+            slow.release.set()
+            assert loading.result(timeout=5) == "summarizer model #1"
+
+    # Test that a failed load is raised to the caller, leaves nothing cached and is retried on next use
+    def test_load_failure(self):
+        attempts = []
+
+        def flaky_loader():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("weights not found")
+            return "nli model"
+
+        registry = ModelRegistry()
+        registry.register("nli", flaky_loader)
+
+        with pytest.raises(OSError):
+            registry.get("nli")
+        assert not registry.is_loaded("nli") and "nli" not in registry.load_times
+        assert registry.get("nli") == "nli model" and len(attempts) == 2
+
+    # Test that an unloaded model is loaded again on next use, and that unloading twice is harmless
+    def test_unload(self):
+        registry, loader = ModelRegistry(), SlowLoader("nli")
+        loader.release.set()
+        registry.register("nli", loader)
+
+        assert registry.get("nli") == "nli model #1"
+        registry.unload("nli")
+        registry.unload("nli")
+        assert not registry.is_loaded("nli")
+        assert registry.get("nli") == "nli model #2"
+
+    # Test that warmup loads the requested models, or every registered one, and reports their load times
+    def test_warmup(self):
+        registry = ModelRegistry()
+        for name in ("nli", "embedding"):
+            registry.register(name, lambda name=name: f"{name} model")
+
+        assert list(registry.warmup(["embedding"])) == ["embedding"]
+        assert not registry.is_loaded("nli")
+        assert sorted(registry.warmup()) == ["embedding", "nli"]
+        assert registry.is_loaded("nli")
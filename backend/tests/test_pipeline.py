@@ -0,0 +1,70 @@
+# tests/test_pipeline.py
+
+
+# Standard Library Imports
+import json
+
+# Third-party Imports
+import pytest
+from transformers import BartTokenizerFast
+from transformers.models.gpt2.tokenization_gpt2 import bytes_to_unicode
+
+# Local Application/Library-Specific Imports
+from backend.pipeline import TokenizedDocument, pad_batch
+
+
+@pytest.fixture(scope="module")
+def tokenizer(tmp_path_factory):
+    """Byte-level BPE tokenizer with the BART special tokens and a tiny vocabulary, built offline."""
+    path = tmp_path_factory.mktemp("tokenizer")
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3}
+    for char in bytes_to_unicode().values():
+        vocab.setdefault(char, len(vocab))
+    merges = ["Ġ t", "h e", "Ġt he"]
+    for merge in merges:
+        vocab.setdefault(merge.replace(" ", ""), len(vocab))
+    (path / "vocab.json").write_text(json.dumps(vocab))
+    (path / "merges.txt").write_text("#version: 0.2\n" + "\n".join(merges) + "\n")
+    return BartTokenizerFast(str(path / "vocab.json"), str(path / "merges.txt"))
+
+
+class TestTokenizedDocument:
+
+    # Test that token chunks cover every token once and map back to the original text
+    def test_token_chunks_cover_text(self, tokenizer):
+        document = TokenizedDocument("the cat sat on the mat. the end.", tokenizer=tokenizer)
+        chunks = document.token_chunks(5)
+
+        assert [token for chunk in chunks for token in chunk.ids] == document.token_ids
+        assert all(len(chunk.ids) <= 5 for chunk in chunks)
+        assert "".join(document.chunk_text(chunk) for chunk in chunks).replace(" ", "") == \
+            document.text.replace(" ", "")
+
+    # Test that long spans are truncated, or split when asked
+    def test_span_chunks(self, tokenizer):
+        document = TokenizedDocument("the cat sat. a much longer second sentence here.", tokenizer=tokenizer)
+        spans = [(0, 12), (13, len(document.text))]
+
+        truncated = document.span_chunks(spans, 6)
+        split = document.span_chunks(spans, 6, split=True)
+
+        assert len(truncated) == 2 and all(len(chunk.ids) <= 6 for chunk in truncated)
+        assert "the cat sat.".startswith(document.chunk_text(truncated[0]))
+        assert len(split) > 2
+        assert tokenizer.decode([token for chunk in split if chunk.start >= 12 for token in chunk.ids]).strip() == \
+            "a much longer second sentence here."
+
+    # Test that words are split once and reused
+    def test_words(self, tokenizer):
+        words = ["already", "split"]
+        document = TokenizedDocument("already split", words, tokenizer=tokenizer)
+        assert document.words is words and document.word_count == 2
+
+
+class TestPadBatch:
+
+    # Test right padding and attention masks
+    def test_pad_batch(self, tokenizer):
+        batch = pad_batch(tokenizer, [[5, 6, 7], [8]])
+        assert batch["input_ids"].tolist() == [[5, 6, 7], [8, 1, 1]]
+        assert batch["attention_mask"].tolist() == [[1, 1, 1], [1, 0, 0]]
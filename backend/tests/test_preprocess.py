@@ -0,0 +1,40 @@
+# tests/test_preprocess.py
+
+
+# Local Application/Library-Specific Imports
+import backend.utils as utils
+from backend.benchmarks.preprocess import legacy_preprocess
+from backend.model_registry import model_registry
+
+
+class FakeLemmatizer:
+    """Strips a plural 's' and counts calls, standing in for WordNet."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def lemmatize(self, word):
+        self.calls += 1
+        return word[:-1] if word.endswith("s") else word
+
+
+class TestPreprocess:
+
+    # Test that the single-pass engine matches the original implementation and memoizes lemmas
+    def test_matches_original_and_caches(self, monkeypatch):
+        fake = FakeLemmatizer()
+        monkeypatch.setattr(utils, "lemmatizer", fake)
+        monkeypatch.setattr(model_registry, "get", lambda name: {"the", "a", "of"})
+        utils.lemmatize.cache_clear()
+
+        texts = ["The cats, the DOGS & a bird_s!\n\nCats of cats.", "  naïve   cafés... 42 cats "]
+        assert [" ".join(words) for words in utils.preprocess_batch(texts)] == [
+            legacy_preprocess(text) for text in texts
+        ]
+        assert utils.preprocess_text(texts[0]) == legacy_preprocess(texts[0])
+
+        # Repeated words reach the lemmatizer once; the legacy calls are not cached
+        fake.calls = 0
+        utils.preprocess_batch(texts)
+        assert fake.calls == 0
+        utils.lemmatize.cache_clear()
@@ -0,0 +1,110 @@
+# tests/test_progress.py
+
+
+# Standard Library Imports
+import asyncio
+from concurrent.futures import Future
+
+# Third-party Imports
+import pytest
+
+# Local Application/Library-Specific Imports
+import backend.ml_model as ml_model
+import backend.services as services
+from backend.exceptions import InvalidFileType, UploadCancelled
+from backend.pipeline import TokenChunk
+from backend.progress import ProgressReporter, progress_reporter, report, wait_in_order
+
+
+def finished(value) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def drain(reporter: ProgressReporter) -> list:
+    """Events queued so far, once the loop has run the pending callbacks."""
+    events = []
+    while not reporter.events.empty():
+        events.append(reporter.events.get_nowait())
+    return events
+
+
+class TestProgress:
+
+    # Test that events are only sent while a reporter is set for the current upload
+    def test_report(self):
+        async def scenario():
+            report("extracted", words=1)  # No streamed upload: ignored
+            reporter = ProgressReporter()
+            token = progress_reporter.set(reporter)
+            try:
+                report("extracted", words=12)
+            finally:
+                progress_reporter.reset(token)
+            await asyncio.sleep(0)
+            return drain(reporter)
+
+        assert asyncio.run(scenario()) == [("extracted", {"words": 12})]
+
+    # Test that results come in order, and that a cancelled upload stops waiting and cancels queued items
+    def test_wait_in_order_cancellation(self):
+        assert list(wait_in_order([finished(1), finished(2)])) == [1, 2]
+
+        async def scenario():
+            reporter = ProgressReporter()
+            token = progress_reporter.set(reporter)
+            try:
+                futures = [finished("a"), Future(), Future()]
+                results = wait_in_order(futures)
+                first = next(results)
+                reporter.cancel()
+                with pytest.raises(UploadCancelled):
+                    next(results)
+                return first, futures
+            finally:
+                progress_reporter.reset(token)
+
+        first, futures = asyncio.run(scenario())
+        assert first == "a"
+        assert all(future.cancelled() for future in futures[1:])
+
+    # Test that every aggregated chunk reports its scores and the running category
+    def test_chunk_aggregator_events(self):
+        async def scenario():
+            reporter = ProgressReporter()
+            token = progress_reporter.set(reporter)
+            try:
+                aggregator = ml_model.ChunkAggregator(chunk_count=2, total_length=100)
+                aggregator.add(TokenChunk((1,), 0, 25), {"Legal Document": 0.9, "Other": 0.1})
+                aggregator.add(TokenChunk((1,), 25, 100), {"Legal Document": 0.2, "Other": 0.8})
+            finally:
+                progress_reporter.reset(token)
+            await asyncio.sleep(0)
+            return aggregator, drain(reporter)
+
+        aggregator, events = asyncio.run(scenario())
+        assert [event for event, _ in events] == ["chunk", "chunk"]
+        assert events[0][1]["category"] == "Legal Document" and events[0][1]["running_scores"]["Legal Document"] == 0.9
+        assert events[1][1]["category"] == "Other" and (events[1][1]["scored"], events[1][1]["chunks"]) == (2, 2)
+        assert aggregator.scores["Other"] == pytest.approx(0.025 + 0.6)  # Length-weighted, unnormalized
+
+    # Test that a streamed upload sends pipeline events, then the stored document or the error
+    def test_stream_upload_events(self, monkeypatch):
+        async def analyze_and_store(filename, raw, size=None):
+            report("extracted", words=3)
+            await asyncio.sleep(0)
+            if filename.endswith(".exe"):
+                raise InvalidFileType()
+            return {"id": 1, "filename": filename}
+
+        async def collect(filename):
+            return [event async for event in services.stream_upload_events(filename, None)]
+
+        monkeypatch.setattr(services, "analyze_and_store", analyze_and_store)
+
+        assert asyncio.run(collect("a.txt")) == [
+            'event: extracted\ndata: {"words": 3}\n\n',
+            'event: document\ndata: {"id": 1, "filename": "a.txt"}\n\n',
+        ]
+        assert asyncio.run(collect("a.exe"))[-1].startswith('event: error\ndata: {"status_code": 400')
@@ -0,0 +1,82 @@
+# tests/test_stats.py
+
+
+# Standard Library Imports
+import asyncio
+from datetime import datetime
+
+# Third-party Imports
+import pytest
+
+# Local Application/Library-Specific Imports
+from backend import stats
+from backend.models import Document
+from backend.stats import bucket_start, load_stats, record_documents
+
+
+DOCUMENTS = [
+    {"predicted_category": "Invoice", "confidence_scores": {"Invoice": 0.9, "Other": 0.1},
+     "upload_time": datetime(2024, 3, 1, 9, 15)},
+    {"predicted_category": "Invoice", "confidence_scores": {"Invoice": 0.7, "Other": 0.3},
+     "upload_time": datetime(2024, 3, 1, 9, 45)},
+    {"predicted_category": "Contract", "confidence_scores": {"Contract": 0.8, "Other": 0.2},
+     "upload_time": datetime(2024, 3, 2, 14, 5)},
+]
+
+
+class TestStats:
+
+    # Test that uploads are bucketed by the start of their hour and day
+    def test_bucket_start(self):
+        upload_time = datetime(2024, 3, 1, 9, 45, 12, 500)
+        assert bucket_start(upload_time, "hour") == datetime(2024, 3, 1, 9)
+        assert bucket_start(upload_time, "day") == datetime(2024, 3, 1)
+
+    # Test that inserts and deletes keep counts, mean confidence and upload buckets consistent
+    def test_record_and_remove(self, db_session):
+        async def scenario():
+            async with db_session() as db:
+                await record_documents(db, DOCUMENTS[:2])
+                await db.commit()
+                await record_documents(db, DOCUMENTS[2:])  # A second transaction adds to the same rows
+                await db.commit()
+                daily = await load_stats(db, "day")
+                hourly = await load_stats(db, "hour", since=datetime(2024, 3, 2))
+
+                await record_documents(db, DOCUMENTS[2:], removed=True)
+                await db.commit()
+                return daily, hourly, await load_stats(db, "day")
+
+        daily, hourly, after_delete = asyncio.run(scenario())
+
+        assert daily["total_documents"] == 3
+        assert [(c["category"], c["documents"]) for c in daily["categories"]] == [("Contract", 1), ("Invoice", 2)]
+        assert daily["categories"][1]["mean_confidence"] == pytest.approx(0.8)
+        assert [(u["bucket_start"], u["documents"], u["categories"]) for u in daily["uploads"]] == [
+            (datetime(2024, 3, 1), 2, {"Invoice": 2}),
+            (datetime(2024, 3, 2), 1, {"Contract": 1}),
+        ]
+        assert [u["bucket_start"] for u in hourly["uploads"]] == [datetime(2024, 3, 2, 14)]
+
+        # Emptied categories and buckets are no longer reported
+        assert [c["category"] for c in after_delete["categories"]] == ["Invoice"]
+        assert [u["bucket_start"] for u in after_delete["uploads"]] == [datetime(2024, 3, 1)]
+
+    # Test that a rebuild from the documents table reproduces the incrementally maintained statistics
+    def test_rebuild_matches_incremental(self, db_engine, db_session, monkeypatch):
+        monkeypatch.setattr(stats, "engine", db_engine)
+        monkeypatch.setattr(stats, "AsyncSessionLocal", db_session)
+
+        async def scenario():
+            async with db_session() as db:
+                db.add_all([Document(filename=f"{i}.txt", **document) for i, document in enumerate(DOCUMENTS)])
+                await record_documents(db, DOCUMENTS)
+                await db.commit()
+                incremental = await load_stats(db, "hour")
+
+            await stats.rebuild(batch_size=2)
+            async with db_session() as db:
+                return incremental, await load_stats(db, "hour")
+
+        incremental, rebuilt = asyncio.run(scenario())
+        assert rebuilt == incremental
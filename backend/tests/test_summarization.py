@@ -0,0 +1,73 @@
+# tests/test_summarization.py
+
+
+# Third-party Imports
+import torch
+
+# Local Application/Library-Specific Imports
+import backend.summarization as summarization
+from backend.batching import MicroBatcher
+from backend.summarization import SummaryConfig, extractive_summary, summarize_large_text
+from backend.timing import timed_stage, timing_snapshot
+from backend.model_registry import model_registry
+
+
+class FakeEmbeddingModel:
+    """Embeds sentences about cats and dogs on two axes."""
+
+    def encode(self, sentences, convert_to_tensor=True, normalize_embeddings=True):
+        vectors = torch.tensor([[1.0, 0.1] if "cat" in sentence else [0.1, 1.0] for sentence in sentences])
+        return torch.nn.functional.normalize(vectors, dim=1)
+
+
+class TestExtractiveSummary:
+
+    # Test that the sentences closest to the dominant topic are kept, in document order
+    def test_keeps_central_sentences(self, monkeypatch):
+        monkeypatch.setattr(model_registry, "get", lambda name: FakeEmbeddingModel())
+        monkeypatch.setattr(summarization, "sent_tokenize", lambda text: [s + "." for s in text.split(". ")])
+        sentences = ["The cat sat down.", "A dog barked.", "The cat purred.", "The cat slept.", "The cat ate"]
+        summary = extractive_summary(" ".join(sentences), max_words=9)
+
+        assert summary == "The cat sat down. The cat purred."
+        assert "dog" not in summary
+
+    # Test that text within the budget is returned unchanged, without loading the model
+    def test_short_text_unchanged(self, monkeypatch):
+        def fail(name):
+            raise AssertionError("model should not be loaded")
+
+        monkeypatch.setattr(model_registry, "get", fail)
+        assert extractive_summary("a short text", max_words=10) == "a short text"
+
+
+class TestAbstractiveSummary:
+
+    # Test that a failing chunk of a multi-chunk document is dropped and the other chunks are kept
+    def test_failing_chunk_dropped(self, monkeypatch):
+        def generate_summaries(chunks):
+            if (2,) in chunks:
+                raise RuntimeError("generation failed")
+            return [f"summary {chunk[0]}" for chunk in chunks]
+
+        monkeypatch.setattr(SummaryConfig, "SUMMARY_MODE", "abstractive")
+        monkeypatch.setattr(summarization, "summary_chunks", lambda text: [(1,), (2,), (3,)])
+        monkeypatch.setattr(summarization, "generate_summaries", generate_summaries)
+        monkeypatch.setattr(summarization, "summary_batcher", MicroBatcher(generate_summaries, max_batch_size=8))
+
+        for batching in (True, False):  # One batch holding all chunks, then one generate() call per chunk
+            monkeypatch.setattr(SummaryConfig, "SUMMARY_BATCHING", batching)
+            assert summarize_large_text("a long document") == "summary 1 summary 3"
+
+
+class TestStageTimings:
+
+    # Test that stage durations are accumulated per stage
+    def test_timed_stage_accumulates(self):
+        for _ in range(2):
+            with timed_stage("test_stage"):
+                pass
+
+        totals = timing_snapshot()["test_stage"]
+        assert totals["calls"] == 2
+        assert totals["mean_seconds"] >= 0
@@ -0,0 +1,109 @@
+# tests/test_tiered_classification.py
+
+
+# Third-party Imports
+import pytest
+import torch
+
+# Local Application/Library-Specific Imports
+import backend.ml_model as ml_model
+from backend.cache import CacheConfig
+from backend.pipeline import TokenizedDocument
+
+
+class StubRegistry:
+    """Model registry serving fixed category embeddings."""
+
+    def __init__(self, category_embeddings: torch.Tensor):
+        self.category_embeddings = category_embeddings
+
+    def get(self, name: str):
+        assert name == "category_embeddings"
+        return self.category_embeddings
+
+
+def scores_for(category: str, confidence: float) -> dict:
+    rest = (1 - confidence) / (len(ml_model.categories) - 1)
+    return {c: confidence if c == category else rest for c in ml_model.categories}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """classify_text_with_tier with the models replaced by stubs; returns the calls made to each tier."""
+    calls = {"embedding": 0, "nli": 0}
+    result = {"embedding": (scores_for("Legal Document", 0.8), 0.3), "nli": scores_for("Academic Paper", 0.7)}
+
+    def embed_documents(documents):
+        calls["embedding"] += 1
+        return torch.zeros(len(documents), 4)
+
+    def nli_scores(document):
+        calls["nli"] += 1
+        return result["nli"]
+
+    monkeypatch.setattr(ml_model, "prepare_document", lambda text, words=None: TokenizedDocument(text, text.split()))
+    monkeypatch.setattr(ml_model, "embed_documents", embed_documents)
+    monkeypatch.setattr(ml_model, "embedding_scores", lambda document, embedding=None: result["embedding"])
+    monkeypatch.setattr(ml_model, "nli_scores", nli_scores)
+    monkeypatch.setattr(CacheConfig, "CACHE_ENABLED", False)
+    monkeypatch.setattr(ml_model, "TIERED_CLASSIFICATION", True)
+    return calls, result
+
+
+class TestTieredClassification:
+
+    # Test that similarities become a softmax over categories, with the margin between the two closest
+    def test_embedding_scores(self, monkeypatch):
+        category_embeddings = torch.eye(len(ml_model.categories))
+        monkeypatch.setattr(ml_model, "model_registry", StubRegistry(category_embeddings))
+
+        # Closest to the third category, then the first
+        embedding = torch.zeros(len(ml_model.categories))
+        embedding[2], embedding[0] = 0.8, 0.6
+        scores, margin = ml_model.embedding_scores(None, embedding)
+
+        assert list(scores) == ml_model.categories
+        assert sum(scores.values()) == pytest.approx(1.0)
+        assert max(scores, key=scores.get) == ml_model.categories[2]
+        assert margin == pytest.approx(0.8 - 0.6)
+
+        # A lower temperature sharpens the same similarities
+        monkeypatch.setattr(ml_model, "EMBEDDING_TEMPERATURE", 0.01)
+        sharper, _ = ml_model.embedding_scores(None, embedding)
+        assert sharper[ml_model.categories[2]] > scores[ml_model.categories[2]]
+
+    # Test that a decisive embedding answer is kept without running NLI
+    def test_decisive_embedding_kept(self, pipeline):
+        calls, _ = pipeline
+        category, scores, tier = ml_model.classify_text_with_tier("a clear contract")
+
+        assert (category, tier) == ("Legal Document", "embedding")
+        assert calls == {"embedding": 1, "nli": 0}
+
+    # Test that an ambiguous embedding answer escalates to NLI, whose answer is returned
+    def test_ambiguous_embedding_escalates(self, pipeline):
+        calls, result = pipeline
+        result["embedding"] = (scores_for("Legal Document", 0.4), ml_model.EMBEDDING_MARGIN_THRESHOLD / 2)
+        category, scores, tier = ml_model.classify_text_with_tier("a vague text")
+
+        assert (category, tier) == ("Academic Paper", "nli")
+        assert scores == result["nli"]
+        assert calls == {"embedding": 1, "nli": 1}
+
+    # Test that with tiering off (the default) every document goes to NLI without being embedded
+    def test_tiering_disabled(self, pipeline, monkeypatch):
+        calls, _ = pipeline
+        monkeypatch.setattr(ml_model, "TIERED_CLASSIFICATION", False)
+        category, _, tier = ml_model.classify_text_with_tier("a clear contract")
+
+        assert (category, tier) == ("Academic Paper", "nli")
+        assert calls == {"embedding": 0, "nli": 1}
+
+    # Test that a low-confidence answer of either tier becomes "Other"
+    def test_low_confidence_becomes_other(self, pipeline):
+        _, result = pipeline
+        result["embedding"] = (scores_for("Legal Document", 0.2), 0.5)
+        category, scores, tier = ml_model.classify_text_with_tier("a short note")
+
+        assert (category, tier) == ("Other", "embedding")
+        assert scores["Other"] == 1.0 and sum(scores.values()) == 1.0
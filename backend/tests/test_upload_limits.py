@@ -0,0 +1,43 @@
+# tests/test_upload_limits.py
+
+
+# Third-party Imports
+import pytest
+from fastapi.testclient import TestClient
+
+# Local Application/Library-Specific Imports
+from backend.main import app, upload_size_limit
+from backend.services import BatchConfig
+from backend.extractors import IngestConfig
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client of the application with tiny upload limits, so small requests are already too large."""
+    monkeypatch.setattr(IngestConfig, "MAX_UPLOAD_BYTES", 100)
+    monkeypatch.setattr(IngestConfig, "MULTIPART_OVERHEAD", 0)
+    monkeypatch.setattr(BatchConfig, "BATCH_MAX_BYTES", 400)
+    return TestClient(app)
+
+
+class TestUploadLimits:
+
+    # Test that every upload endpoint has a limit, and other paths have none
+    def test_limits_by_path(self, client):
+        assert upload_size_limit("/upload/") == upload_size_limit("/upload/stream/") == 100
+        assert upload_size_limit("/upload/batch/") == 400
+        assert upload_size_limit("/documents/") is None
+
+    # Test that single-file uploads over the limit are rejected from Content-Length, on both endpoints
+    def test_single_upload_rejected(self, client):
+        for path in ("/upload/", "/upload/stream/"):
+            response = client.post(path, files={"file": ("big.txt", b"x" * 200, "text/plain")})
+            assert response.status_code == 413 and response.json()["detail"].startswith("File exceeds")
+
+    # Test that batches are held to the batch limit, not to the per-file one
+    def test_batch_rejected(self, client):
+        response = client.post("/upload/batch/", files=[("files", ("big.txt", b"x" * 500, "text/plain"))])
+        assert response.status_code == 413 and response.json()["detail"].startswith("Batch exceeds")
+
+        response = client.post("/upload/batch/", files=[])  # Under the limit, so the endpoint itself answers
+        assert response.status_code == 400
@@ -0,0 +1,110 @@
+# tests/test_vector_index.py
+
+
+# Standard Library Imports
+import asyncio
+
+# Third-party Imports
+import numpy as np
+
+# Local Application/Library-Specific Imports
+import backend.database as database
+from backend.models import DocumentEmbedding
+from backend.vector_index import IndexSynchronizer, VectorIndex, decode_embedding, encode_embedding, normalize
+
+
+def clustered_vectors(clusters: int, per_cluster: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    """Unit vectors scattered around random cluster centres, like embeddings of related documents."""
+    rng = np.random.default_rng(seed)
+    centres = normalize(rng.normal(size=(clusters, dim)))
+    points = np.repeat(centres, per_cluster, axis=0) + 0.3 * rng.normal(size=(clusters * per_cluster, dim)) / np.sqrt(dim)
+    return normalize(points)
+
+
+class TestVectorIndex:
+
+    # Test that float16 embeddings survive the byte encoding stored in the database
+    def test_encoding_round_trip(self):
+        vector = normalize(np.random.default_rng(1).normal(size=384))
+        data = encode_embedding(vector)
+        assert len(data) == 768
+        assert np.allclose(decode_embedding(data), vector, atol=1e-3)
+
+    # Test that exact search returns the true nearest neighbours, best first, without the excluded document
+    def test_exact_search(self):
+        vectors = clustered_vectors(5, 40)
+        index = VectorIndex(ivf_min_vectors=10_000)
+        index.add(range(len(vectors)), vectors)
+
+        results = index.search(vectors[7], k=5, exclude=7)
+        expected = [i for i in np.argsort(-(vectors @ vectors[7])) if i != 7][:5]
+        assert [doc_id for doc_id, _ in results] == expected
+        assert all(a[1] >= b[1] for a, b in zip(results, results[1:]))
+        assert not index.trained
+
+    # Test that removed documents are no longer returned, and that re-adding replaces the old vector
+    def test_remove_and_replace(self):
+        vectors = clustered_vectors(3, 10)
+        index = VectorIndex(ivf_min_vectors=10_000)
+        index.add(range(len(vectors)), vectors)
+
+        assert index.remove(3)
+        assert not index.remove(3)
+        assert 3 not in index and len(index) == len(vectors) - 1
+        assert 3 not in [doc_id for doc_id, _ in index.search(vectors[3], k=len(vectors))]
+
+        index.add([4], vectors[20:21])
+        assert len(index) == len(vectors) - 1
+        assert index.search(vectors[20], k=2, exclude=20)[0][0] == 4
+
+    # Test that the clustered index keeps most of the exact neighbours and compacts removed rows
+    def test_ivf_recall(self):
+        vectors = clustered_vectors(20, 50)
+        index = VectorIndex(nprobe=4, ivf_min_vectors=10_000)  # Large threshold, so nothing trains in the background
+        index.add(range(len(vectors)), vectors)
+        for doc_id in range(0, 100, 2):
+            index.remove(doc_id)
+        index.rebuild()
+        assert index.trained and len(index) == len(vectors) - 50
+
+        # Documents added after training go straight to their cluster
+        index.add([5000], vectors[999:1000])
+        assert index.search(vectors[999], k=1)[0][0] in (999, 5000)
+
+        alive = np.array([i for i in range(len(vectors)) if i >= 100 or i % 2])
+        hits = 0
+        for query in range(0, len(vectors), 25):
+            exact = alive[np.argsort(-(vectors[alive] @ vectors[query]))][:10]
+            found = [doc_id for doc_id, _ in index.search(vectors[query], k=10)]
+            hits += len(set(exact) & set(found))
+        assert hits / (10 * len(range(0, len(vectors), 25))) >= 0.9
+
+    # Test that rows committed below already loaded ids are picked up, in the lag window or by the full rescan
+    def test_synchronizer_late_commits(self, db_session, monkeypatch):
+        monkeypatch.setattr(database, "AsyncSessionLocal", db_session)
+        vectors = clustered_vectors(2, 10)
+        index = VectorIndex(ivf_min_vectors=10_000)
+        sync = IndexSynchronizer(
+            "Test index", DocumentEmbedding.document_id, DocumentEmbedding.embedding,
+            lambda doc_ids, data: index.add(doc_ids, np.stack([decode_embedding(value) for value in data])),
+            index.__contains__, lag_ids=3, batch_size=4,
+        )
+
+        async def commit(doc_ids):
+            async with db_session() as db:
+                db.add_all([DocumentEmbedding(document_id=i, embedding=encode_embedding(vectors[i])) for i in doc_ids])
+                await db.commit()
+
+        async def scenario():
+            await commit([1, 2, 3, 5, 6, 9, 10])  # 4, 7 and 8 are still being written
+            loaded = await sync.catch_up()
+            await commit([8, 11])  # 8 is within the lag window below the newest id
+            recent = await sync.catch_up()
+            await commit([4, 7])  # Too far below it
+            missed = await sync.catch_up()
+            reconciled = await sync.reconcile()
+            return loaded, recent, missed, reconciled
+
+        assert asyncio.run(scenario()) == (7, 2, 0, 2)
+        assert sorted(index._rows) == list(range(1, 12)) and sync.last_id == 11
+        assert np.allclose(index.vector(4), vectors[4], atol=1e-3)
@@ -0,0 +1,121 @@
+# backend/timing.py
+
+
+# Standard Library Imports
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Calls and total seconds spent in every pipeline stage since startup
+stage_timings: Dict[str, Dict[str, float]] = {}
+_timings_lock = threading.Lock()
+
+# Event counts of the pipeline since startup (e.g. chunks skipped by early exit)
+counters: Dict[str, int] = {}
+
+# Upper bounds (seconds) of the latency histogram buckets, from 1 ms to 2 minutes
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """
+    Thread-safe latency histogram per label value, in the shape of a Prometheus histogram:
+    cumulative bucket counts, plus the sum and count of all observations.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label: str, seconds: float):
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            index = bisect_left(self.buckets, seconds)  # First bucket whose upper bound holds the value
+            if index < len(self.buckets):
+                series["buckets"][index] += 1
+            series["sum"] += seconds
+            series["count"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Cumulative bucket counts (keyed by upper bound, "+Inf" last), sum and count per label."""
+        with self._lock:
+            snapshot = {}
+            for label, series in self._series.items():
+                cumulative, running = [], 0
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    running += count
+                    cumulative.append((bound, running))
+                cumulative.append(("+Inf", series["count"]))
+                snapshot[label] = {"buckets": cumulative, "sum": series["sum"], "count": series["count"]}
+            return snapshot
+
+
+# Latency distribution of every pipeline stage since startup
+stage_histogram = Histogram()
+
+# Stages measured while serving the current request, for its Server-Timing header; None outside requests
+request_stages: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_stages", default=None)
+
+
+@contextmanager
+def timed_stage(name: str):
+    """
+    Measure a pipeline stage and add its duration to `stage_timings` and `stage_histogram`,
+    and to the stages of the current request.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        with _timings_lock:
+            totals = stage_timings.setdefault(name, {"calls": 0, "seconds": 0.0})
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+        stage_histogram.observe(name, seconds)
+        stages = request_stages.get()
+        if stages is not None:
+            stages.append((name, seconds))
+        logger.debug(f"Stage '{name}' took {seconds:.3f} seconds")
+
+
+def server_timing(stages: List[Tuple[str, float]]) -> str:
+    """
+    Server-Timing header value of a request's stages; repeated stages (e.g. one per file
+    of a batch) are summed, e.g. `extract_pdf;dur=12.5, nli;dur=840.1`.
+    """
+    totals: Dict[str, float] = {}
+    for name, seconds in stages:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={1000 * seconds:.1f}" for name, seconds in totals.items())
+
+
+def timing_snapshot() -> Dict[str, Dict[str, float]]:
+    """Copy of the stage totals, with the mean duration of each stage."""
+    with _timings_lock:
+        return {
+            name: {**totals, "mean_seconds": totals["seconds"] / totals["calls"]}
+            for name, totals in stage_timings.items()
+        }
+
+
+def increment(name: str, amount: int = 1):
+    """Add to a pipeline counter."""
+    with _timings_lock:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def counter_snapshot() -> Dict[str, int]:
+    with _timings_lock:
+        return dict(counters)
@@ -2,65 +2,82 @@
 
 
 # Standard Library Imports
+import os
 import re
 import logging
+from functools import lru_cache
 
 # Third-party Imports
 import nltk  # Natural Language Toolkit for NLP tasks
-from PyPDF2 import PdfReader  # PDF reading library
 from nltk.corpus import stopwords  # Stop words for NLP
 from fastapi import HTTPException  # Exception handling for FastAPI
-from docx import Document as DocxDocument  # DOCX file handling
-from transformers import AutoTokenizer, pipeline  # Transformers library for pre-trained models
 from nltk.stem import WordNetLemmatizer  # Lemmatization tools for NLP
 from nltk.tokenize import sent_tokenize  # Sentence tokenization
 
+# Local Application/Library-Specific Imports
+from .model_registry import model_registry
+from .model_backends import load_pipeline
+from .extractors import SUPPORTED_EXTENSIONS, extract_text_from_stream
 
-# Download NLTK resources
-nltk.download('stopwords')  # Download stopwords corpus
-nltk.download('wordnet')  # Download WordNet for lemmatization
-nltk.download('punkt')  # Download punkt tokenizer for sentence splitting
 
+# Use NLTK corpora from a local directory; they are installed at build time, never downloaded at runtime
+# (python -m nltk.downloader -d <dir> stopwords wordnet punkt punkt_tab)
+NLTK_DATA_DIR = os.getenv("NLTK_DATA", os.path.join(os.path.dirname(__file__), "nltk_data"))
+nltk.data.path.insert(0, NLTK_DATA_DIR)
 
-# Initialize the tokenizer for token counting
-tokenizer = AutoTokenizer.from_pretrained("facebook/bart-large-mnli")  # Load a tokenization model
 
+# Model names used by this module
+TOKENIZER_MODEL_NAME = "facebook/bart-large-mnli"  # Tokenizer for token counting
+SUMMARIZER_MODEL_NAME = "facebook/bart-large-cnn"  # BART summarization model
 
-# Initialize BART summarization model
-summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
 
+def load_tokenizer():
+    from transformers import AutoTokenizer  # Imported on first use to keep startup fast
+    return AutoTokenizer.from_pretrained(TOKENIZER_MODEL_NAME)
 
-# Initialize NLP tools
-stop_words = set(stopwords.words('english'))  # Set of English stop words
 
-# Initialize the lemmatizer
+def load_summarizer():
+    return load_pipeline("summarization", SUMMARIZER_MODEL_NAME)  # On the configured inference backend
+
+
+# Register models; they are loaded on first use
+model_registry.register("tokenizer", load_tokenizer)
+model_registry.register("summarizer", load_summarizer)
+model_registry.register("stop_words", lambda: set(stopwords.words('english')))  # Set of English stop words
+
+
+# Initialize the lemmatizer (WordNet is read lazily on first lemmatization)
 lemmatizer = WordNetLemmatizer()
 
+# Runs of word characters, i.e. what is left after replacing every non-word character with a space
+WORD_PATTERN = re.compile(r'\w+')
 
-# Preprocess the input text
-def preprocess_text(text: str) -> str:
-    text = text.lower()  # Convert text to lowercase
-    text = re.sub(r'\W', ' ', text)  # Remove special characters
-    text = re.sub(r'\s+', ' ', text)  # Remove extra spaces
+# Lemmas remembered across documents; vocabularies are Zipfian, so a bounded table catches most words
+LEMMA_CACHE_SIZE = int(os.getenv("LEMMA_CACHE_SIZE", "100000"))
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize(word: str) -> str:
+    """Memoized WordNet lemma of a word."""
+    return lemmatizer.lemmatize(word)
+
+
+# Preprocess the input text into lemmatized words
+def preprocess_words(text: str) -> list:
+    words = WORD_PATTERN.findall(text.lower())  # Lowercase and split on special characters in a single pass
     # Lemmatize words not in stop words
-    text = ' '.join([lemmatizer.lemmatize(word) for word in text.split() if word not in stop_words])
-    return text  # Return processed text
+    stop_words = model_registry.get("stop_words")
+    return [lemmatize(word) for word in words if word not in stop_words]
 
 
-def chunk_text_by_tokens(text: str, max_tokens: int = 512) -> list:
-    """
-    Chunk text by tokens to ensure each chunk is within the model's token limit.
-    """
-    tokens = tokenizer.encode(text, truncation=False)  # Encode text to token IDs
-    chunks = []  # Initialize list to hold text chunks
+# Preprocess the input text
+def preprocess_text(text: str) -> str:
+    return ' '.join(preprocess_words(text))  # Return processed text
 
-    for i in range(0, len(tokens), max_tokens):
 
-        # Slice the tokens for current chunk
-        chunk_tokens = tokens[i:i + max_tokens]
-        chunk_text = tokenizer.decode(chunk_tokens, skip_special_tokens=True)  # Decode token IDs back to text
-        chunks.append(chunk_text)  # Add chunk to list
-    return chunks  # Return list of text chunks
+def preprocess_batch(texts: list) -> list:
+    """Preprocess several documents in one call, returning the lemmatized words of each."""
+    return [preprocess_words(text) for text in texts]
 
 
 def chunk_text_by_sentences(text: str, max_sentences: int = 7) -> list:
@@ -82,56 +99,17 @@ def chunk_text_by_sentences(text: str, max_sentences: int = 7) -> list:
     return chunks  # Return list of sentence chunks
 
 
-def summarize_large_text(text: str) -> str:
-    """
-    Summarize large text using BART summarization model with chunking.
-    """
-    max_length = 500  # Maximum length for each summarization chunk
-    min_length = 100  # Minimum length for meaningful summaries
-    chunked_texts = chunk_text_by_sentences(text, max_sentences=10)  # Chunk text by sentences
-
-    summaries = []  # Initialize list for summaries
-    for chunk in chunked_texts:
-        try:
-            # Summarize each chunk
-            summary = summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)
-            summaries.append(summary[0]['summary_text'])
-        except Exception as e:
-            logging.error(f"Summarization failed for chunk: {e}")
-            continue  # Skip failed chunks
-
-    return " ".join(summaries) if summaries else text[:2000]  # Return combined summaries or a fallback if empty
-
-
 def extract_text_from_file(file_path: str, file_extension: str) -> str:
     """
     Extract text from different file formats and ensure text length is manageable.
     """
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        # Raise error for unsupported formats
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+
     try:
-        if file_extension == '.txt':  # If the file is a text file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()  # Read the text content
-
-        elif file_extension == '.pdf':  # If the file is a PDF
-            reader = PdfReader(file_path)  # Create a PDF reader
-            text = " ".join(page.extract_text() or "" for page in reader.pages)  # Extract text from all pages
-
-        elif file_extension == '.docx':  # If the file is a DOCX
-            doc = DocxDocument(file_path)  # Create a DOCX document reader
-            text = "\n".join(paragraph.text for paragraph in doc.paragraphs)  # Extract text from paragraphs
-
-        else:
-            # Raise error for unsupported formats
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-
-        # Ensure extracted text is within a reasonable limit (5000 words)
-        word_limit = 5000  # Set word limit
-        words = text.split()  # Split text into words
-        if len(words) > word_limit:  # If the text exceeds the limit
-            text = " ".join(words[:word_limit])  # Trim text to the limit
-
-        # Return the extracted trimmed text
-        return text
+        with open(file_path, 'rb') as f:
+            return extract_text_from_stream(f, file_extension)  # Extract and trim to the word limit
 
     # Handle extraction errors
     except Exception as e:
@@ -0,0 +1,416 @@
+# backend/vector_index.py
+#
+# In-process approximate nearest-neighbour index over the stored MiniLM document embeddings.
+# Embeddings are persisted as float16 in `document_embeddings` and loaded at startup; every worker
+# process keeps its own index and picks up documents added by other processes on a short interval.
+# Documents uploaded before embeddings were stored are embedded with:
+# python -m backend.vector_index backfill [--batch-size 64]
+
+
+# Standard Library Imports
+import os
+import math
+import time
+import asyncio
+import argparse
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Third-party Imports
+import numpy as np
+from sqlalchemy import select  # Query construction
+
+# Local Application/Library-Specific Imports
+from .models import Document, DocumentContent, DocumentEmbedding
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Fetch similarity search settings from environment variables
+class SimilarityConfig:
+    SIMILARITY_ENABLED = os.getenv("SIMILARITY_ENABLED", "true").lower() == "true"  # Store embeddings, serve /similar
+    SIMILARITY_IVF_MIN_VECTORS = int(os.getenv("SIMILARITY_IVF_MIN_VECTORS", "20000"))  # Exact search below this
+    SIMILARITY_NPROBE = int(os.getenv("SIMILARITY_NPROBE", "8"))  # Clusters scanned per query
+    SIMILARITY_SYNC_INTERVAL = float(os.getenv("SIMILARITY_SYNC_INTERVAL", "10"))  # Seconds between catch-up polls
+    SIMILARITY_SYNC_LAG_IDS = int(os.getenv("SIMILARITY_SYNC_LAG_IDS", "1000"))  # Ids below the newest rechecked per poll
+    SIMILARITY_RECONCILE_INTERVAL = float(os.getenv("SIMILARITY_RECONCILE_INTERVAL", "3600"))  # Seconds between full rescans
+
+
+BLOCK_ROWS = 65536  # Rows converted to float32 at a time, bounding the memory of a scan
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64  # Training vectors per cluster
+
+
+def encode_embedding(vector: np.ndarray) -> bytes:
+    """Little-endian float16 bytes of an embedding (768 bytes for MiniLM)."""
+    return np.asarray(vector, dtype="<f2").tobytes()
+
+
+def decode_embedding(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<f2")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest (highest cosine) centroid of every vector, computed block by block."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = vectors[start:start + BLOCK_ROWS].astype(np.float32)
+        assignments[start:start + BLOCK_ROWS] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on a sample of the vectors."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = normalize(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)]
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        empty = np.bincount(assignments, minlength=nlist) == 0
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]  # Reseed empty clusters
+        centroids = normalize(sums)
+    return centroids
+
+
+class VectorIndex:
+    """
+    Cosine-similarity index of unit-length float16 vectors keyed by document id.
+    Below `ivf_min_vectors` queries scan every vector exactly. Above it, an inverted file (IVF) is
+    trained with k-means in a background thread (about sqrt(n) clusters) and queries only scan the
+    `nprobe` clusters closest to the query. Inserts are assigned to their cluster immediately; removals
+    are tombstoned and compacted away when the index is retrained (size doubled or a quarter removed).
+    """
+
+    def __init__(self, nprobe: int = 8, ivf_min_vectors: int = 20000):
+        self.nprobe = max(1, nprobe)
+        self.ivf_min_vectors = ivf_min_vectors
+        self._vectors: Optional[np.ndarray] = None  # Rows of float16 vectors, with spare capacity
+        self._ids = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._count = 0  # Rows in use, including removed ones
+        self._rows: Dict[int, int] = {}  # Document id -> row
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []  # Rows of each cluster at training time
+        self._appended: List[List[int]] = []  # Rows added to each cluster since
+        self._trained_rows = 0
+        self._building = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def vector(self, doc_id: int) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(doc_id)
+            return None if row is None else self._vectors[row].copy()
+
+    def _reserve(self, rows: int, dim: int):
+        """Grow the row arrays geometrically so inserts are amortized O(1)."""
+        if self._vectors is None:
+            self._vectors = np.empty((0, dim), dtype=np.float16)
+        if rows <= len(self._vectors):
+            return
+        capacity = max(rows, 2 * len(self._vectors), 1024)
+        vectors = np.empty((capacity, self._vectors.shape[1]), dtype=np.float16)
+        vectors[:self._count] = self._vectors[:self._count]
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._count] = self._ids[:self._count]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._count] = self._alive[:self._count]
+        self._vectors, self._ids, self._alive = vectors, ids, alive
+
+    def add(self, doc_ids: Iterable[int], vectors: np.ndarray):
+        """Insert (or replace) the embeddings of documents."""
+        doc_ids = [int(doc_id) for doc_id in doc_ids]
+        vectors = normalize(np.atleast_2d(vectors)).astype(np.float16)
+        if not doc_ids:
+            return
+
+        with self._lock:
+            for doc_id in doc_ids:
+                self.remove(doc_id)
+            start = self._count
+            self._reserve(start + len(doc_ids), vectors.shape[1])
+            self._vectors[start:start + len(doc_ids)] = vectors
+            self._ids[start:start + len(doc_ids)] = doc_ids
+            self._alive[start:start + len(doc_ids)] = True
+            self._count += len(doc_ids)
+            self._rows.update((doc_id, start + i) for i, doc_id in enumerate(doc_ids))
+
+            if self._centroids is not None:
+                for offset, cluster in enumerate(assign(vectors, self._centroids)):
+                    self._appended[cluster].append(start + offset)
+            self._maybe_rebuild()
+
+    def remove(self, doc_id: int) -> bool:
+        """Drop a document; returns whether it was indexed."""
+        with self._lock:
+            row = self._rows.pop(int(doc_id), None)
+            if row is None:
+                return False
+            self._alive[row] = False
+            return True
+
+    def search(self, query: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """The `k` most similar documents to a query vector, as (document id, cosine similarity), best first."""
+        query = normalize(query).ravel()
+        with self._lock:
+            if not self._rows:
+                return []
+            if self._centroids is None:
+                candidates = np.arange(self._count)
+            else:
+                probes = np.argsort(self._centroids @ query)[-self.nprobe:]
+                candidates = np.concatenate(
+                    [self._lists[p] for p in probes] + [np.asarray(self._appended[p], dtype=np.int64) for p in probes]
+                )
+            candidates = candidates[self._alive[candidates]]
+            if exclude is not None:
+                candidates = candidates[self._ids[candidates] != exclude]
+
+            best_rows, best_scores = [], []
+            for start in range(0, len(candidates), BLOCK_ROWS):
+                rows = candidates[start:start + BLOCK_ROWS]
+                scores = self._vectors[rows].astype(np.float32) @ query
+                top = np.argpartition(scores, -k)[-k:] if len(scores) > k else np.arange(len(scores))
+                best_rows.append(rows[top])
+                best_scores.append(scores[top])
+            if not best_rows:
+                return []
+
+            rows, scores = np.concatenate(best_rows), np.concatenate(best_scores)
+            order = np.argsort(-scores)[:k]
+            return [(int(self._ids[rows[i]]), float(scores[i])) for i in order]
+
+    def _maybe_rebuild(self):
+        """Start retraining in the background when the index outgrew its clusters or has many removals."""
+        live = len(self._rows)
+        if self._building or live < self.ivf_min_vectors:
+            return
+        if self._centroids is not None and self._count < 2 * self._trained_rows and live > 0.75 * self._count:
+            return
+        self._building = True
+        threading.Thread(target=self.rebuild, name="vector-index-build", daemon=True).start()
+
+    def rebuild(self):
+        """
+        Retrain the clusters on the live vectors and compact removed rows away. The expensive part runs on
+        a snapshot without the lock, so searches and inserts continue meanwhile.
+        """
+        try:
+            with self._lock:
+                self._building = True
+                snapshot_count = self._count
+                live_rows = np.flatnonzero(self._alive[:snapshot_count])
+                vectors = self._vectors  # Rows below snapshot_count never change
+            if len(live_rows) == 0:
+                return
+
+            nlist = max(1, min(len(live_rows), int(math.sqrt(len(live_rows)))))
+            centroids = train_centroids(vectors[live_rows], nlist)
+            assignments = assign(vectors[live_rows], centroids)
+
+            with self._lock:
+                # Keep rows still alive, plus rows added while training
+                still_alive = self._alive[live_rows]
+                added = np.arange(snapshot_count, self._count)
+                added = added[self._alive[added]]
+                keep = np.concatenate([live_rows[still_alive], added])
+                assignments = np.concatenate([assignments[still_alive], assign(self._vectors[added], centroids)])
+
+                self._vectors = self._vectors[keep]
+                self._ids = self._ids[keep]
+                self._alive = np.ones(len(keep), dtype=bool)
+                self._count = len(keep)
+                self._rows = {int(doc_id): row for row, doc_id in enumerate(self._ids)}
+
+                order = np.argsort(assignments, kind="stable")
+                bounds = np.searchsorted(assignments[order], np.arange(nlist + 1))
+                self._lists = [order[bounds[i]:bounds[i + 1]].astype(np.int64) for i in range(nlist)]
+                self._appended = [[] for _ in range(nlist)]
+                self._centroids = centroids
+                self._trained_rows = self._count
+            logger.info(f"Vector index trained with {nlist} clusters over {self._count} documents")
+        finally:
+            self._building = False
+
+
+# Shared index of the application process
+vector_index = VectorIndex(SimilarityConfig.SIMILARITY_NPROBE, SimilarityConfig.SIMILARITY_IVF_MIN_VECTORS)
+
+
+class IndexSynchronizer:
+    """
+    Loads the rows of a per-document table into an in-process index at startup, then polls for rows
+    inserted by other worker processes. Documents deleted by other processes are filtered out when
+    results are joined with the documents table.
+    Ids are handed out when a transaction starts, not when it commits, so a row can appear below ids
+    already loaded: every poll rechecks the `lag_ids` ids below the newest one, and a full rescan every
+    `reconcile_interval` seconds picks up anything committed later still.
+    """
+
+    def __init__(self, name: str, id_column, value_column, add: Callable[[List[int], List[bytes]], None],
+                 contains: Callable[[int], bool], enabled: bool = True, interval: float = 10.0,
+                 lag_ids: int = 1000, reconcile_interval: float = 3600.0, batch_size: int = 10000):
+        self.name = name
+        self.id_column = id_column
+        self.value_column = value_column
+        self.add = add  # Called on a worker thread with document ids and their stored values
+        self.contains = contains  # Whether a document is in the index already
+        self.enabled = enabled
+        self.interval = interval
+        self.lag_ids = lag_ids
+        self.reconcile_interval = reconcile_interval
+        self.batch_size = batch_size
+        self.last_id = 0  # Highest document id loaded from the table
+        self.ready = False
+        self._next_reconcile = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def catch_up(self) -> int:
+        """Load rows newer than the last loaded document or missing within the lag window below it."""
+        return await self.load_missing(max(0, self.last_id - self.lag_ids))
+
+    async def reconcile(self) -> int:
+        """Load every row missing from the index, however late it was committed."""
+        return await self.load_missing(0)
+
+    async def load_missing(self, after: int) -> int:
+        """Load the rows above a document id that are not in the index yet; returns how many were added."""
+        from .database import AsyncSessionLocal  # Imported on first use, the engine needs the database settings
+
+        added = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                doc_ids = (
+                    await db.execute(
+                        select(self.id_column).where(self.id_column > after).order_by(self.id_column).limit(self.batch_size)
+                    )
+                ).scalars().all()
+                missing = [doc_id for doc_id in doc_ids if not self.contains(doc_id)]  # Only those are fetched whole
+                rows = (
+                    await db.execute(
+                        select(self.id_column, self.value_column).where(self.id_column.in_(missing)).order_by(self.id_column)
+                    )
+                ).all() if missing else []
+            if not doc_ids:
+                return added
+            if rows:
+                await asyncio.to_thread(self.add, [row[0] for row in rows], [row[1] for row in rows])
+                added += len(rows)
+            after = doc_ids[-1]
+            self.last_id = max(self.last_id, after)
+
+    async def _run(self):
+        loaded = 0
+        while True:
+            try:
+                if self.ready and time.monotonic() >= self._next_reconcile:
+                    self._next_reconcile = time.monotonic() + self.reconcile_interval
+                    added = await self.reconcile()
+                    if added:
+                        logger.info(f"{self.name} reconciled {added} documents committed late")
+                added = await self.catch_up()
+                loaded += added
+                if not self.ready:
+                    self.ready = True
+                    self._next_reconcile = time.monotonic() + self.reconcile_interval
+                    logger.info(f"{self.name} loaded with {loaded} documents")
+                elif added:
+                    logger.debug(f"{self.name} picked up {added} documents")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{self.name} sync error: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def add_stored_embeddings(doc_ids: List[int], data: List[bytes]):
+    vector_index.add(doc_ids, np.stack([decode_embedding(embedding) for embedding in data]))
+
+
+index_sync = IndexSynchronizer(
+    "Vector index", DocumentEmbedding.document_id, DocumentEmbedding.embedding, add_stored_embeddings,
+    vector_index.__contains__, enabled=SimilarityConfig.SIMILARITY_ENABLED,
+    interval=SimilarityConfig.SIMILARITY_SYNC_INTERVAL, lag_ids=SimilarityConfig.SIMILARITY_SYNC_LAG_IDS,
+    reconcile_interval=SimilarityConfig.SIMILARITY_RECONCILE_INTERVAL,
+)
+
+
+async def backfill(batch_size: int):
+    """Embed and index stored documents that have no embedding yet."""
+    from .database import AsyncSessionLocal
+    from .content_store import decompress
+    from .ml_model import document_embeddings
+
+    done = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(Document.id, DocumentContent.encoding, DocumentContent.data)
+                    .join(DocumentContent, DocumentContent.content_hash == Document.content_hash)
+                    .outerjoin(DocumentEmbedding, DocumentEmbedding.document_id == Document.id)
+                    .where(DocumentEmbedding.document_id.is_(None))
+                    .order_by(Document.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+            texts = [decompress(row.encoding, row.data) for row in rows]
+            vectors = await asyncio.to_thread(document_embeddings, texts)
+            db.add_all([
+                DocumentEmbedding(document_id=row.id, embedding=encode_embedding(vector))
+                for row, vector in zip(rows, vectors)
+            ])
+            await db.commit()
+        done += len(rows)
+        logger.info(f"Embedded {done} documents")
+    print(f"Embedded {done} documents")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage stored document embeddings.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = commands.add_parser("backfill", help="Embed documents stored without an embedding")
+    backfill_parser.add_argument("--batch-size", type=int, default=64, help="Documents embedded per transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(backfill(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
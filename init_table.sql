@@ -3,8 +3,76 @@
 CREATE TABLE documents (
     id SERIAL PRIMARY KEY,
     filename VARCHAR(255) NOT NULL,
+    content_hash VARCHAR(64),
+    predicted_category VARCHAR(50) NOT NULL,
+    confidence_scores JSON NOT NULL,
+    upload_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    duplicate_of INTEGER
+);
+
+CREATE INDEX ix_documents_upload_time ON documents (upload_time, id);
+CREATE INDEX ix_documents_category_upload_time ON documents (predicted_category, upload_time, id);
+CREATE INDEX ix_documents_filename ON documents (filename varchar_pattern_ops);
+CREATE INDEX ix_documents_content_hash ON documents (content_hash);
+CREATE INDEX ix_documents_duplicate_of ON documents (duplicate_of);
+
+CREATE TABLE document_contents (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    encoding VARCHAR(10) NOT NULL,
+    data BYTEA NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE document_embeddings (
+    document_id INTEGER PRIMARY KEY,
+    embedding BYTEA NOT NULL
+);
+
+CREATE TABLE document_signatures (
+    document_id INTEGER PRIMARY KEY,
+    signature BYTEA NOT NULL
+);
+
+CREATE TABLE category_stats (
+    category VARCHAR(50) PRIMARY KEY,
+    documents INTEGER NOT NULL DEFAULT 0,
+    confidence_sum DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+CREATE TABLE upload_buckets (
+    granularity VARCHAR(5) NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    documents INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket_start, category)
+);
+
+CREATE TABLE classification_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    fingerprint VARCHAR(64) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
     content TEXT NOT NULL,
     predicted_category VARCHAR(50) NOT NULL,
     confidence_scores JSON NOT NULL,
-    upload_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX ix_classification_cache_fingerprint ON classification_cache (fingerprint);
+
+CREATE TABLE upload_jobs (
+    id SERIAL PRIMARY KEY,
+    filename VARCHAR(255) NOT NULL,
+    payload BYTEA,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    error TEXT,
+    document_id INTEGER,
+    available_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+
+CREATE INDEX ix_upload_jobs_claim ON upload_jobs (status, priority, id);